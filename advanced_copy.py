@@ -1,13 +1,15 @@
 import os
 import re
 import shutil
+import stat
 import subprocess
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime
 
 from drive_utils import is_smb, is_ssh, build_rsync_cmd
 from state import apply_replacements, logger
-from copy_worker_core import _SKIP_RE
+from copy_worker_core import _SKIP_RE, _WORKERS
 from translations import tr
 
 __all__ = [
@@ -47,22 +49,31 @@ def _is_local(path: str) -> bool:
     return not is_smb(path) and not is_ssh(path)
 
 
-def _path_size(p: str) -> int:
-    try:
-        if os.path.islink(p) or os.path.isfile(p):
-            return os.path.getsize(p)
-        if os.path.isdir(p):
-            total = 0
-            for root, _dirs, files in os.walk(p, followlinks=False):
-                for fname in files:
+def _tree_size(top: str) -> int:
+    total = 0
+    stack = [top]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for e in it:
                     try:
-                        total += os.path.getsize(os.path.join(root, fname))
+                        if e.is_dir(follow_symlinks=False):
+                            stack.append(e.path)
+                        else:
+                            total += e.stat(follow_symlinks=False).st_size
                     except OSError:
                         pass
-            return total
+        except OSError:
+            pass
+    return total
+
+
+def _path_size(p: str) -> int:
+    try:
+        st = os.lstat(p)
     except OSError:
-        pass
-    return 0
+        return 0
+    return _tree_size(p) if stat.S_ISDIR(st.st_mode) else st.st_size
 
 
 def _existing_versions(dst_abs: str) -> list[tuple[int, str]]:
@@ -108,56 +119,105 @@ def prune_old_versions(dst_abs: str, keep: int, title: str = "") -> tuple[list[D
     return deleted, errors
 
 
-def find_extraneous_paths(src_abs: str, dst_abs: str, excludes: frozenset) -> list[str]:
-    extraneous: list[str] = []
-    if not os.path.isdir(src_abs) or not os.path.isdir(dst_abs):
-        return extraneous
+def _dir_names(path: str) -> "dict[str, bool] | None":
+    try:
+        with os.scandir(path) as it:
+            return {e.name: e.is_dir(follow_symlinks=False) for e in it}
+    except OSError:
+        return None
+
 
-    def _walk(rel: str) -> None:
-        d_dir = os.path.join(dst_abs, rel) if rel else dst_abs
+def _diff_dir(src_abs: str, dst_abs: str, rel: str, excludes: frozenset) -> tuple[list[str], list[tuple[str, bool, int]]]:
+    d_dir = os.path.join(dst_abs, rel) if rel else dst_abs
+    s_dir = os.path.join(src_abs, rel) if rel else src_abs
+    subdirs: list[str] = []
+    found: list[tuple[str, bool, int]] = []
+    try:
+        with os.scandir(d_dir) as it:
+            entries = list(it)
+    except OSError:
+        return subdirs, found
+    src_names = _dir_names(s_dir)
+    if src_names is None:
+        return subdirs, found
+    for e in entries:
+        if _SKIP_RE.search(e.name) or os.path.join(s_dir, e.name) in excludes:
+            continue
         try:
-            entries = list(os.scandir(d_dir))
-        except (PermissionError, FileNotFoundError, OSError):
-            return
-        for e in entries:
-            if _SKIP_RE.search(e.name):
-                continue
-            rel_path = os.path.join(rel, e.name) if rel else e.name
-            s_path = os.path.join(src_abs, rel_path)
-            if s_path in excludes:
-                continue
-            if not os.path.lexists(s_path):
-                extraneous.append(e.path)
-                continue
             dst_is_dir = e.is_dir(follow_symlinks=False)
-            src_is_dir = os.path.isdir(s_path) and not os.path.islink(s_path)
-            if dst_is_dir and src_is_dir:
-                _walk(rel_path)
-            elif dst_is_dir != src_is_dir:
-                extraneous.append(e.path)
+        except OSError:
+            continue
+        src_is_dir = src_names.get(e.name)
+        if src_is_dir is None or src_is_dir != dst_is_dir:
+            size = 0
+            if not dst_is_dir:
+                try:
+                    size = e.stat(follow_symlinks=False).st_size
+                except OSError:
+                    pass
+            found.append((e.path, dst_is_dir, size))
+        elif dst_is_dir:
+            subdirs.append(os.path.join(rel, e.name) if rel else e.name)
+    return subdirs, found
+
+
+def _scan_extraneous(src_abs: str, dst_abs: str, excludes: frozenset) -> dict[str, int]:
+    if not os.path.isdir(src_abs) or not os.path.isdir(dst_abs):
+        return {}
+    sizes: dict[str, int] = {}
+    with ThreadPoolExecutor(max_workers=_WORKERS, thread_name_prefix="mirror-scan") as pool:
+        pending = {pool.submit(_diff_dir, src_abs, dst_abs, "", excludes)}
+        dir_sizes: dict = {}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                subdirs, found = fut.result()
+                pending.update(pool.submit(_diff_dir, src_abs, dst_abs, rel, excludes) for rel in subdirs)
+                for path, is_dir, size in found:
+                    sizes[path] = size
+                    if is_dir:
+                        dir_sizes[path] = pool.submit(_tree_size, path)
+        for path, fut in dir_sizes.items():
+            sizes[path] = fut.result()
+    return dict(sorted(sizes.items()))
+
 
-    _walk("")
-    return extraneous
+def find_extraneous_paths(src_abs: str, dst_abs: str, excludes: frozenset) -> list[str]:
+    return list(_scan_extraneous(src_abs, dst_abs, excludes))
 
 
-def delete_paths(paths: list[str], title: str = "", reason: str | None = None) -> tuple[list[DeletedItem], list[DeleteError]]:
+def _delete_one(p: str) -> "OSError | bool":
+    try:
+        st = os.lstat(p)
+        if stat.S_ISDIR(st.st_mode):
+            shutil.rmtree(p)
+        else:
+            os.remove(p)
+    except FileNotFoundError:
+        return False
+    except OSError as exc:
+        return exc
+    return True
+
+
+def delete_paths(paths: list[str], title: str = "", reason: str | None = None,
+                 sizes: "dict[str, int] | None" = None) -> tuple[list[DeletedItem], list[DeleteError]]:
     if reason is None:
         reason = tr("Mirror delete")
     deleted: list[DeletedItem] = []
     errors: list[DeleteError] = []
-    for p in paths:
-        sz = _path_size(p)
-        try:
-            if os.path.islink(p) or os.path.isfile(p):
-                os.remove(p)
-            elif os.path.isdir(p):
-                shutil.rmtree(p)
-            else:
-                continue
-            deleted.append(DeletedItem(path=p, title=title, reason=reason, size=sz))
-        except OSError as exc:
-            errors.append(DeleteError(path=p, title=title, reason=tr("Could not delete: {exc}", exc=exc)))
-            logger.warning("Mirror delete: could not remove %r: %s", apply_replacements(p), exc)
+    if not paths:
+        return deleted, errors
+    if sizes is None:
+        sizes = {p: _path_size(p) for p in paths}
+    with ThreadPoolExecutor(max_workers=min(_WORKERS, len(paths)), thread_name_prefix="mirror-delete") as pool:
+        results = list(pool.map(_delete_one, paths))
+    for p, res in zip(paths, results):
+        if res is True:
+            deleted.append(DeletedItem(path=p, title=title, reason=reason, size=sizes.get(p, 0)))
+        elif res is not False:
+            errors.append(DeleteError(path=p, title=title, reason=tr("Could not delete: {exc}", exc=res)))
+            logger.warning("Mirror delete: could not remove %r: %s", apply_replacements(p), res)
     return deleted, errors
 
 
@@ -211,12 +271,15 @@ def _confirm(parent, title: str, paths: list[str]) -> bool:
     ) == QMessageBox.StandardButton.Yes
 
 
-def _preview_ssh_mirror_delete(src: str, dst: str, excl) -> "list[str] | None":
+def _preview_ssh_mirror_delete(src: str, dst: str, excl, pack: bool = False) -> "list[str] | None":
     from copy_worker import _rsync_excludes, _rsync_src_arg, _ssh_join
+    from copy_worker_pack import _PACK_DIRNAME
 
     rsync_src = _rsync_src_arg(src)
     s_key = _exclude_key(src)
     excludes_abs = _abs_excludes(excl, s_key, src)
+    if pack and not is_ssh(src):
+        excludes_abs |= {os.path.join(s_key, _PACK_DIRNAME)}
     rsync_excludes = _rsync_excludes(rsync_src, list(excludes_abs) if excludes_abs else None)
     cmd = build_rsync_cmd(rsync_src, dst, delete=True, exclude=rsync_excludes, dry_run=True)
     try:
@@ -240,14 +303,14 @@ def _preview_ssh_mirror_delete(src: str, dst: str, excl) -> "list[str] | None":
 
 
 def _resolve_ssh_mirror_delete(ssh_pairs: list[tuple[str, str]], excl, title: str,
-                               confirm_del: bool, interactive: bool, parent) -> bool:
+                               confirm_del: bool, interactive: bool, parent, pack: bool = False) -> bool:
 
     if not confirm_del or not interactive:
         return True
 
     all_deleted: list[str] = []
     for s_str, d_str in ssh_pairs:
-        preview = _preview_ssh_mirror_delete(s_str, d_str, excl)
+        preview = _preview_ssh_mirror_delete(s_str, d_str, excl, pack)
         if preview is None:
             logger.warning(
                 "Mirror delete [%s]: could not preview remote deletions for %r \u2192 %r "
@@ -285,10 +348,22 @@ def apply_advanced_options(tasks: list[tuple], *, interactive: bool = True, pare
                 "Mirror delete [%s]: skipped during Restore (only applies to the "
                 "backup destination) — restoring without deleting local files", title)
         confirm_del = bool(details.get("confirm_before_delete", True))
+        pack = bool(details.get("pack_small_files")) and not is_restore
+        compress = bool(details.get("compress_destination")) and not is_restore
+        if compress and mirror:
+            logger.info("Mirror delete [%s]: not available for compressed destinations — skipped", title)
+            mirror = False
         try:
             max_versions = int(details.get("max_versions") or 0)
         except (TypeError, ValueError):
             max_versions = 0
+        snapshot = bool(details.get("snapshot_source")) and not is_restore
+        dedup = None
+        if details.get("dedup_store") and not is_restore:
+            dedup = {"max_versions": max_versions}
+            if mirror or versioned or compress:
+                logger.info("Chunk store [%s]: mirror, versioned and compressed modes do not apply — skipped", title)
+            mirror = versioned = compress = False
 
         eff_dst = list(dst_list)
         mirror_remote = False
@@ -341,14 +416,15 @@ def apply_advanced_options(tasks: list[tuple], *, interactive: bool = True, pare
                                 title, apply_replacements(s_abs))
                         continue
                     excludes = _abs_excludes(excl, s_abs, s_str)
-                    extraneous = find_extraneous_paths(s_abs, d_abs, excludes)
+                    sizes = _scan_extraneous(s_abs, d_abs, excludes)
+                    extraneous = list(sizes)
                     if not extraneous:
                         continue
                     proceed = True
                     if confirm_del and interactive:
                         proceed = _confirm(parent, title, extraneous)
                     if proceed:
-                        items, errs = delete_paths(extraneous, title=title, reason=tr("Mirror delete"))
+                        items, errs = delete_paths(extraneous, title=title, reason=tr("Mirror delete"), sizes=sizes)
                         all_deleted.extend(items)
                         all_errors.extend(errs)
                         logger.info("Mirror delete [%s]: removed %d item(s) from %r",
@@ -364,8 +440,8 @@ def apply_advanced_options(tasks: list[tuple], *, interactive: bool = True, pare
 
         if ssh_mirror_pairs:
             mirror_remote = _resolve_ssh_mirror_delete(
-                ssh_mirror_pairs, excl, title, confirm_del, interactive, parent)
+                ssh_mirror_pairs, excl, title, confirm_del, interactive, parent, pack)
 
-        result.append((src_list, eff_dst, title, excl, pre_hooks, post_hooks, mirror_remote))
+        result.append((src_list, eff_dst, title, excl, pre_hooks, post_hooks, mirror_remote, pack, compress, dedup, snapshot))
 
     return AdvancedOptionsResult(tasks=result, deleted=all_deleted, errors=all_errors)
@@ -0,0 +1,295 @@
+import glob
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from state import _HOME, logger
+from translations import tr
+
+__all__ = ["AurBuild", "AurPackage", "parse_srcinfo"]
+
+_CACHE_HOME = os.environ.get("XDG_CACHE_HOME", "")
+_AUR_DIR    = (Path(_CACHE_HOME) if os.path.isabs(_CACHE_HOME) else _HOME / ".cache") / "Backup Helper" / "aur"
+_SRC_DIR    = _AUR_DIR / "src"
+_PKG_DIR    = _AUR_DIR / "pkg"
+_AUR_URL    = "https://aur.archlinux.org"
+_RPC_BATCH  = 100
+_FETCH_WORKERS = 8
+_BUILD_RAM  = 2 * 1024 ** 3
+_PKG_KEEP   = 3
+_DEP_VER_RE = re.compile(r"[<>=].*$")
+_DEP_KEYS   = ("depends", "makedepends", "checkdepends")
+
+
+@dataclass
+class AurPackage:
+    base: str
+    version: str
+    names: list[str] = field(default_factory=list)
+    depends: set[str] = field(default_factory=set)
+    provides: dict[str, str] = field(default_factory=dict)
+    path: Path | None = None
+
+
+def parse_srcinfo(text: str) -> AurPackage:
+    arch = os.uname().machine
+    dep_keys = {k for key in _DEP_KEYS for k in (key, f"{key}_{arch}")}
+    info: dict[str, str] = {}
+    names: list[str] = []
+    depends: set[str] = set()
+    provides: dict[str, str] = {}
+    for line in text.splitlines():
+        key, sep, val = line.strip().partition(" = ")
+        if not sep:
+            continue
+        if key == "pkgname":
+            names.append(val)
+        elif key in dep_keys:
+            depends.add(_DEP_VER_RE.sub("", val).strip())
+        elif key in ("provides", f"provides_{arch}"):
+            provides.setdefault(val.partition("=")[0].strip(), names[-1] if names else "")
+        elif key in ("pkgbase", "pkgver", "pkgrel", "epoch") and not names:
+            info[key] = val
+    version = f"{info.get('pkgver', '0')}-{info.get('pkgrel', '1')}"
+    if info.get("epoch"):
+        version = f"{info['epoch']}:{version}"
+    provides = {n: p or names[0] for n, p in provides.items() if n and n not in names and (p or names)}
+    return AurPackage(info.get("pkgbase", names[0] if names else ""), version, names, depends - {""}, provides)
+
+
+def _rpc_bases(names: list[str]) -> dict[str, str]:
+    bases: dict[str, str] = {}
+    for i in range(0, len(names), _RPC_BATCH):
+        query = urllib.parse.urlencode([("arg[]", n) for n in names[i:i + _RPC_BATCH]])
+        try:
+            with urllib.request.urlopen(f"{_AUR_URL}/rpc/v5/info?{query}", timeout=20) as r:
+                results = json.load(r).get("results", [])
+        except (urllib.error.URLError, TimeoutError, OSError, ValueError) as exc:
+            logger.warning("AUR RPC: %s", exc)
+            continue
+        bases.update((res["Name"], res["PackageBase"]) for res in results if res.get("Name") and res.get("PackageBase"))
+    return bases
+
+
+def _build_slots(count: int) -> tuple[int, int]:
+    cores = os.cpu_count() or 1
+    avail = _BUILD_RAM
+    try:
+        with open("/proc/meminfo", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("MemAvailable:"):
+                    avail = int(line.split()[1]) * 1024
+                    break
+    except (OSError, ValueError):
+        pass
+    workers = max(1, min(count, max(1, cores // 2), avail // _BUILD_RAM))
+    return workers, max(1, cores // workers)
+
+
+def _pkg_file(path: str) -> tuple[str, str]:
+    parts = os.path.basename(path).split(".pkg.tar")[0].rsplit("-", 3)
+    return (parts[0], f"{parts[1]}-{parts[2]}") if len(parts) == 4 else ("", "")
+
+
+def _cache_glob(name: str) -> list[str]:
+    return [f for f in glob.glob(str(_PKG_DIR / f"{glob.escape(name)}-*.pkg.tar*"))
+            if not f.endswith(".sig") and _pkg_file(f)[0] == name]
+
+
+def _cached_files(pkg: AurPackage, names: set[str]) -> dict[str, str] | None:
+    files: dict[str, str] = {}
+    for name in pkg.names:
+        if name not in names:
+            continue
+        found = sorted(f for f in _cache_glob(name) if _pkg_file(f)[1] == pkg.version)
+        if not found:
+            return None
+        files[name] = found[-1]
+    return files
+
+
+def _packagelist(path: Path) -> list[str]:
+    try:
+        r = subprocess.run(["makepkg", "--packagelist"], cwd=str(path), capture_output=True, text=True, timeout=60,
+                           env={**os.environ, "PKGDEST": str(_PKG_DIR)})
+    except (OSError, subprocess.SubprocessError) as exc:
+        logger.warning("makepkg --packagelist %s: %s", path, exc)
+        return []
+    return [line.strip() for line in r.stdout.splitlines() if line.strip()] if r.returncode == 0 else []
+
+
+def _built_files(pkg: AurPackage, names: set[str], listed: list[str]) -> dict[str, str] | None:
+    files = {n: f for f in listed if (n := _pkg_file(f)[0]) in names and n in pkg.names and os.path.isfile(f)}
+    return files if all(n in files for n in pkg.names if n in names) else None
+
+
+def _prune_cache(pkg: AurPackage) -> None:
+    for name in pkg.names:
+        for f in sorted(_cache_glob(name), key=os.path.getmtime)[:-_PKG_KEEP]:
+            try:
+                os.remove(f)
+            except OSError:
+                pass
+
+
+class AurBuild:
+    def __init__(self, run: Callable[[list[str], str], int], install: Callable[[list[str], bool], bool],
+                 install_repo: Callable[[list[str]], bool], *, not_installed: Callable[[list[str]], list[str]],
+                 unavailable: Callable[[list[str]], list[str]], cancel: threading.Event,
+                 log: Callable[[str, str], None], lookup: Callable[[list[str]], dict[str, str]] = _rpc_bases,
+                 fetch: "Callable[[str], Path | None] | None" = None,
+                 packagelist: Callable[[Path], list[str]] = _packagelist) -> None:
+        self._run          = run
+        self._install      = install
+        self._install_repo = install_repo
+        self._not_installed = not_installed
+        self._unavailable  = unavailable
+        self._cancel       = cancel
+        self._log          = log
+        self._lookup       = lookup
+        self._fetch        = fetch or self._git_fetch
+        self._packagelist  = packagelist
+        self.packages: dict[str, AurPackage] = {}
+        self.needs: dict[str, set[str]] = {}
+        self.provided: dict[str, str] = {}
+        self.repo_deps: set[str] = set()
+        self.unresolved: list[str] = []
+
+    def _git_fetch(self, base: str) -> Path | None:
+        path = _SRC_DIR / base
+        if (path / ".git").is_dir() and self._run(["git", "pull", "--ff-only", "-q"], str(path)) == 0:
+            return path
+        shutil.rmtree(path, ignore_errors=True)
+        _SRC_DIR.mkdir(parents=True, exist_ok=True)
+        if self._run(["git", "clone", "-q", "--depth", "1", f"{_AUR_URL}/{base}.git", base], str(_SRC_DIR)) != 0:
+            return None
+        return path
+
+    def _load(self, base: str) -> AurPackage | None:
+        path = self._fetch(base)
+        if path is None:
+            return None
+        try:
+            pkg = parse_srcinfo((path / ".SRCINFO").read_text(encoding="utf-8"))
+        except OSError as exc:
+            logger.warning("AUR %s: %s", base, exc)
+            return None
+        pkg.path = path
+        return pkg
+
+    def resolve(self, names: list[str]) -> None:
+        provided: dict[str, str] = {}
+        wanted = list(dict.fromkeys(names))
+        with ThreadPoolExecutor(max_workers=_FETCH_WORKERS, thread_name_prefix="aur-fetch") as pool:
+            while wanted and not self._cancel.is_set():
+                wanted = [n for n in wanted if n not in provided]
+                if not wanted:
+                    break
+                bases = self._lookup(wanted)
+                self.unresolved.extend(n for n in wanted if n not in bases)
+                new = sorted({b for b in bases.values() if b not in self.packages})
+                for base, pkg in zip(new, pool.map(self._load, new)):
+                    if pkg is None:
+                        self.unresolved.extend(n for n, b in bases.items() if b == base)
+                        continue
+                    self.packages[base] = pkg
+                    provided.update((n, base) for n in pkg.names)
+                    for n in pkg.provides:
+                        provided.setdefault(n, base)
+                deps = sorted({d for b in new if b in self.packages
+                               for d in self.packages[b].depends} - provided.keys())
+                missing = self._not_installed(deps) if deps else []
+                aur = set(self._unavailable(missing)) if missing else set()
+                self.repo_deps.update(d for d in missing if d not in aur)
+                wanted = sorted(aur)
+        self.provided = provided
+        self.unresolved = [n for n in self.unresolved if n not in provided]
+        self.needs = {base: {provided[d] for d in pkg.depends if d in provided and provided[d] != base}
+                      for base, pkg in self.packages.items()}
+
+    def build(self, names: list[str]) -> list[str]:
+        self.resolve(names)
+        if self.unresolved:
+            self._log(tr("Not found in the AUR: {names}", names=", ".join(sorted(set(self.unresolved)))), "warning")
+        if not self.packages or self._cancel.is_set():
+            return self._not_installed(list(names))
+        if self.repo_deps:
+            self._log(tr("Installing build dependencies: {names}", names=", ".join(sorted(self.repo_deps))), "info")
+            if not self._install_repo(sorted(self.repo_deps)):
+                self._log(tr("Some build dependencies could not be installed"), "warning")
+
+        requested = set(names)
+        wanted = requested | {self.packages[b].provides.get(d, d) for pkg in self.packages.values()
+                              for d in pkg.depends if (b := self.provided.get(d))}
+        needed = {dep for deps in self.needs.values() for dep in deps}
+        workers, jobs = _build_slots(len(self.packages))
+        self._log(tr("Building {n} AUR package base(s), {w} at a time", n=len(self.packages), w=workers), "info")
+
+        done: set[str] = set()
+        failed: set[str] = set()
+        final: list[str] = []
+        pending = sorted(self.packages)
+        running: dict = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="aur-build") as pool:
+            while pending or running:
+                for base in list(pending):
+                    if self._cancel.is_set():
+                        break
+                    if self.needs[base] & failed:
+                        pending.remove(base)
+                        failed.add(base)
+                        self._log(tr("Skipping {base}: a dependency failed to build", base=base), "warning")
+                    elif self.needs[base] <= done and len(running) < workers:
+                        pending.remove(base)
+                        running[pool.submit(self._build_one, self.packages[base], wanted, jobs)] = base
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    base = running.pop(fut)
+                    files = fut.result()
+                    if files is None:
+                        failed.add(base)
+                        continue
+                    explicit = [f for n, f in files.items() if n in requested]
+                    if base not in needed:
+                        final.extend(explicit)
+                    else:
+                        as_deps = [f for n, f in files.items() if n not in requested]
+                        if not ((not as_deps or self._install(as_deps, True))
+                                and (not explicit or self._install(explicit, False))):
+                            failed.add(base)
+                            continue
+                    done.add(base)
+
+        if final and not self._cancel.is_set():
+            self._install(final, False)
+        return self._not_installed(list(names))
+
+    def _build_one(self, pkg: AurPackage, wanted: set[str], jobs: int) -> dict[str, str] | None:
+        if self._cancel.is_set():
+            return None
+        files = _cached_files(pkg, wanted)
+        if files is not None:
+            self._log(tr("{base} {version}: using cached build", base=pkg.base, version=pkg.version), "success")
+            return files
+        _PKG_DIR.mkdir(parents=True, exist_ok=True)
+        self._log(tr("Building {base} {version}…", base=pkg.base, version=pkg.version), "info")
+        rc = self._run(["env", f"PKGDEST={_PKG_DIR}", f"MAKEFLAGS=-j{jobs}", "makepkg", "-f", "-c", "--noconfirm"],
+                       str(pkg.path))
+        files = _built_files(pkg, wanted, self._packagelist(pkg.path)) if rc == 0 else None
+        if files is None:
+            self._log(tr("Failed to build {base}", base=pkg.base), "error")
+            return None
+        _prune_cache(pkg)
+        return files
@@ -10,22 +10,17 @@ from PyQt6.QtWidgets import (
     QSizePolicy, QVBoxLayout, QWidget,
 )
 
-from history import load_history as _load_all_history, _fmt_duration as _fmt_dur
+from copy_worker_core import _format_unit
+from history import (
+    history_by_day, history_by_operation, history_totals, load_history, _fmt_duration as _fmt_dur, _fmt_rate,
+    _BACKENDS,
+)
 from state import S
 from themes import current_theme, font_sz, register_style_listener, unregister_style_listener
 from translations import tr
 from ui_utils import _StandardKeysMixin, build_dialog_shell, clear_layout, color_style, sep, size_to_screen
 
 
-def _parse_ts(ts: str) -> datetime | None:
-    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S"):
-        try:
-            return datetime.strptime(ts, fmt)
-        except ValueError:
-            pass
-    return None
-
-
 class _StatCard(QFrame):
     def __init__(self, icon: str, value: str, label: str, color: str, parent=None) -> None:
         super().__init__(parent)
@@ -239,7 +234,6 @@ class BackupStatsDialog(_StandardKeysMixin, QDialog):
         super().__init__(parent)
         self.setWindowTitle(tr("Backup Statistics"))
         size_to_screen(self, 1500, 1000)
-        self._history: list[dict] = []
         self._build_shell()
         self._reload()
         register_style_listener(self._reload)
@@ -265,40 +259,35 @@ class BackupStatsDialog(_StandardKeysMixin, QDialog):
         self._body_lay.setSpacing(20)
 
     def _reload(self) -> None:
-        self._history = _load_all_history(S.profile_name or "")
         clear_layout(self._body_lay)
 
-        days = self._RANGES[self._range_combo.currentData()]
-        now  = datetime.now()
-        if days:
-            cutoff = now - timedelta(days=days)
-            entries = [
-                e for e in self._history
-                if (ts := _parse_ts(e.get("timestamp", ""))) and ts >= cutoff
-            ]
-        else:
-            entries = list(self._history)
+        profile = S.profile_name or ""
+        days    = self._RANGES[self._range_combo.currentData()]
+        since   = datetime.now() - timedelta(days=days) if days else None
+        totals  = history_totals(profile, since)
 
-        if not entries:
+        if not totals["runs"]:
             lbl = QLabel(tr("No backup history available for the selected range."))
             lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
             lbl.setStyleSheet(color_style(current_theme()['text_dim'], font_sz(1)))
             self._body_lay.addWidget(lbl)
             return
 
-        self._build_stats(entries)
+        self._build_stats(totals, history_by_day(profile, since), history_by_operation(profile, since),
+                          load_history(profile, since, limit=20))
 
-    def _build_stats(self, entries: list[dict]) -> None:
+    def _build_stats(self, totals: dict, by_day: list[dict], op_counts: list[tuple[str, int]],
+                     recent: list[dict]) -> None:
         t = current_theme()
 
-        total       = len(entries)
-        successful  = sum(1 for e in entries if not e.get("errors") and not e.get("cancelled"))
-        failed      = sum(1 for e in entries if e.get("errors"))
-        cancelled   = sum(1 for e in entries if e.get("cancelled"))
-        total_copied  = sum(e.get("copied", 0) for e in entries)
-        total_skip    = sum(e.get("skipped", 0) for e in entries)
-        total_deleted = sum(e.get("deleted", 0) for e in entries)
-        avg_dur      = (sum(e.get("duration_s", 0) for e in entries) // max(total, 1))
+        total         = totals["runs"]
+        successful    = totals["successful"]
+        failed        = totals["failed"]
+        cancelled     = totals["cancelled"]
+        total_copied  = totals["copied"]
+        total_skip    = totals["skipped"]
+        total_deleted = totals["deleted"]
+        avg_dur       = totals["duration_s"] // max(total, 1)
 
         cards_w = QWidget()
         cards_l = QHBoxLayout(cards_w)
@@ -312,30 +301,17 @@ class BackupStatsDialog(_StandardKeysMixin, QDialog):
             ("⏭", str(total_skip),          tr("Files Skipped"),   t["accent2"]),
             ("🗑", f"{total_deleted:,}", tr("Files Deleted"),   t["deleted"]),
             ("⏱",  _fmt_dur(avg_dur),        tr("Avg Duration"),    t["accent2"]),
+            ("🚤", _fmt_rate(totals["bytes"], totals["copy_s"]), tr("Avg Throughput"), t["info"]),
         ]:
             cards_l.addWidget(_StatCard(icon, val, label, col))
         self._body_lay.addWidget(cards_w)
 
         self._body_lay.addWidget(sep())
 
-        by_day: dict[str, dict] = {}
-        for e in entries:
-            ts = _parse_ts(e.get("timestamp", ""))
-            if not ts:
-                continue
-            key = ts.strftime("%Y-%m-%d")
-            if key not in by_day:
-                by_day[key] = {"copied": 0, "runs": 0, "errors": 0}
-            by_day[key]["copied"] += e.get("copied", 0)
-            by_day[key]["runs"]   += 1
-            by_day[key]["errors"] += 1 if e.get("errors") else 0
-
         if by_day:
-            sorted_days = sorted(by_day.keys())
-            tl_points: list[tuple[datetime, float]] = []
-            for d in sorted_days:
-                dt = datetime.strptime(d, "%Y-%m-%d")
-                tl_points.append((dt, by_day[d]["copied"]))
+            tl_points: list[tuple[datetime, float]] = [
+                (datetime.strptime(d["day"], "%Y-%m-%d"), d["copied"]) for d in by_day
+            ]
 
             spark = _Sparkline(
                 tr("Files Copied per Day"),
@@ -346,26 +322,44 @@ class BackupStatsDialog(_StandardKeysMixin, QDialog):
             self._body_lay.addWidget(spark)
             self._body_lay.addWidget(sep())
 
-        op_counts: dict[str, int] = {}
-        for e in entries:
-            op = e.get("operation", tr("Unknown"))
-            op_counts[op] = op_counts.get(op, 0) + 1
+        tp_points = [
+            (datetime.strptime(d["day"], "%Y-%m-%d"), d["bytes"] / d["copy_s"] / (1024 * 1024))
+            for d in by_day if d["bytes"] and d["copy_s"]
+        ]
+        if len(tp_points) >= 2:
+            self._body_lay.addWidget(_Sparkline(
+                tr("Throughput per Day (MB/s)"),
+                tp_points,
+                t["info"],
+                fmt_fn=lambda v: f"{v:.1f}",
+            ))
+            self._body_lay.addWidget(sep())
+
+        backend_bars = [
+            (b.upper(), float(totals[f"{b}_bytes"]), col)
+            for b, col in zip(_BACKENDS, (t["accent"], t["accent2"], t["success"], t["info"]), strict=True)
+            if totals[f"{b}_bytes"]
+        ]
+        if backend_bars:
+            self._body_lay.addWidget(_BarChart(tr("Data Moved by Backend"), backend_bars, fmt_fn=_format_unit))
+            self._body_lay.addWidget(sep())
+
         if op_counts:
             colors = [t["accent"], t["accent2"], t["success"], t["info"]]
             bars = [
-                (op, float(cnt), colors[i % len(colors)])
-                for i, (op, cnt) in enumerate(sorted(op_counts.items(), key=lambda x: -x[1]))
+                (op or tr("Unknown"), float(cnt), colors[i % len(colors)])
+                for i, (op, cnt) in enumerate(op_counts)
             ]
             chart = _BarChart(tr("Runs by Operation"), bars, fmt_fn=lambda v: str(int(v)))
             self._body_lay.addWidget(chart)
             self._body_lay.addWidget(sep())
 
-        if by_day and len(by_day) >= 3:
+        if len(by_day) >= 3:
             err_bars = [
-                (d[-5:],
-                 100.0 * by_day[d]["errors"] / max(by_day[d]["runs"], 1),
-                 t["error"] if by_day[d]["errors"] else t["success"])
-                for d in sorted(by_day.keys())[-14:]
+                (d["day"][-5:],
+                 100.0 * d["errors"] / max(d["runs"], 1),
+                 t["error"] if d["errors"] else t["success"])
+                for d in by_day[-14:]
             ]
             err_chart = _BarChart(
                 tr("Error Rate % per Day (last 14 days)"),
@@ -382,7 +376,7 @@ class BackupStatsDialog(_StandardKeysMixin, QDialog):
         )
         self._body_lay.addWidget(tbl_hdr)
 
-        for e in reversed(entries[-20:]):
+        for e in reversed(recent):
             row = self._make_row(e, t)
             self._body_lay.addWidget(row)
 
@@ -434,5 +428,7 @@ class BackupStatsDialog(_StandardKeysMixin, QDialog):
             hl.addWidget(_lbl(f"🗑 {deleted:,}", t["deleted"]))
         if errors:
             hl.addWidget(_lbl(f"✗ {errors}", t["error"]))
+        if e.get("bytes"):
+            hl.addWidget(_lbl(f"🚤 {_fmt_rate(e['bytes'], e.get('copy_s', 0))}", t["info"]))
         hl.addWidget(_lbl(f"⏱ {_fmt_dur(dur)}", t["text_dim"]))
         return frame
@@ -0,0 +1,298 @@
+import ctypes
+import ctypes.util
+import errno
+import hashlib
+import json
+import os
+import re
+import select
+import struct
+import threading
+import time
+
+from drive_utils import is_smb, is_ssh
+from state import _CONFIG_DIR, logger
+from copy_worker_core import _SKIP_RE, _SKIP_RE_SNAPSHOT
+
+_JOURNAL_DIR   = _CONFIG_DIR / "journal"
+_CONSUMED      = _JOURNAL_DIR / "consumed.json"
+_FLUSH_SECS    = 5.0
+_BEAT_SECS     = 30.0
+_STALE_SECS    = 90.0
+_MAX_DIRTY     = 50_000
+_MAX_NARROW    = 5_000
+_CLOCK_SLACK   = 2.0
+
+_IN_MODIFY      = 0x00000002
+_IN_ATTRIB      = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM  = 0x00000040
+_IN_MOVED_TO    = 0x00000080
+_IN_CREATE      = 0x00000100
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF   = 0x00000800
+_IN_Q_OVERFLOW  = 0x00004000
+_IN_IGNORED     = 0x00008000
+_IN_ONLYDIR     = 0x01000000
+_IN_DONT_FOLLOW = 0x02000000
+_IN_ISDIR       = 0x40000000
+_IN_NONBLOCK    = 0o4000
+_IN_CLOEXEC     = 0o2000000
+_WATCH_MASK     = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE
+                   | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR | _IN_DONT_FOLLOW)
+_EVENT_HDR      = struct.Struct("iIII")
+
+_libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+
+
+def _key(root: str) -> str:
+    return hashlib.sha1(root.encode()).hexdigest()[:16]
+
+
+def _write_json(path, data: dict) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        _JOURNAL_DIR.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as exc:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        logger.debug("journal: %s not written: %s", path, exc)
+
+
+def _read_json(path) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+
+
+def watched_roots(entries: list[dict]) -> list[str]:
+    roots: set[str] = set()
+    for e in entries:
+        if e.get("details", {}).get("no_backup"):
+            continue
+        srcs = e.get("source", [])
+        for s in [srcs] if isinstance(srcs, str) else srcs:
+            s = str(s)
+            if not s or is_smb(s) or is_ssh(s):
+                continue
+            path = os.path.abspath(os.path.expanduser(s))
+            if os.path.isdir(path):
+                roots.add(path)
+    return sorted(roots)
+
+
+class _RootJournal:
+    __slots__ = ("armed", "broken", "dirty", "dirty_flag", "key", "overflow", "root")
+
+    def __init__(self, root: str) -> None:
+        self.root       = root
+        self.key        = _key(root)
+        self.armed      = 0.0
+        self.overflow   = 0.0
+        self.broken     = False
+        self.dirty: dict[str, float] = {}
+        self.dirty_flag = True
+
+    def touch(self, path: str, now: float) -> None:
+        rel = os.path.relpath(path, self.root)
+        if rel.startswith(os.pardir):
+            return
+        self.dirty[rel] = now
+        self.dirty_flag = True
+        if len(self.dirty) > _MAX_DIRTY:
+            self.mark_overflow(now)
+
+    def mark_overflow(self, now: float) -> None:
+        self.overflow = now
+        self.dirty.clear()
+        self.dirty_flag = True
+
+    def save(self, beat: float, consumed: dict) -> None:
+        cut = (consumed.get(self.key) or {}).get("t", 0.0) - _CLOCK_SLACK
+        if cut > 0:
+            self.dirty = {rel: ts for rel, ts in self.dirty.items() if ts >= cut}
+        _write_json(_JOURNAL_DIR / f"{self.key}.json",
+                    {"root": self.root, "pid": os.getpid(), "armed": 0.0 if self.broken else self.armed, "overflow": self.overflow,
+                     "beat": beat, "dirty": self.dirty})
+        self.dirty_flag = False
+
+
+class ChangeWatcher(threading.Thread):
+    def __init__(self, roots: list[str]) -> None:
+        super().__init__(name="change-journal", daemon=True)
+        self.roots = tuple(roots)
+        self._stop_ev = threading.Event()
+        self._fd = -1
+        self._wds: dict[int, tuple[_RootJournal, str]] = {}
+        self._journals = [_RootJournal(r) for r in roots]
+
+    def stop(self) -> None:
+        self._stop_ev.set()
+        if self.is_alive():
+            self.join(timeout=5)
+
+    def _add_tree(self, journal: _RootJournal, top: str, now: float) -> None:
+        stack = [top]
+        while stack and not self._stop_ev.is_set():
+            cur = stack.pop()
+            wd = _libc.inotify_add_watch(self._fd, os.fsencode(cur), _WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err == errno.ENOSPC:
+                    logger.warning("journal: inotify watch limit reached under %s — full scans will be used "
+                                   "(raise fs.inotify.max_user_watches)", journal.root)
+                    journal.broken = True
+                    journal.mark_overflow(now)
+                    return
+                continue
+            self._wds[wd] = (journal, cur)
+            try:
+                with os.scandir(cur) as it:
+                    stack.extend(e.path for e in it if e.is_dir(follow_symlinks=False))
+            except OSError:
+                continue
+
+    def _handle(self, buf: bytes, now: float) -> None:
+        off = 0
+        while off + _EVENT_HDR.size <= len(buf):
+            wd, mask, _cookie, length = _EVENT_HDR.unpack_from(buf, off)
+            name = buf[off + _EVENT_HDR.size: off + _EVENT_HDR.size + length].rstrip(b"\0")
+            off += _EVENT_HDR.size + length
+            if mask & _IN_Q_OVERFLOW:
+                logger.info("journal: inotify queue overflow — next backups use full scans")
+                for j in self._journals:
+                    j.mark_overflow(now)
+                continue
+            hit = self._wds.get(wd)
+            if hit is None:
+                continue
+            journal, path = hit
+            if mask & _IN_IGNORED:
+                del self._wds[wd]
+                continue
+            if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                if path == journal.root:
+                    journal.mark_overflow(now)
+                continue
+            if not name:
+                continue
+            full = os.path.join(path, os.fsdecode(name))
+            if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                self._add_tree(journal, full, now)
+            journal.touch(full, now)
+
+    def run(self) -> None:
+        self._fd = _libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            logger.warning("journal: inotify unavailable (%s)", os.strerror(ctypes.get_errno()))
+            return
+        try:
+            poller = select.poll()
+            poller.register(self._fd, select.POLLIN)
+            for j in self._journals:
+                self._add_tree(j, j.root, time.time())
+                j.armed = time.time()
+            logger.info("journal: watching %d folder(s) under %d root(s)", len(self._wds), len(self._journals))
+            last_flush = last_beat = 0.0
+            while not self._stop_ev.is_set():
+                if poller.poll(1000):
+                    try:
+                        while True:
+                            buf = os.read(self._fd, 65536)
+                            if not buf:
+                                break
+                            self._handle(buf, time.time())
+                    except BlockingIOError:
+                        pass
+                now = time.time()
+                beat = now - last_beat >= _BEAT_SECS
+                if beat or (now - last_flush >= _FLUSH_SECS and any(j.dirty_flag for j in self._journals)):
+                    consumed = _read_json(_CONSUMED)
+                    for j in self._journals:
+                        if beat or j.dirty_flag:
+                            j.save(now, consumed)
+                    last_flush = now
+                    if beat:
+                        last_beat = now
+            consumed = _read_json(_CONSUMED)
+            for j in self._journals:
+                j.save(0.0, consumed)
+        finally:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def narrow_tasks(tasks: list, skip_titles: set[str], snap_titles: "set[str] | frozenset[str]" = frozenset()
+                 ) -> tuple[list, dict[str, list[tuple[str, str]]], float]:
+    started = time.time()
+    consumed = _read_json(_CONSUMED)
+    claims: dict[str, list[tuple[str, str]]] = {}
+    result: list = []
+    for s, d, t, exc in tasks:
+        if t in skip_titles or is_smb(s) or is_ssh(s) or is_ssh(d) or not os.path.isdir(s):
+            result.append((s, d, t, exc))
+            continue
+        key = _key(s)
+        claims.setdefault(t, []).append((key, d))
+        dirty = _dirty_since(key, s, d, consumed.get(key), started)
+        if dirty is None or len(dirty) > _MAX_NARROW:
+            result.append((s, d, t, exc))
+            continue
+        picked = _collapse(dirty, s, exc, _SKIP_RE_SNAPSHOT if t in snap_titles else _SKIP_RE)
+        logger.info("journal [%s]: %d changed path(s) under %s — skipping the full scan", t, len(picked), s)
+        result.extend((os.path.join(s, rel), os.path.join(d, rel), t, exc) for rel in picked)
+    return result, claims, started
+
+
+def _dirty_since(key: str, src: str, dst: str, last: "dict | None", now: float) -> "list[str] | None":
+    if not last or last.get("dst") != dst or not (is_smb(dst) or os.path.isdir(dst)):
+        return None
+    j = _read_json(_JOURNAL_DIR / f"{key}.json")
+    since = float(last.get("t", 0.0))
+    if (j.get("root") != src or not _pid_alive(int(j.get("pid", 0))) or now - float(j.get("beat", 0.0)) > _STALE_SECS
+            or not 0 < float(j.get("armed", 0.0)) <= since or float(j.get("overflow", 0.0)) >= since - _CLOCK_SLACK):
+        return None
+    dirty = j.get("dirty")
+    if not isinstance(dirty, dict):
+        return None
+    return [rel for rel, ts in dirty.items() if ts >= since - _CLOCK_SLACK]
+
+
+def _collapse(dirty: list[str], src: str, exc: frozenset, skip_re: "re.Pattern[str]" = _SKIP_RE) -> list[str]:
+    picked: set[str] = set()
+    for rel in sorted(set(dirty), key=lambda r: r.count(os.sep)):
+        parts = rel.split(os.sep)
+        prefixes = [os.sep.join(parts[:i]) for i in range(1, len(parts) + 1)]
+        if any(p in picked for p in prefixes[:-1]) or any(skip_re.search(p) for p in parts):
+            continue
+        if any(os.path.join(src, p) in exc for p in prefixes) or not os.path.lexists(os.path.join(src, rel)):
+            continue
+        picked.add(rel)
+    return sorted(picked)
+
+
+def mark_consumed(claims: list[tuple[str, str]], started: float) -> None:
+    if not claims:
+        return
+    consumed = _read_json(_CONSUMED)
+    for key, dst in claims:
+        consumed[key] = {"t": started, "dst": dst}
+    _write_json(_CONSUMED, consumed)
@@ -5,6 +5,7 @@ import queue
 import re
 import shutil
 import subprocess
+import tempfile
 import threading
 import time
 from PyQt6.QtCore import QThread, pyqtSignal
@@ -15,17 +16,27 @@ from state import logger
 from translations import tr
 
 from copy_worker_core import (
-    _CHUNK, _IO_BUF, _WORKERS, _FLUSH_THRESH, _FLUSH_INTERVAL, _SCAN_EMIT_SECS,
-    _SCAN_PIPE_BATCH, _LOCAL_BATCH, _CLAIM_SIZE, _PIPE_MAXSIZE,
+    _WORKERS, _FLUSH_THRESH, _FLUSH_INTERVAL, _SCAN_EMIT_SECS,
+    _SCAN_PIPE_BATCH, _LOCAL_BATCH, _CLAIM_SIZE, _PIPE_MAXSIZE, _LARGE_STREAMS, _LARGE_FILE, _SMALL_FILE,
+    _DROP_WINDOW, _copy_chunk, _release_pages,
     _SMB_WORKERS, _PID, _EUID, _O_NOATIME, _tls, _seen_dirs_lock, _seen_dirs_global, _TIME_CHECK_EVERY,
     _smb_procs, _smb_procs_lock,
-    _scale_params, _scan_dir_entries,
+    _scale_params, _scan_dir_entries, _is_large, _split_by_size, _inode_key, _physical_key, _IoGate,
     _ensure_dir, _parse_smb, _run_futures, _silent_unlink
 )
 from copy_worker_smb import (
     _SecurePw, _get_smb_credentials,
     _SmbJob, _SmbClient, _SmbScanner, _ShareProcessor
 )
+from copy_worker_profile import PROFILER, profiling_mode
+from copy_worker_pack import (
+    _PACK_DIRNAME, _PACK_INDEX, _PACK_MAX_FILE, prepare_packed_task, prune_uploaded, unpack_bundles
+)
+from copy_worker_compress import _CodecMap
+from copy_worker_dedup import DedupStore, is_store
+from copy_worker_delta import _DELTA_MIN, delta_copy
+from change_journal import mark_consumed, narrow_tasks
+from copy_worker_snapshot import SnapshotSet
 
 
 def _ssh_join(dst_spec: str, rel_path: str) -> str:
@@ -43,6 +54,7 @@ def _not_found_reason(title: str) -> str:
 
 
 _RSYNC_GLOB_CHARS = re.compile(r"([\\*?\[])")
+_RSYNC_MAX_ARG_EXCLUDES = 256
 
 
 def _rsync_escape_component(name: str) -> str:
@@ -132,11 +144,13 @@ def _bump_count(tc: dict, title: str, idx: int) -> None:
     counts[idx] += 1
 
 
-def _do_copy(entry, cancel: threading.Event, ok_l: list, sk_l: list, er_l: list, tc: dict) -> None:
+def _do_copy(entry, cancel: threading.Event, ok_l: list, sk_l: list, er_l: list, tc: dict,
+             codec: "_CodecMap | None" = None) -> None:
 
     src, dst, title, st = entry
     try:
-        status, aux, sz = _copy_file(src, dst, cancel, st)
+        res = codec.copy(entry, cancel) if codec is not None else None
+        status, aux, sz = res if res is not None else _copy_file(src, dst, cancel, st)
     except Exception as exc:
         logger.error("copy %s: %s", src, exc)
         status, aux, sz = "error", str(exc), 0
@@ -190,15 +204,27 @@ def _copy_symlink(src: str, dst: str) -> tuple:
 
 
 def _copy_loop(rfd: int, wfd: int, total: int, cancel: threading.Event) -> int:
+    chunk, io_buf = _copy_chunk(total)
+    bulk = total >= _LARGE_FILE
+    dropped = 0
     rem = total
+
+    def _maybe_release(final: bool = False) -> None:
+        nonlocal dropped
+        done = total - rem
+        if bulk and done > dropped and (final or done - dropped >= _DROP_WINDOW):
+            _release_pages(rfd, wfd, dropped, done)
+            dropped = done
+
     try:
         while rem > 0:
             if cancel.is_set():
                 raise InterruptedError
-            n = os.copy_file_range(rfd, wfd, min(rem, _CHUNK))
+            n = os.copy_file_range(rfd, wfd, min(rem, chunk))
             if n == 0:
                 break
             rem -= n
+            _maybe_release()
     except InterruptedError:
         raise
     except OSError as exc:
@@ -218,17 +244,19 @@ def _copy_loop(rfd: int, wfd: int, total: int, cancel: threading.Event) -> int:
         except OSError:
             pass
         rem = total
+        dropped = 0
     if rem > 0:
         offset = total - rem
         try:
             while rem > 0:
                 if cancel.is_set():
                     raise InterruptedError
-                n = os.sendfile(wfd, rfd, offset, min(rem, _CHUNK))
+                n = os.sendfile(wfd, rfd, offset, min(rem, chunk))
                 if n == 0:
                     break
                 rem -= n
                 offset += n
+                _maybe_release()
         except InterruptedError:
             raise
         except OSError as exc:
@@ -241,7 +269,7 @@ def _copy_loop(rfd: int, wfd: int, total: int, cancel: threading.Event) -> int:
             while rem > 0:
                 if cancel.is_set():
                     raise InterruptedError
-                buf = os.read(rfd, min(rem, _IO_BUF))
+                buf = os.read(rfd, min(rem, io_buf))
                 if not buf:
                     break
                 written = 0
@@ -251,10 +279,12 @@ def _copy_loop(rfd: int, wfd: int, total: int, cancel: threading.Event) -> int:
                         raise OSError("os.write returned 0")
                     written += n
                 rem -= len(buf)
+                _maybe_release()
         except InterruptedError:
             raise
         except OSError as exc:
             logger.warning("read/write fallback failed after %d/%d bytes: %s", total - rem, total, exc)
+    _maybe_release(final=True)
     return total - rem
 
 
@@ -279,8 +309,17 @@ def _copy_file(src, dst, cancel, cached_st=None):
                 except OSError:
                     return "error", tr("Source unreadable"), 0
 
-            if _attempt == 0 and _is_up_to_date_local(dst, st):
-                return "skip", tr("Up to date"), st.st_size
+            if _attempt == 0:
+                t0 = PROFILER.clock()
+                up_to_date = _is_up_to_date_local(dst, st)
+                PROFILER.record("stat_check", t0)
+                if up_to_date:
+                    return "skip", tr("Up to date"), st.st_size
+
+            if _attempt == 0 and st.st_size >= _DELTA_MIN:
+                res = delta_copy(src, dst, st, cancel)
+                if res is not None:
+                    return res
 
             if not _ensure_dir(os.path.dirname(dst)):
                 return "error", tr("Directory could not be created"), 0
@@ -298,14 +337,16 @@ def _copy_file(src, dst, cancel, cached_st=None):
             except OSError as e:
                 logger.debug("Could not fchmod %s: %s", tmp, e)
 
-            if st.st_size > 0:
+            if st.st_size > _SMALL_FILE:
                 try:
                     os.ftruncate(wfd, st.st_size)
                     os.posix_fadvise(rfd, 0, st.st_size, os.POSIX_FADV_SEQUENTIAL)
                 except OSError:
                     pass
 
+            t0 = PROFILER.clock()
             copied = _copy_loop(rfd, wfd, st.st_size, cancel)
+            PROFILER.record("copy_data", t0)
             if copied < st.st_size:
                 raise OSError(f"Incomplete copy: {copied}/{st.st_size} bytes written")
 
@@ -350,16 +391,22 @@ def _copy_file(src, dst, cancel, cached_st=None):
 
 
 class _EntryTracker:
-    __slots__ = ("_counts", "_lock")
+    __slots__ = ("_counts", "_q")
 
     def __init__(self) -> None:
-        self._lock   = threading.Lock()
+        self._q: queue.SimpleQueue = queue.SimpleQueue()
         self._counts: dict[str, list[int]] = {}
 
     def batch_update(self, counts: dict) -> None:
-        if not counts:
-            return
-        with self._lock:
+        if counts:
+            self._q.put(counts)
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                counts = self._q.get_nowait()
+            except queue.Empty:
+                return
             for title, vals in counts.items():
                 if not title:
                     continue
@@ -373,71 +420,113 @@ class _EntryTracker:
                 c[2] += n_err
                 c[3] += n_del
 
+    def errors_for(self, title: str) -> int:
+        self._drain()
+        c = self._counts.get(title)
+        return c[2] if c else 0
+
     def emit_all(self, signal) -> None:
-        with self._lock:
-            snap = {t: ec[:] for t, ec in self._counts.items()}
-        for t, ec in snap.items():
+        self._drain()
+        for t, ec in self._counts.items():
             if t:
                 signal.emit(t, ec[0], ec[1], ec[2], ec[3])
 
 
 class _Flusher:
-    __slots__ = ("_de", "_er", "_flush_thresh", "_last_flush_t", "_lock", "_ok", "_signal", "_sk", "_total", "copied", "deleted", "done", "errors", "skipped")
+    __slots__ = ("_drain_lock", "_flush_thresh", "_q", "_queued", "_signal", "_stop", "_thread", "_total", "_wake",
+                 "copied", "deleted", "done", "errors", "moved", "skipped")
 
     def __init__(self, signal, total: int, flush_thresh: int = _FLUSH_THRESH) -> None:
         self._signal       = signal
         self._total        = total
         self._flush_thresh = flush_thresh
-        self._lock         = threading.Lock()
-        self._ok: list     = []
-        self._sk: list     = []
-        self._er: list     = []
-        self._de: list     = []
+        self._q: queue.SimpleQueue = queue.SimpleQueue()
+        self._queued       = 0
+        self._drain_lock   = threading.Lock()
+        self._wake         = threading.Event()
+        self._stop         = threading.Event()
         self.done = self.copied = self.skipped = self.errors = self.deleted = 0
-        self._last_flush_t = time.monotonic()
+        self.moved: dict[str, list[int]] = {}
+        self._thread = threading.Thread(target=self._run, name="copy-flusher", daemon=True)
+        self._thread.start()
 
     def set_total(self, total: int) -> None:
-        with self._lock: self._total = total
+        self._total = total
 
     def set_flush_thresh(self, thresh: int) -> None:
-        with self._lock: self._flush_thresh = thresh
-
-    def push(self, ok=(), sk=(), er=(), de=(), *, force: bool = False) -> None:
-        now = time.monotonic()
-        with self._lock:
-            if ok: self._ok.extend(ok)
-            if sk: self._sk.extend(sk)
-            if er: self._er.extend(er)
-            if de: self._de.extend(de)
-            n = len(self._ok) + len(self._sk) + len(self._er) + len(self._de)
-            if n == 0:
-                return
-            timed_out = (now - self._last_flush_t) >= _FLUSH_INTERVAL
-            if not force and n < self._flush_thresh and not timed_out:
+        self._flush_thresh = thresh
+
+    def push(self, ok=(), sk=(), er=(), de=(), *, force: bool = False, backend: str = "local") -> None:
+        if ok or sk or er or de:
+            self._q.put((ok, sk, er, de, backend))
+            self._queued += len(ok) + len(sk) + len(er) + len(de)
+            if self._queued >= self._flush_thresh:
+                self._wake.set()
+        if force:
+            self._drain()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(_FLUSH_INTERVAL)
+            self._wake.clear()
+            self._drain()
+
+    def _drain(self) -> None:
+        t0 = PROFILER.clock()
+        with self._drain_lock:
+            payload_ok: list = []
+            payload_sk: list = []
+            payload_er: list = []
+            payload_de: list = []
+            while True:
+                try:
+                    ok, sk, er, de, backend = self._q.get_nowait()
+                except queue.Empty:
+                    break
+                if ok:
+                    payload_ok.extend(ok)
+                    mv = self.moved.get(backend)
+                    if mv is None:
+                        mv = self.moved[backend] = [0, 0]
+                    mv[0] += len(ok)
+                    mv[1] += sum(item[2] for item in ok)
+                if sk: payload_sk.extend(sk)
+                if er: payload_er.extend(er)
+                if de: payload_de.extend(de)
+            self._queued = 0
+            if not (payload_ok or payload_sk or payload_er or payload_de):
                 return
-            payload_ok, self._ok = self._ok, []
-            payload_sk, self._sk = self._sk, []
-            payload_er, self._er = self._er, []
-            payload_de, self._de = self._de, []
             self.done    += len(payload_ok) + len(payload_sk) + len(payload_er)
             self.copied  += len(payload_ok)
             self.skipped += len(payload_sk)
             self.errors  += len(payload_er)
             self.deleted += len(payload_de)
-            done_snap  = self.done
-            total_snap = self._total
-            self._last_flush_t = now
-        self._signal.emit(payload_ok, payload_sk, payload_er, payload_de, done_snap, total_snap)
+            self._signal.emit(payload_ok, payload_sk, payload_er, payload_de, self.done, self._total)
+        PROFILER.record("flush_drain", t0)
+
+    def flush(self) -> None: self._drain()
 
-    def flush(self) -> None: self.push(force=True)
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._drain()
+
+    def moved_snapshot(self) -> dict[str, list[int]]:
+        with self._drain_lock:
+            return {b: mv[:] for b, mv in self.moved.items()}
 
 
 class _BatchBuffer:
-    __slots__ = ("_flusher", "_tracker", "er", "ok", "pending", "sk", "tc")
+    __slots__ = ("_codec", "_flusher", "_gate", "_tracker", "er", "ok", "pending", "sk", "tc")
 
-    def __init__(self, flusher: "_Flusher", tracker: "_EntryTracker") -> None:
+    def __init__(self, flusher: "_Flusher", tracker: "_EntryTracker", gate: "_IoGate | None" = None,
+                 codec: "_CodecMap | None" = None) -> None:
         self._flusher = flusher
         self._tracker = tracker
+        self._gate    = gate or None
+        self._codec   = codec or None
         self.ok: list = []
         self.sk: list = []
         self.er: list = []
@@ -445,17 +534,26 @@ class _BatchBuffer:
         self.pending = 0
 
     def record(self, entry, cancel: threading.Event) -> None:
-        _do_copy(entry, cancel, self.ok, self.sk, self.er, self.tc)
+        if self._gate is None:
+            _do_copy(entry, cancel, self.ok, self.sk, self.er, self.tc, self._codec)
+        else:
+            t0 = PROFILER.clock()
+            held = self._gate.acquire(entry)
+            PROFILER.record("io_gate", t0)
+            try:
+                _do_copy(entry, cancel, self.ok, self.sk, self.er, self.tc, self._codec)
+            finally:
+                for sem in held:
+                    sem.release()
         self.pending += 1
 
     def flush(self) -> None:
         if self.ok or self.sk or self.er:
             self._flusher.push(ok=self.ok, sk=self.sk, er=self.er)
-            self.ok.clear()
-            self.sk.clear()
-            self.er.clear()
-        self._tracker.batch_update(self.tc)
-        self.tc.clear()
+            self.ok, self.sk, self.er = [], [], []
+        if self.tc:
+            self._tracker.batch_update(self.tc)
+            self.tc = {}
         self.pending = 0
 
 
@@ -465,19 +563,54 @@ class CopyWorker(QThread):
     scan_progress = pyqtSignal(str, int)
     entry_status = pyqtSignal(str, int, int, int, int)
     scan_finished = pyqtSignal(int)
+    run_metrics = pyqtSignal(dict)
     _RSYNC_PROGRESS_RE = re.compile(
         r"^\s*([\d,]+)\s+(\d+)%\s+([\d.]+\w+/s)\s+([\d:]+)"
     )
     _RSYNC_DELETE_RE = re.compile(r"^deleting\s+(.+)$")
 
-    def __init__(self, tasks) -> None:
+    def __init__(self, tasks, journal: bool = False) -> None:
         super().__init__()
+        self._journal = journal
+        self._journal_claims: dict[str, list[tuple[str, str]]] = {}
+        self._journal_started = 0.0
         self._hooks: dict[str, tuple[list, list]] = self._extract_hooks(tasks)
         self._mirror_titles: set[str] = self._extract_mirror_flags(tasks)
+        self._pack_titles: set[str] = self._extract_flag(tasks, 7)
+        self._pack_uploads: dict[str, str] = {}
+        self._pack_min_size: set[tuple[str, str]] = set()
+        self._compress_titles: set[str] = self._extract_flag(tasks, 8)
+        self._codecs: "_CodecMap | None" = None
+        self._dedup: dict[str, int] = {
+            str(t[2]): int(t[9].get("max_versions") or 0)
+            for t in tasks if isinstance(t, (list, tuple)) and len(t) > 9 and isinstance(t[9], dict)
+        }
+        self._snap_titles: set[str] = self._extract_flag(tasks, 10)
+        self._snapshots: "SnapshotSet | None" = None
+        self._snap_origin: dict[str, str] = {}
         self.tasks = self._normalize_tasks(tasks)
         self._cancel = threading.Event()
         self._pre_fired_titles: set[str] = set()
         self._post_fired_titles: set[str] = set()
+        self._phase_t: dict[str, float] = {}
+
+    def _mark(self, phase: str) -> None:
+        self._phase_t.setdefault(phase, time.monotonic())
+
+    def _emit_metrics(self, flusher: "_Flusher") -> None:
+        self._mark("end")
+        t = self._phase_t
+        start = t.get("start", t["end"])
+        scanned = t.get("scanned", start)
+        copy_start = t.get("copy", t["end"])
+        moved = flusher.moved_snapshot()
+        self.run_metrics.emit({
+            "bytes":    sum(mv[1] for mv in moved.values()),
+            "scan_s":   round(scanned - start, 3),
+            "copy_s":   round(max(0.0, t["end"] - copy_start), 3),
+            "backends": moved,
+            "profile":  PROFILER.finish(),
+        })
 
     @staticmethod
     def _extract_mirror_flags(tasks) -> set[str]:
@@ -490,6 +623,17 @@ class CopyWorker(QThread):
                 result.add(title)
         return result
 
+    @staticmethod
+    def _extract_flag(tasks, pos: int) -> set[str]:
+        result: set[str] = set()
+        for t in tasks:
+            if not isinstance(t, (list, tuple)) or len(t) <= pos:
+                continue
+            title = str(t[2])
+            if title and t[pos]:
+                result.add(title)
+        return result
+
     @staticmethod
     def _extract_hooks(tasks) -> dict[str, tuple[list, list]]:
         result: dict[str, tuple[list, list]] = {}
@@ -589,14 +733,148 @@ class CopyWorker(QThread):
             _seen_dirs_global.clear()
         if hasattr(_tls, "seen_dirs"):
             _tls.seen_dirs.clear()
+        self._phase_t = {"start": time.monotonic()}
+        PROFILER.start(", ".join(dict.fromkeys(t for _s, _d, t, _e in self.tasks if t)), profiling_mode())
         try:
             self._run_impl()
         finally:
             self._run_pending_post_hooks()
+            PROFILER.finish()
+
+    def _prepare_packing(self) -> None:
+        tasks: list = []
+        for s, d, t, exc in self.tasks:
+            if (t not in self._pack_titles or self._cancel.is_set() or is_smb(s) or is_ssh(s)
+                    or not (is_smb(d) or is_ssh(d)) or not os.path.isdir(s)):
+                tasks.append((s, d, t, exc))
+                continue
+            self.scan_progress.emit(tr("Packing small files"), 0)
+            try:
+                packed, staging, n_new, loose = prepare_packed_task(s, d, exc, self._cancel,
+                                                                    key_path=self._snap_origin.get(s, s))
+            except OSError as e:
+                logger.error("pack %s: %s — copying unpacked", s, e)
+                tasks.append((s, d, t, exc))
+                continue
+            if is_ssh(d) and not loose:
+                self._pack_min_size.add((s, d))
+                packed = exc | {os.path.join(s, _PACK_DIRNAME)}
+            tasks.append((s, d, t, packed))
+            tasks.append((staging, _ssh_join(d, _PACK_DIRNAME), t, frozenset()))
+            self._pack_uploads[staging] = t
+            logger.info("pack [%s]: %d changed small file(s) bundled for %s", t, n_new, d)
+        self.tasks = tasks
+
+    def _finish_packing(self, flusher: "_Flusher", tracker: "_EntryTracker") -> None:
+        if self._cancel.is_set():
+            return
+        seen: set[str] = set()
+        for _s, d, t, _exc in self.tasks:
+            if d in seen or is_smb(d) or is_ssh(d) or not os.path.isfile(os.path.join(d, _PACK_DIRNAME, _PACK_INDEX)):
+                continue
+            seen.add(d)
+            self.scan_progress.emit(tr("Unpacking small files"), 0)
+            ok, sk, er = unpack_bundles(d, self._cancel)
+            flusher.push(ok=ok, sk=sk, er=er, force=True)
+            if t:
+                tracker.batch_update({t: (len(ok), len(sk), len(er))})
+        for staging, t in self._pack_uploads.items():
+            if not tracker.errors_for(t):
+                prune_uploaded(staging)
+
+    def _take_dedup(self, tasks: list) -> tuple[list, list]:
+        rest: list = []
+        dedup: list = []
+        for s, d, t, exc in tasks:
+            if os.path.isdir(s) and (t in self._dedup or is_store(s)):
+                dedup.append((s, d, t, exc))
+            else:
+                rest.append((s, d, t, exc))
+        return rest, dedup
+
+    def _run_dedup(self, tasks: list, flusher: "_Flusher", tracker: "_EntryTracker") -> None:
+        stores: dict[str, DedupStore] = {}
+        for s, d, t, exc in tasks:
+            if self._cancel.is_set():
+                break
+
+            def _emit(ok: list, sk: list, er: list, t: str = t) -> None:
+                flusher.push(ok=ok, sk=sk, er=er, backend="dedup")
+                if t:
+                    tracker.batch_update({t: (len(ok), len(sk), len(er), 0)})
+
+            try:
+                if t in self._dedup:
+                    self.scan_progress.emit(tr("Deduplicating {title}", title=t or s), 0)
+                    store = stores.get(d)
+                    if store is None:
+                        store = stores[d] = DedupStore(d)
+                    store.backup(s, t, exc, self._dedup[t], self._cancel, _emit, key_path=self._snap_origin.get(s, s))
+                else:
+                    self.scan_progress.emit(tr("Restoring from chunk store"), 0)
+                    if not DedupStore(s).restore(t, d, self._cancel, _emit):
+                        _emit([], [], [(s, tr("No backup of this entry in the chunk store"), 0)])
+            except OSError as e:
+                logger.error("dedup [%s] %s → %s: %s", t, s, d, e)
+                _emit([], [], [(s, str(e), 0)])
+        for store in stores.values():
+            if store.pruned and not self._cancel.is_set():
+                self.scan_progress.emit(tr("Removing unreferenced chunks"), 0)
+                try:
+                    store.collect_garbage()
+                except OSError as e:
+                    logger.error("dedup gc %s: %s", store.root, e)
+        flusher.flush()
+
+    def _snapshot_tasks(self, tasks: list) -> list:
+        if not self._snap_titles or self._cancel.is_set():
+            return tasks
+        if self._snapshots is None:
+            self._snapshots = SnapshotSet()
+        result: list = []
+        todo = list(reversed(tasks))
+        while todo:
+            s, d, t, exc = todo.pop()
+            if t in self._snap_titles and not (is_smb(s) or is_ssh(s)):
+                self.scan_progress.emit(tr("Creating snapshot"), 0)
+                mapped = self._snapshots.map(s)
+                if mapped is not None:
+                    nested = []
+                    for sub in self._snapshots.nested(s):
+                        rel = os.path.relpath(sub, os.path.realpath(s))
+                        live = os.path.join(s, rel)
+                        if not any(live == e or live.startswith(e + os.sep) for e in exc):
+                            nested.append(rel)
+                    todo.extend((os.path.join(s, rel), os.path.join(d, rel), t, exc) for rel in reversed(nested))
+                    exc = frozenset(mapped + e[len(s):] if e.startswith(s + os.sep) else e for e in exc)
+                    exc |= {os.path.join(mapped, rel) for rel in nested}
+                    self._snap_origin[mapped] = s
+                    s = mapped
+            result.append((s, d, t, exc))
+        return result
+
+    def _commit_journal(self, tracker: "_EntryTracker", skip_titles: set[str]) -> None:
+        if self._cancel.is_set():
+            return
+        for t, claims in self._journal_claims.items():
+            if t not in skip_titles and not tracker.errors_for(t):
+                mark_consumed(claims, self._journal_started)
 
     def _run_impl(self) -> None:
         pw: "_SecurePw | None" = None
+        flusher: "_Flusher | None" = None
         try:
+            if self._journal:
+                self.tasks, self._journal_claims, self._journal_started = narrow_tasks(
+                    self.tasks, self._pack_titles | self._compress_titles | set(self._dedup), self._snap_titles)
+            skip_titles = self._run_pre_hooks(self.tasks) if not self._cancel.is_set() else set()
+            self.tasks = self._snapshot_tasks([task for task in self.tasks if task[2] not in skip_titles])
+            if self._pack_titles:
+                self._prepare_packing()
+            codecs = _CodecMap(self.tasks, self._compress_titles)
+            if codecs:
+                self.tasks = codecs.tasks
+                self._codecs = codecs
             smb_tasks, ssh_tasks, local_tasks = [], [], []
             for s, d, t, exc in self.tasks:
                 if is_smb(s) or is_smb(d):
@@ -618,18 +896,23 @@ class CopyWorker(QThread):
             if not smb_tasks:
                 flusher = _Flusher(self.batch_update, 0)
                 tracker = _EntryTracker()
-                skip_titles = self._run_pre_hooks(local_tasks + ssh_tasks) if not self._cancel.is_set() else set()
-                active_local = [(s, d, t, e) for s, d, t, e in local_tasks if t not in skip_titles]
-                active_ssh = [(s, d, t, e) for s, d, t, e in ssh_tasks if t not in skip_titles]
-                if active_local and not self._cancel.is_set():
-                    self._scan_copy_local_pipelined(active_local, flusher, tracker)
+                copy_local, dedup_tasks = self._take_dedup(local_tasks)
+                if copy_local and not self._cancel.is_set():
+                    self._scan_copy_local_pipelined(copy_local, flusher, tracker)
                 else:
                     self.scan_finished.emit(0)
-                if active_ssh and not self._cancel.is_set():
-                    self._copy_ssh_tasks(active_ssh, flusher, tracker)
-                self._run_post_hooks(active_local + active_ssh)
-                flusher.flush()
+                if dedup_tasks and not self._cancel.is_set():
+                    self._run_dedup(dedup_tasks, flusher, tracker)
+                if ssh_tasks and not self._cancel.is_set():
+                    self._copy_ssh_tasks(ssh_tasks, flusher, tracker)
+                if self._codecs:
+                    self._codecs.save()
+                self._finish_packing(flusher, tracker)
+                self._commit_journal(tracker, skip_titles)
+                self._run_post_hooks(local_tasks + ssh_tasks)
+                flusher.close()
                 tracker.emit_all(self.entry_status)
+                self._emit_metrics(flusher)
                 cancelled = self._cancel.is_set()
                 self.finished_work.emit(flusher.copied, flusher.skipped, flusher.errors, flusher.deleted, cancelled)
                 return
@@ -640,15 +923,15 @@ class CopyWorker(QThread):
             smb_errors: list[tuple[str, str, str]] = []
             _guest_box: list[bool] = [False]
 
-            skip_titles = self._run_pre_hooks(local_tasks + ssh_tasks + smb_tasks) if not self._cancel.is_set() else set()
-            local_tasks = [(s, d, t, e) for s, d, t, e in local_tasks if t not in skip_titles]
-            ssh_tasks = [(s, d, t, e) for s, d, t, e in ssh_tasks if t not in skip_titles]
-            smb_tasks = [(s, d, t, e) for s, d, t, e in smb_tasks if t not in skip_titles]
+            local_tasks, dedup_tasks = self._take_dedup(local_tasks)
+
+            gate = _IoGate(local_tasks)
 
             def _phase1_local() -> None:
                 nonlocal local_items
                 if local_tasks and not self._cancel.is_set():
-                    local_items = self._scan_local_all(local_tasks, not_found=local_not_found)
+                    local_items = self._scan_local_all(local_tasks, not_found=local_not_found,
+                                                       inode_order=bool(gate))
 
             def _phase1_smb() -> None:
                 if not smb_tasks or self._cancel.is_set():
@@ -686,14 +969,17 @@ class CopyWorker(QThread):
             guest = _guest_box[0]
             total = len(local_items) + len(local_not_found) + len(smb_expanded) + len(smb_errors)
             cs, lb, ft, _spb, cw = _scale_params(total)
+            self._mark("scanned")
             self.scan_finished.emit(total)
 
             flusher = _Flusher(self.batch_update, total, flush_thresh=ft)
             tracker = _EntryTracker()
+            self._mark("copy")
 
             def _phase2_local() -> None:
                 if local_items and not self._cancel.is_set():
-                    self._copy_local_all(local_items, flusher, tracker, claim_size=cs, local_batch=lb, workers=cw)
+                    self._copy_local_all(local_items, flusher, tracker, claim_size=cs, local_batch=lb, workers=cw,
+                                         gate=gate)
                 if local_not_found and not self._cancel.is_set():
                     flusher.push(
                         sk=[(p, _not_found_reason(t_), 0)
@@ -715,20 +1001,31 @@ class CopyWorker(QThread):
                 futs = [pool.submit(_phase2_local), pool.submit(_phase2_smb)]
                 _run_futures(futs, self._cancel, "Phase-2")
 
+            if dedup_tasks and not self._cancel.is_set():
+                self._run_dedup(dedup_tasks, flusher, tracker)
             if ssh_tasks and not self._cancel.is_set():
                 self._copy_ssh_tasks(ssh_tasks, flusher, tracker)
 
-            self._run_post_hooks(local_tasks + ssh_tasks + smb_tasks)
-            flusher.flush()
+            if self._codecs:
+                self._codecs.save()
+            self._finish_packing(flusher, tracker)
+            self._commit_journal(tracker, skip_titles)
+            self._run_post_hooks(local_tasks + dedup_tasks + ssh_tasks + smb_tasks)
+            flusher.close()
             tracker.emit_all(self.entry_status)
+            self._emit_metrics(flusher)
             cancelled = self._cancel.is_set()
             self.finished_work.emit(flusher.copied, flusher.skipped, flusher.errors, flusher.deleted, cancelled)
         except Exception as exc:
             logger.error("CopyWorker critical: %s", exc, exc_info=True)
             self.finished_work.emit(0, 0, 0, 0, False)
         finally:
+            if flusher is not None:
+                flusher.close()
             if pw is not None:
                 pw.clear()
+            if self._snapshots is not None:
+                self._snapshots.release_all()
 
     def _copy_one_ssh_task(
             self,
@@ -747,9 +1044,18 @@ class CopyWorker(QThread):
         rsync_src = _rsync_src_arg(src)
         excludes_raw = list(extra[0]) if extra and extra[0] else None
         excludes = _rsync_excludes(rsync_src, excludes_raw)
-        mirror = title in self._mirror_titles
-
-        cmd = build_rsync_cmd(rsync_src, dst, exclude=excludes, delete=mirror)
+        mirror = title in self._mirror_titles and src not in self._pack_uploads
+
+        exclude_file = None
+        if excludes and len(excludes) > _RSYNC_MAX_ARG_EXCLUDES:
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", prefix="bh-rsync-", suffix=".excl",
+                                             delete=False) as fh:
+                fh.write("\n".join(excludes) + "\n")
+                exclude_file = fh.name
+            excludes = None
+        min_size = _PACK_MAX_FILE + 1 if (src, dst) in self._pack_min_size else 0
+        cmd = build_rsync_cmd(rsync_src, dst, exclude=excludes, delete=mirror, exclude_from=exclude_file,
+                              min_size=min_size)
         logger.debug("_copy_ssh_tasks: %s", " ".join(cmd))
 
         try:
@@ -761,6 +1067,8 @@ class CopyWorker(QThread):
                 bufsize=1,
             )
         except (OSError, FileNotFoundError) as exc:
+            if exclude_file:
+                _silent_unlink(exclude_file)
             logger.error("rsync launch failed for '%s': %s", src, exc)
             flusher.push(er=[(src, str(exc), 0)])
             _track(0, 0, 1)
@@ -770,11 +1078,15 @@ class CopyWorker(QThread):
             logger.error("rsync stdout is None for '%s'", src)
             proc.kill()
             proc.wait()
+            if exclude_file:
+                _silent_unlink(exclude_file)
             flusher.push(er=[(src, tr("rsync stdout unavailable"), 0)])
             _track(0, 0, 1)
             return
 
+        t_rsync = PROFILER.clock()
         last_pct = 0
+        moved_bytes = 0
         deleted_this_task: list = []
         _tid = threading.get_ident()
         with _smb_procs_lock:
@@ -793,6 +1105,7 @@ class CopyWorker(QThread):
                     line = line.rstrip()
                     m = self._RSYNC_PROGRESS_RE.match(line)
                     if m:
+                        moved_bytes = int(m.group(1).replace(",", ""))
                         pct = int(m.group(2))
                         if pct != last_pct:
                             last_pct = pct
@@ -815,6 +1128,9 @@ class CopyWorker(QThread):
         finally:
             with _smb_procs_lock:
                 _smb_procs.pop(_tid, None)
+            if exclude_file:
+                _silent_unlink(exclude_file)
+            PROFILER.record("rsync", t_rsync)
 
         if deleted_this_task:
             flusher.push(de=deleted_this_task, force=True)
@@ -824,7 +1140,7 @@ class CopyWorker(QThread):
             return
 
         if proc.returncode == 0:
-            flusher.push(ok=[(src, dst, 0)])
+            flusher.push(ok=[(src, dst, moved_bytes)], backend="ssh")
             _track(1, 0, 0, len(deleted_this_task))
             logger.info("rsync OK: %s → %s", src, dst)
         else:
@@ -840,6 +1156,7 @@ class CopyWorker(QThread):
     ) -> None:
         if not tasks:
             return
+        self._mark("copy")
         if len(tasks) == 1:
             src, dst, title, *extra = tasks[0]
             self._copy_one_ssh_task(src, dst, title, tuple(extra), flusher, tracker)
@@ -853,7 +1170,7 @@ class CopyWorker(QThread):
             ]
             _run_futures(futs, self._cancel, "rsync task")
 
-    def _scan_local_all(self, tasks: list, not_found: "list | None" = None) -> list:
+    def _scan_local_all(self, tasks: list, not_found: "list | None" = None, inode_order: bool = False) -> list:
         cancel = self._cancel
         file_q = queue.SimpleQueue()
         work_q = queue.SimpleQueue()
@@ -897,8 +1214,9 @@ class CopyWorker(QThread):
                     continue
 
                 local_files: list = []
+                t0 = PROFILER.clock()
                 try:
-                    for is_dir, path, dst_path, st in _scan_dir_entries(_src, _dst, _excl, cancel):
+                    for is_dir, path, dst_path, st in _scan_dir_entries(_src, _dst, _excl, cancel, inode_order):
                         if is_dir:
                             _enqueue((path, dst_path, _title, _excl))
                         else:
@@ -910,6 +1228,7 @@ class CopyWorker(QThread):
                 except OSError as exc:
                     logger.warning("scan %s: %s", _src, exc)
                 finally:
+                    PROFILER.record("scan_dir", t0)
                     if local_files:
                         file_q.put(local_files)
                         local_n += len(local_files)
@@ -953,7 +1272,12 @@ class CopyWorker(QThread):
             self.scan_finished.emit(0)
             return
 
+        gate = _IoGate(tasks)
+        n_copy = gate.workers(_WORKERS)
+        inode_order = bool(gate)
         pipe_q: queue.Queue = queue.Queue(maxsize=_PIPE_MAXSIZE)
+        large_q: queue.SimpleQueue = queue.SimpleQueue()
+        scan_done = threading.Event()
         sentinel = object()
         work_q = queue.SimpleQueue()
         pend_lock = threading.Lock()
@@ -1004,14 +1328,20 @@ class CopyWorker(QThread):
 
                 with copy_params_lock:
                     spb = copy_params[1]
+                t0 = PROFILER.clock()
                 try:
-                    for is_dir, path, dst_path, entry_stat in _scan_dir_entries(_src, _dst, _excl, cancel):
+                    for is_dir, path, dst_path, entry_stat in _scan_dir_entries(_src, _dst, _excl, cancel, inode_order):
                         if is_dir:
                             _eq((path, dst_path, _title, _excl))
+                            continue
+                        entry = (path, dst_path, _title, entry_stat)
+                        local_n += 1
+                        if _is_large(entry):
+                            large_q.put(entry)
                         else:
-                            batch.append((path, dst_path, _title, entry_stat))
-                            local_n += 1
+                            batch.append(entry)
                             if len(batch) >= spb:
+                                t_put = PROFILER.clock()
                                 while not cancel.is_set():
                                     try:
                                         pipe_q.put(batch, timeout=0.25)
@@ -1025,6 +1355,7 @@ class CopyWorker(QThread):
                                 else:
                                     local_n -= len(batch)
                                     batch = []
+                                PROFILER.record("pipe_put", t_put)
                 except NotADirectoryError:
                     batch.append((_src, _dst, _title, None))
                     local_n += 1
@@ -1033,6 +1364,7 @@ class CopyWorker(QThread):
                 except OSError as exc:
                     logger.warning("scan %s: %s", _src, exc)
                 finally:
+                    PROFILER.record("scan_dir", t0)
                     emit_cur = -1
                     now = time.monotonic()
                     with pend_lock:
@@ -1067,7 +1399,8 @@ class CopyWorker(QThread):
                     found[0] += local_n
 
         def _copy_worker() -> None:
-            buf = _BatchBuffer(flusher, tracker)
+            self._mark("copy")
+            buf = _BatchBuffer(flusher, tracker, gate, self._codecs)
             last_fl_t = time.monotonic()
             _file_ctr = 0
 
@@ -1078,20 +1411,25 @@ class CopyWorker(QThread):
                 _file_ctr = 0
 
             while True:
+                t0 = PROFILER.clock()
                 try:
                     item = pipe_q.get(timeout=0.1)
                 except queue.Empty:
+                    PROFILER.record("pipe_wait", t0)
                     if cancel.is_set():
                         break
                     if (time.monotonic() - last_fl_t) >= _FLUSH_INTERVAL:
                         _fl()
                     continue
+                PROFILER.record("pipe_wait", t0)
                 if item is sentinel:
                     break
                 if cancel.is_set():
                     continue
                 with copy_params_lock:
                     lb = copy_params[0]
+                if gate:
+                    item.sort(key=_inode_key)
                 for entry in item:
                     if cancel.is_set():
                         break
@@ -1102,13 +1440,35 @@ class CopyWorker(QThread):
                         and (time.monotonic() - last_fl_t) >= _FLUSH_INTERVAL
                     ):
                         _fl()
+            while not cancel.is_set():
+                try:
+                    entry = large_q.get_nowait()
+                except queue.Empty:
+                    break
+                buf.record(entry, cancel)
+                _fl()
             _fl()
 
+        def _large_worker() -> None:
+            self._mark("copy")
+            buf = _BatchBuffer(flusher, tracker, gate, self._codecs)
+            while not cancel.is_set():
+                try:
+                    entry = large_q.get(timeout=0.1)
+                except queue.Empty:
+                    if scan_done.is_set():
+                        break
+                    continue
+                buf.record(entry, cancel)
+                buf.flush()
+            buf.flush()
+
         def _run_scan() -> None:
             try:
                 with concurrent.futures.ThreadPoolExecutor(max_workers=_WORKERS) as sp:
                     futs = [sp.submit(_scan_worker) for _ in range(_WORKERS)]
                     _run_futures(futs, cancel, "scan worker")
+                self._mark("scanned")
                 total = found[0] + missing[0]
                 self.scan_progress.emit(tr("Scanning"), total)
                 _, lb, ft, spb, _ = _scale_params(total)
@@ -1119,13 +1479,14 @@ class CopyWorker(QThread):
                 flusher.set_flush_thresh(ft)
                 self.scan_finished.emit(total)
             finally:
+                scan_done.set()
                 if cancel.is_set():
                     while True:
                         try:
                             pipe_q.get_nowait()
                         except queue.Empty:
                             break
-                for _ in range(_WORKERS):
+                for _ in range(n_copy):
                     while True:
                         try:
                             pipe_q.put(sentinel, timeout=0.1)
@@ -1133,9 +1494,10 @@ class CopyWorker(QThread):
                         except queue.Full:
                             pass
 
-        pool = concurrent.futures.ThreadPoolExecutor(max_workers=1 + _WORKERS)
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=1 + n_copy + _LARGE_STREAMS)
         try:
-            all_futs = [pool.submit(_run_scan)] + [pool.submit(_copy_worker) for _ in range(_WORKERS)]
+            all_futs = ([pool.submit(_run_scan)] + [pool.submit(_copy_worker) for _ in range(n_copy)]
+                        + [pool.submit(_large_worker) for _ in range(_LARGE_STREAMS)])
             _run_futures(all_futs, cancel, "pipeline worker")
         finally:
             pool.shutdown(wait=True, cancel_futures=False)
@@ -1193,43 +1555,65 @@ class CopyWorker(QThread):
 
     def _copy_local_all(self, items: list, flusher: _Flusher, tracker: _EntryTracker,
                         claim_size: int = _CLAIM_SIZE, local_batch: int = _LOCAL_BATCH,
-                        workers: int = 0) -> None:
+                        workers: int = 0, gate: "_IoGate | None" = None) -> None:
         cancel = self._cancel
-        n_items = len(items)
-        if not n_items:
+        if not items:
             return
 
+        small, large = _split_by_size(items)
+        if gate:
+            small.sort(key=_inode_key)
+            large.sort(key=_physical_key)
+        n_small, n_large = len(small), len(large)
         claim_lock = threading.Lock()
-        claim_idx = [0]
+        small_idx = [0]
+        large_idx = [0]
 
-        def _claim() -> "tuple[int, int] | None":
+        def _claim_small() -> "list | None":
             with claim_lock:
-                start = claim_idx[0]
-                if start >= n_items:
+                start = small_idx[0]
+                if start >= n_small:
                     return None
-                end = min(start + claim_size, n_items)
-                claim_idx[0] = end
-                return start, end
+                end = min(start + claim_size, n_small)
+                small_idx[0] = end
+            return small[start:end]
 
-        def _worker() -> None:
-            buf = _BatchBuffer(flusher, tracker)
+        def _claim_large() -> "list | None":
+            with claim_lock:
+                i = large_idx[0]
+                if i >= n_large:
+                    return None
+                large_idx[0] = i + 1
+            return [large[i]]
+
+        def _worker(prefer_large: bool) -> None:
+            buf = _BatchBuffer(flusher, tracker, gate, self._codecs)
             while not cancel.is_set():
-                claim = _claim()
+                if prefer_large:
+                    claim, is_large = _claim_large(), True
+                    if claim is None:
+                        claim, is_large = _claim_small(), False
+                else:
+                    claim, is_large = _claim_small(), False
+                    if claim is None:
+                        claim, is_large = _claim_large(), True
                 if claim is None:
                     break
-                start, end = claim
-                for i in range(start, end):
+                for entry in claim:
                     if cancel.is_set():
                         break
-                    buf.record(items[i], cancel)
-                    if buf.pending >= local_batch:
+                    buf.record(entry, cancel)
+                    if is_large or buf.pending >= local_batch:
                         buf.flush()
             buf.flush()
 
         _workers = workers or _WORKERS
+        if gate:
+            _workers = gate.workers(_workers)
         pool = concurrent.futures.ThreadPoolExecutor(max_workers=_workers)
         try:
-            futs = [pool.submit(_worker) for _ in range(_workers)]
+            streams = min(_LARGE_STREAMS, n_large, _workers)
+            futs = [pool.submit(_worker, i < streams) for i in range(_workers)]
             _run_futures(futs, cancel, "copy worker")
         finally:
             pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,247 @@
+import gzip
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+
+from drive_utils import is_smb, is_ssh
+from state import logger
+from translations import tr
+from copy_worker_core import _LARGE_FILE, _PID, _ensure_dir, _silent_unlink
+
+_COMP_INDEX   = ".backup-helper-compressed.json"
+_EXT_ZSTD     = ".bh.zst"
+_EXT_GZIP     = ".bh.gz"
+_ZSTD_MIN     = 1024 * 1024
+_GZIP_LEVEL   = 6
+_STREAM_BUF   = 1024 * 1024
+_ZSTD: str | None = shutil.which("zstd")
+
+_INCOMPRESSIBLE_RE = re.compile(
+    r"\.(?:7z|aac|apk|avif|br|bz2|deb|docx|epub|flac|gif|gz|heic|jar|jpe?g|lz4|lzma|m4a|mkv|mov|mp3|mp4|"
+    r"odt|ogg|opus|pdf|png|rar|rpm|tgz|webm|webp|whl|xlsx|xz|zip|zst)$",
+    re.I,
+)
+
+
+def _is_up_to_date(d: "os.stat_result", size: int, mtime_ns: int) -> bool:
+    return d.st_size == size and abs(d.st_mtime_ns - mtime_ns) <= 2_000_000_000
+
+
+class _CompressedRoot:
+    __slots__ = ("_by_stored", "_dirty", "_lock", "files", "root")
+
+    def __init__(self, root: str) -> None:
+        self.root   = root
+        self._lock  = threading.Lock()
+        self._dirty = False
+        self.files: dict[str, list] = {}
+        try:
+            with open(os.path.join(root, _COMP_INDEX), encoding="utf-8") as f:
+                raw = json.load(f)
+            if isinstance(raw, dict) and isinstance(raw.get("files"), dict):
+                self.files = raw["files"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as exc:
+            logger.warning("compressed index %s unreadable: %s", root, exc)
+        self._by_stored = {meta[2]: rel for rel, meta in self.files.items()}
+
+    def get(self, rel: str) -> "list | None":
+        with self._lock:
+            return self.files.get(rel)
+
+    def original_of(self, stored_rel: str) -> "tuple[str, list] | None":
+        with self._lock:
+            rel = self._by_stored.get(stored_rel)
+            return (rel, self.files[rel]) if rel is not None else None
+
+    def put(self, rel: str, meta: list) -> None:
+        with self._lock:
+            old = self.files.get(rel)
+            if old is not None:
+                self._by_stored.pop(old[2], None)
+            self.files[rel] = meta
+            self._by_stored[meta[2]] = rel
+            self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            path = os.path.join(self.root, _COMP_INDEX)
+            tmp = f"{path}.{_PID}.tmp"
+            try:
+                os.makedirs(self.root, exist_ok=True)
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"version": 1, "files": self.files}, f, separators=(",", ":"))
+                os.replace(tmp, path)
+                self._dirty = False
+            except OSError as exc:
+                _silent_unlink(tmp)
+                logger.error("compressed index %s not saved: %s", path, exc)
+
+
+def _run_zstd(args: list, cancel: threading.Event) -> None:
+    proc = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    while True:
+        try:
+            _out, err = proc.communicate(timeout=0.25)
+            break
+        except subprocess.TimeoutExpired:
+            if cancel.is_set():
+                proc.kill()
+                proc.wait()
+                raise InterruptedError
+    if proc.returncode != 0:
+        raise OSError(tr("zstd failed: {err}", err=(err or b"").decode(errors="replace").strip()))
+
+
+def _stream(fin, fout, cancel: threading.Event) -> None:
+    while True:
+        if cancel.is_set():
+            raise InterruptedError
+        buf = fin.read(_STREAM_BUF)
+        if not buf:
+            return
+        fout.write(buf)
+
+
+def _compress_to(src: str, tmp: str, ext: str, size: int, cancel: threading.Event) -> None:
+    if ext == _EXT_ZSTD:
+        assert _ZSTD is not None
+        _run_zstd([_ZSTD, "-q", "-f", "-3", *(["-T0"] if size >= _LARGE_FILE else []), src, "-o", tmp], cancel)
+        return
+    with open(src, "rb") as fin, open(tmp, "wb") as raw, \
+            gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=_GZIP_LEVEL, mtime=0) as fout:
+        _stream(fin, fout, cancel)
+
+
+def _decompress_to(src: str, tmp: str, cancel: threading.Event) -> None:
+    if src.endswith(_EXT_ZSTD):
+        if not _ZSTD:
+            raise OSError(tr("zstd is required to unpack {name}", name=os.path.basename(src)))
+        _run_zstd([_ZSTD, "-q", "-d", "-f", src, "-o", tmp], cancel)
+        return
+    with gzip.open(src, "rb") as fin, open(tmp, "wb") as fout:
+        _stream(fin, fout, cancel)
+
+
+def _finish_tmp(tmp: str, dst: str, mode: int, mtime_ns: int, atime_ns: int) -> None:
+    os.chmod(tmp, mode & 0o7777)
+    os.utime(tmp, ns=(atime_ns, mtime_ns))
+    os.replace(tmp, dst)
+
+
+def compress_file(src: str, dst: str, st: "os.stat_result", root: _CompressedRoot,
+                  cancel: threading.Event) -> tuple:
+    rel = os.path.relpath(dst, root.root)
+    prev = root.get(rel)
+    if prev is not None and prev[0] == st.st_size and abs(prev[1] - st.st_mtime_ns) <= 2_000_000_000:
+        try:
+            os.stat(os.path.join(root.root, prev[2]))
+            return "skip", tr("Up to date"), st.st_size
+        except OSError:
+            pass
+    ext = _EXT_ZSTD if _ZSTD and st.st_size >= _ZSTD_MIN else _EXT_GZIP
+    stored = dst + ext
+    if not _ensure_dir(os.path.dirname(stored)):
+        return "error", tr("Directory could not be created"), 0
+    tmp = f"{stored}.{_PID}.{threading.get_ident()}.part"
+    try:
+        _compress_to(src, tmp, ext, st.st_size, cancel)
+        _finish_tmp(tmp, stored, st.st_mode, st.st_mtime_ns, st.st_atime_ns)
+    except InterruptedError:
+        _silent_unlink(tmp)
+        return "skip", tr("Cancelled"), 0
+    except OSError as exc:
+        _silent_unlink(tmp)
+        logger.error("compress %s → %s: %s", src, stored, exc)
+        return "error", str(exc), 0
+    stored_rel = os.path.relpath(stored, root.root)
+    if prev is not None and prev[2] != stored_rel:
+        _silent_unlink(os.path.join(root.root, prev[2]))
+    root.put(rel, [st.st_size, st.st_mtime_ns, stored_rel, os.path.getsize(stored)])
+    return "ok", stored, st.st_size
+
+
+def decompress_file(src: str, dst: str, root: _CompressedRoot, cancel: threading.Event) -> "tuple | None":
+    hit = root.original_of(os.path.relpath(src, root.root))
+    if hit is None:
+        return None
+    rel, meta = hit
+    out = os.path.join(os.path.dirname(dst), os.path.basename(rel))
+    try:
+        if _is_up_to_date(os.stat(out), meta[0], meta[1]):
+            return "skip", tr("Up to date"), meta[0]
+    except OSError:
+        pass
+    if not _ensure_dir(os.path.dirname(out)):
+        return "error", tr("Directory could not be created"), 0
+    tmp = f"{out}.{_PID}.{threading.get_ident()}.part"
+    try:
+        st = os.stat(src)
+        _decompress_to(src, tmp, cancel)
+        _finish_tmp(tmp, out, st.st_mode, meta[1], meta[1])
+    except InterruptedError:
+        _silent_unlink(tmp)
+        return "skip", tr("Cancelled"), 0
+    except OSError as exc:
+        _silent_unlink(tmp)
+        logger.error("decompress %s → %s: %s", src, out, exc)
+        return "error", str(exc), 0
+    return "ok", out, meta[0]
+
+
+class _CodecMap:
+    __slots__ = ("_roots", "tasks")
+
+    def __init__(self, tasks: list, compress_titles: set[str]) -> None:
+        roots: dict[str, _CompressedRoot] = {}
+        found: dict[tuple[str, str], _CompressedRoot] = {}
+        self.tasks: list = []
+        for s, d, t, exc in tasks:
+            remote = is_smb(s) or is_ssh(s) or is_smb(d) or is_ssh(d)
+            path = mode = ""
+            if t in compress_titles and not remote:
+                path, mode = d, "compress"
+            elif t in compress_titles:
+                logger.info("compress [%s]: %s is not a local path — copied uncompressed", t, d)
+            elif not remote and os.path.isfile(os.path.join(s, _COMP_INDEX)):
+                path, mode = s, "decompress"
+            if path:
+                key = os.path.normpath(path)
+                root = roots.get(key)
+                if root is None:
+                    root = roots[key] = _CompressedRoot(key)
+                found[(key.rstrip("/") + "/", mode)] = root
+                exc = exc | {os.path.join(s, _COMP_INDEX)}
+            self.tasks.append((s, d, t, exc))
+        self._roots: list[tuple[str, str, _CompressedRoot]] = sorted(
+            ((prefix, mode, root) for (prefix, mode), root in found.items()), key=lambda r: -len(r[0]))
+
+    def __bool__(self) -> bool: return bool(self._roots)
+
+    def copy(self, entry: tuple, cancel: threading.Event) -> "tuple | None":
+        src, dst, _title, st = entry
+        for prefix, mode, root in self._roots:
+            if mode == "compress":
+                if not dst.startswith(prefix):
+                    continue
+                if st is True or _INCOMPRESSIBLE_RE.search(src):
+                    return None
+                if st is None:
+                    try:
+                        st = os.stat(src, follow_symlinks=False)
+                    except OSError:
+                        return "error", tr("Source unreadable"), 0
+                return compress_file(src, dst, st, root, cancel)
+            if src.startswith(prefix):
+                return None if st is True else decompress_file(src, dst, root, cancel)
+        return None
+
+    def save(self) -> None:
+        for root in {id(r): r for _p, _m, r in self._roots}.values():
+            root.save()
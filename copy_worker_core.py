@@ -1,13 +1,15 @@
 import concurrent.futures
+import fcntl
 import os
 import re
 import shutil
+import struct
 import subprocess
 import threading
 from functools import lru_cache
 from urllib.parse import urlparse
 
-from drive_utils import is_smb, is_ssh
+from drive_utils import is_smb, is_ssh, mount_of
 from state import logger
 from themes import register_cache_invalidation_hook as _reg_cache_hook
 from translations import tr
@@ -27,6 +29,15 @@ _SCAN_PIPE_BATCH = 128
 _LOCAL_BATCH     = 256
 _CLAIM_SIZE      = 32
 _PIPE_MAXSIZE    = 1024
+_LARGE_FILE      = 64 * 1024 * 1024
+_SMALL_FILE      = 256 * 1024
+_HUGE_FILE       = 1024 * 1024 * 1024
+_HUGE_CHUNK      = 128 * 1024 * 1024
+_DROP_WINDOW     = 256 * 1024 * 1024
+_LARGE_STREAMS   = 2
+_NET_FSTYPES     = frozenset({"cifs", "smb3", "smbfs", "nfs", "nfs4", "9p", "afs", "ceph", "glusterfs", "davfs",
+                              "fuse.sshfs", "fuse.rclone", "fuse.gvfsd-fuse"})
+_DEVICE_CAPS     = {"hdd": 2, "net": 4, "ssd": _WORKERS}
 _MIN_FREE        = 500 * 1024 * 1024
 
 
@@ -39,18 +50,59 @@ def _scale_params(total: int) -> tuple[int, int, int, int, int]:
     return _CLAIM_SIZE, _LOCAL_BATCH, _FLUSH_THRESH, _SCAN_PIPE_BATCH, min(w, 4)
 
 
-_SKIP_RE = re.compile(
-    r"^(?:"
-    r"\.?lock|lockfile|\.lck|\.parentlock|Singleton\w*|"
-    r"cache|Network\sCache|startupCache|jumpListCache|"
+def _copy_chunk(size: int) -> tuple[int, int]:
+    if size <= _SMALL_FILE:
+        return max(size, 1), max(size, 1)
+    if size >= _HUGE_FILE:
+        return _HUGE_CHUNK, _IO_BUF
+    return _CHUNK, _IO_BUF
+
+
+def _release_pages(rfd: int, wfd: int, start: int, end: int) -> None:
+    try:
+        os.fdatasync(wfd)
+    except OSError:
+        pass
+    for fd in (rfd, wfd):
+        try:
+            os.posix_fadvise(fd, start, end - start, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def _is_large(entry: tuple) -> bool:
+    return getattr(entry[3], "st_size", 0) >= _LARGE_FILE
+
+
+def _inode_key(entry: tuple) -> tuple[int, int]:
+    st = entry[3]
+    return getattr(st, "st_dev", 0), getattr(st, "st_ino", 0)
+
+
+def _split_by_size(items: list) -> tuple[list, list]:
+    small: list = []
+    large: list = []
+    for item in items:
+        (large if _is_large(item) else small).append(item)
+    large.sort(key=lambda item: item[3].st_size, reverse=True)
+    return small, large
+
+
+_SKIP_LIVE = (
     r".*\.sqlite-wal|.*\.sqlite-shm|.*\.journal|.*[-_]journal|.*\.db-wal|.*\.db-shm|"
     r"idb|WebStorage|Session\sStorage|Local\sStorage|leveldb|.*\.ldb|"
+)
+_SNAP_MARK        = "backup-helper-snap-"
+_SKIP_ALWAYS = (
+    r"\.?lock|lockfile|\.lck|\.parentlock|Singleton\w*|"
+    r"cache|Network\sCache|startupCache|jumpListCache|"
     r"temp|tmp|.*\.tmp|.*\.bak|.*\.baklz4|recovery\.jsonlz4|recovery\.baklz4|sessionstore-backups|"
     r"Thumbs\.db|\.DS_Store|\.quota|\.user64|\.healthcheck|\.active-update|"
-    r"GPUCache|ShaderCache|blob_storage|prefs\.js"
-    r")$",
-    re.I
+    r"GPUCache|ShaderCache|blob_storage|prefs\.js|"
+    rf"\.{re.escape(_SNAP_MARK)}[\w-]+"
 )
+_SKIP_RE          = re.compile(f"^(?:{_SKIP_LIVE}{_SKIP_ALWAYS})$", re.I)
+_SKIP_RE_SNAPSHOT = re.compile(f"^(?:{_SKIP_ALWAYS})$", re.I)
 
 _SMB_LINE_RE = re.compile(
     r"^(.+?)\s+([ADRHNSV]*)\s*(?:\(.*?\)\s*)?(\d+)"
@@ -164,12 +216,18 @@ def _classify_entry(e: "os.DirEntry") -> "tuple[bool, bool, bool] | None":
         return None
 
 
-def _scan_dir_entries(src: str, dst: str, excl: frozenset, cancel: threading.Event):
+def _skip_re_for(src: str) -> "re.Pattern[str]":
+    return _SKIP_RE_SNAPSHOT if _SNAP_MARK in src else _SKIP_RE
+
+
+def _scan_dir_entries(src: str, dst: str, excl: frozenset, cancel: threading.Event, inode_order: bool = False):
+    skip_re = _skip_re_for(src)
     with os.scandir(src) as it:
-        for e in it:
+        entries = sorted(it, key=lambda e: e.inode()) if inode_order else it
+        for e in entries:
             if cancel.is_set():
                 break
-            if e.path in excl or _SKIP_RE.search(e.name):
+            if e.path in excl or skip_re.search(e.name):
                 continue
             cls = _classify_entry(e)
             if cls is None:
@@ -189,6 +247,140 @@ def _scan_dir_entries(src: str, dst: str, excl: frozenset, cancel: threading.Eve
                     yield False, e.path, dst_path, st
 
 
+_FS_IOC_FIEMAP = 0xC020660B
+_FIEMAP_HDR    = struct.Struct("=QQIIII")
+_FIEMAP_EXT    = struct.Struct("=QQQ2QI3I")
+
+
+def _physical_offset(path: str) -> int:
+    buf = bytearray(_FIEMAP_HDR.pack(0, 0xFFFFFFFFFFFFFFFF, 0, 0, 1, 0) + bytes(_FIEMAP_EXT.size))
+    try:
+        fd = os.open(path, os.O_RDONLY | _O_NOATIME)
+    except PermissionError:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return 0
+    except OSError:
+        return 0
+    try:
+        fcntl.ioctl(fd, _FS_IOC_FIEMAP, buf)
+    except OSError:
+        return 0
+    finally:
+        os.close(fd)
+    if not _FIEMAP_HDR.unpack_from(buf)[3]:
+        return 0
+    return _FIEMAP_EXT.unpack_from(buf, _FIEMAP_HDR.size)[1]
+
+
+def _physical_key(entry: tuple) -> tuple[int, int]:
+    return getattr(entry[3], "st_dev", 0), _physical_offset(entry[0])
+
+
+_dev_class_cache: dict[int, str] = {}
+_dev_class_lock = threading.Lock()
+
+
+def _rotational(source: str, st_dev: int) -> "bool | None":
+    candidates = []
+    if source.startswith("/dev/"):
+        candidates.append(os.path.join("/sys/class/block", os.path.basename(os.path.realpath(source))))
+    if os.major(st_dev):
+        candidates.append(f"/sys/dev/block/{os.major(st_dev)}:{os.minor(st_dev)}")
+    for base in candidates:
+        base = os.path.realpath(base)
+        for q in (os.path.join(base, "queue", "rotational"), os.path.join(base, "..", "queue", "rotational")):
+            try:
+                with open(q, encoding="ascii") as fh:
+                    return fh.read().strip() == "1"
+            except OSError:
+                continue
+    return None
+
+
+def _device_class(path: str) -> "tuple[int, str] | None":
+    probe = os.path.abspath(os.path.expanduser(path))
+    while probe and not os.path.exists(probe):
+        parent = os.path.dirname(probe)
+        probe = "" if parent == probe else parent
+    if not probe:
+        return None
+    try:
+        dev = os.stat(probe).st_dev
+    except OSError:
+        return None
+    with _dev_class_lock:
+        cls = _dev_class_cache.get(dev)
+    if cls is None:
+        source, mnt, fstype = mount_of(probe)
+        if fstype in _NET_FSTYPES or fstype.startswith("fuse.sshfs"):
+            cls = "net"
+        else:
+            cls = "hdd" if _rotational(source, dev) else "ssd"
+        logger.info("io: %s on %s (%s) classified as %s", mnt, source or "?", fstype or "?", cls)
+        with _dev_class_lock:
+            _dev_class_cache[dev] = cls
+    return dev, cls
+
+
+class _IoGate:
+    __slots__ = ("_dst_roots", "_pairs", "_sems")
+
+    def __init__(self, tasks: list) -> None:
+        self._sems: dict[int, threading.BoundedSemaphore] = {}
+        self._dst_roots: dict[str, int] = {}
+        self._pairs: dict[tuple, int] = {}
+        for src, dst, *_ in tasks:
+            caps: list[int] = []
+            devs: list = []
+            for path, is_dst in ((src, False), (dst, True)):
+                info = _device_class(path) if isinstance(path, str) and path else None
+                if info is None:
+                    devs.append(None)
+                    caps.append(_WORKERS)
+                    continue
+                dev, cls = info
+                cap = _DEVICE_CAPS[cls]
+                devs.append(dev)
+                caps.append(cap)
+                if cap < _WORKERS and dev not in self._sems:
+                    self._sems[dev] = threading.BoundedSemaphore(cap)
+                if is_dst:
+                    self._dst_roots[os.path.normpath(path)] = dev
+            self._pairs[tuple(devs)] = min(caps)
+
+    def __bool__(self) -> bool: return bool(self._sems)
+
+    def is_limited(self, dev: int) -> bool: return dev in self._sems
+
+    def workers(self, default: int) -> int:
+        if not self._pairs or any(cap >= _WORKERS for cap in self._pairs.values()):
+            return default
+        return max(1, min(default, sum(self._pairs.values())))
+
+    def acquire(self, entry: tuple) -> list:
+        devs = set()
+        src_dev = getattr(entry[3], "st_dev", None)
+        if src_dev in self._sems:
+            devs.add(src_dev)
+        dst = os.path.dirname(entry[1])
+        while True:
+            dev = self._dst_roots.get(dst)
+            if dev is not None:
+                if dev in self._sems:
+                    devs.add(dev)
+                break
+            parent = os.path.dirname(dst)
+            if parent == dst:
+                break
+            dst = parent
+        held = [self._sems[d] for d in sorted(devs)]
+        for sem in held:
+            sem.acquire()
+        return held
+
+
 def _ensure_dir(path: str) -> bool:
     if not path:
         return True
@@ -0,0 +1,410 @@
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+import threading
+import zlib
+from datetime import datetime
+
+from state import logger
+from translations import tr
+from copy_worker_core import _PID, _WORKERS, _ensure_dir, _scan_dir_entries, _silent_unlink
+
+_STORE_MARKER  = ".backup-helper-dedup.json"
+_CHUNK_DIR     = "chunks"
+_MANIFEST_DIR  = "manifests"
+_CDC_MIN       = 256 * 1024
+_CDC_AVG       = 1024 * 1024
+_CDC_MAX       = 4 * 1024 * 1024
+_CDC_READ      = 8 * 1024 * 1024
+_CDC_WINDOW    = 16
+_CDC_STEP      = 128 * 1024
+_GEAR          = bytes.maketrans(bytes(range(256)), hashlib.blake2b(b"gear", digest_size=64).digest() * 4)
+_PATTERN       = bytes.fromhex("9e3779")
+_MASK_S        = 0x3F
+_MASK_L        = 0x03
+_VERSION_RE    = re.compile(r"^(\d+) - .*\.json$")
+_RESULT_BATCH  = 256
+
+
+def is_store(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, _STORE_MARKER))
+
+
+def _window_sums(buf, start: int, end: int) -> bytes:
+    lanes = bytearray(2 * (end - start))
+    lanes[::2] = buf[start:end].translate(_GEAR)
+    x = int.from_bytes(lanes, "little")
+    width = 16
+    while width < 16 * _CDC_WINDOW:
+        x += x << width
+        width *= 2
+    return x.to_bytes(len(lanes) + 2 * _CDC_WINDOW, "little")[:len(lanes):2]
+
+
+def _scan(buf, start: int, end: int, mask: int) -> int:
+    off = max(0, start - _CDC_WINDOW)
+    sums = _window_sums(buf, off, end)
+    head, tail = _PATTERN[:2], _PATTERN[2] & mask
+    cut = -1
+    for first in (start - off, start - off + 1):
+        lane = sums[first::2]
+        i = lane.find(head)
+        while 0 <= i < len(lane) - 2 and lane[i + 2] & mask != tail:
+            i = lane.find(head, i + 1)
+        if 0 <= i < len(lane) - 2 and (cut < 0 or off + first + 2 * i < cut):
+            cut = off + first + 2 * i
+    return cut + 2 * len(_PATTERN) - 1 if cut >= 0 else -1
+
+
+def _cut_point(buf, end: int) -> int:
+    if end <= _CDC_MIN:
+        return end
+    normal = min(_CDC_AVG, end)
+    stop = min(_CDC_MAX, end)
+    cut = _scan(buf, _CDC_MIN, normal, _MASK_S)
+    if cut >= 0:
+        return cut
+    for start in range(normal, stop, _CDC_STEP):
+        cut = _scan(buf, start, min(start + _CDC_STEP, stop), _MASK_L)
+        if cut >= 0:
+            return cut
+    return stop
+
+
+def _chunk_path(root: str, cid: str) -> str:
+    return os.path.join(root, _CHUNK_DIR, cid[:2], cid)
+
+
+def _put_chunk(root: str, data: bytes) -> tuple[str, int]:
+    cid = hashlib.blake2b(data, digest_size=32).hexdigest()
+    path = _chunk_path(root, cid)
+    if os.path.exists(path):
+        return cid, 0
+    packed = zlib.compress(data, 3)
+    blob = b"Z" + packed if len(packed) < len(data) * 0.9 else b"R" + data
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, path)
+    except OSError:
+        _silent_unlink(tmp)
+        raise
+    return cid, len(blob)
+
+
+def _read_chunk(root: str, cid: str) -> bytes:
+    with open(_chunk_path(root, cid), "rb") as f:
+        blob = f.read()
+    data = zlib.decompress(blob[1:]) if blob[:1] == b"Z" else blob[1:]
+    if hashlib.blake2b(data, digest_size=32).hexdigest() != cid:
+        raise OSError(tr("Chunk {cid} is corrupt", cid=cid[:16]))
+    return data
+
+
+def _store_file(root: str, path: str) -> tuple[list[str], int]:
+    cids: list[str] = []
+    stored = 0
+    buf = bytearray()
+    eof = False
+    with open(path, "rb") as f:
+        while buf or not eof:
+            if not eof and len(buf) < _CDC_MAX:
+                block = f.read(_CDC_READ)
+                if block:
+                    buf += block
+                    continue
+                eof = True
+            cut = _cut_point(buf, len(buf)) if (eof or len(buf) >= _CDC_MAX) else len(buf)
+            if not cut:
+                break
+            cid, n = _put_chunk(root, bytes(buf[:cut]))
+            del buf[:cut]
+            cids.append(cid)
+            stored += n
+    return cids, stored
+
+
+def _slug(title: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", title or "entry").strip("_")[:48] or "entry"
+
+
+def _key_dir(root: str, title: str, path: str) -> str:
+    return os.path.join(root, _MANIFEST_DIR, f"{_slug(title)}-{hashlib.sha1(path.encode()).hexdigest()[:10]}")
+
+
+def _find_key(root: str, title: str, path: str) -> str:
+    exact = _key_dir(root, title, path)
+    if _versions(exact):
+        return exact
+    key_re = re.compile(re.escape(_slug(title)) + r"-[0-9a-f]{10}$")
+    try:
+        keys = [os.path.join(root, _MANIFEST_DIR, k) for k in os.listdir(os.path.join(root, _MANIFEST_DIR))
+                if key_re.match(k)]
+    except OSError:
+        return exact
+    keys = [k for k in keys if _versions(k)]
+    if len(keys) > 1:
+        name = os.path.basename(os.path.normpath(path))
+        keys = [k for k in keys if _source_name(_versions(k)[-1][1]) == name]
+    return keys[0] if len(keys) == 1 else exact
+
+
+def _source_name(manifest: str) -> str:
+    try:
+        return os.path.basename(os.path.normpath(_load_manifest(manifest).get("source", "")))
+    except (OSError, ValueError):
+        return ""
+
+
+def _versions(key_dir: str) -> list[tuple[int, str]]:
+    out = []
+    try:
+        names = os.listdir(key_dir)
+    except OSError:
+        return out
+    for name in names:
+        m = _VERSION_RE.match(name)
+        if m:
+            out.append((int(m.group(1)), os.path.join(key_dir, name)))
+    out.sort()
+    return out
+
+
+def _load_manifest(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        man = json.load(f)
+    if not isinstance(man, dict) or not isinstance(man.get("files"), list):
+        raise ValueError("not a manifest")
+    return man
+
+
+class DedupStore:
+    def __init__(self, root: str) -> None:
+        self.root = root
+        os.makedirs(os.path.join(root, _CHUNK_DIR), exist_ok=True)
+        os.makedirs(os.path.join(root, _MANIFEST_DIR), exist_ok=True)
+        marker = os.path.join(root, _STORE_MARKER)
+        if not os.path.isfile(marker):
+            with open(marker, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "chunker": "gear-window-sum", "hash": "blake2b-256",
+                           "min": _CDC_MIN, "avg": _CDC_AVG, "max": _CDC_MAX}, f)
+        self.pruned = False
+
+    def _walk(self, src: str, excl: frozenset, cancel: threading.Event):
+        stack = [src]
+        while stack and not cancel.is_set():
+            cur = stack.pop()
+            try:
+                for is_dir, path, _dst, st in _scan_dir_entries(cur, "", excl, cancel):
+                    if is_dir:
+                        stack.append(path)
+                    yield is_dir, path, st
+            except (PermissionError, FileNotFoundError):
+                continue
+            except OSError as exc:
+                logger.warning("dedup scan %s: %s", cur, exc)
+
+    def backup(self, src: str, title: str, excl: frozenset, max_versions: int,
+               cancel: threading.Event, emit, key_path: str = "") -> None:
+        key_dir = _key_dir(self.root, title, key_path or src)
+        versions = _versions(key_dir)
+        prev: dict[str, list] = {}
+        if versions:
+            try:
+                prev = {f[0]: f for f in _load_manifest(versions[-1][1])["files"]}
+            except (OSError, ValueError) as exc:
+                logger.warning("dedup [%s]: previous manifest unreadable (%s) — storing everything", title, exc)
+
+        files: list = []
+        links: list = []
+        dirs: list = []
+        todo: list = []
+        sk: list = []
+        for is_dir, path, st in self._walk(src, excl, cancel):
+            rel = os.path.relpath(path, src)
+            if is_dir:
+                try:
+                    dirs.append([rel, os.stat(path).st_mode & 0o7777])
+                except OSError:
+                    pass
+                continue
+            if st is True:
+                try:
+                    links.append([rel, os.readlink(path)])
+                except OSError as exc:
+                    emit([], [], [(path, str(exc), 0)])
+                continue
+            if st is None:
+                continue
+            old = prev.get(rel)
+            if old and old[3] == st.st_size and old[2] == st.st_mtime_ns:
+                files.append(old)
+                sk.append((path, tr("Up to date"), st.st_size))
+                if len(sk) >= _RESULT_BATCH:
+                    emit([], sk, [])
+                    sk = []
+            else:
+                todo.append((rel, path, st))
+        if sk:
+            emit([], sk, [])
+        if cancel.is_set():
+            return
+
+        new_bytes = self._store_all(todo, files, cancel, emit)
+        if cancel.is_set():
+            return
+
+        os.makedirs(key_dir, exist_ok=True)
+        num = versions[-1][0] + 1 if versions else 1
+        name = f"{num:03d} - {datetime.now().strftime('%Y-%m-%d %H-%M-%S')}.json"
+        manifest = {"version": 1, "title": title, "source": key_path or src, "created": datetime.now().isoformat(),
+                    "files": sorted(files), "links": sorted(links), "dirs": sorted(dirs)}
+        path = os.path.join(key_dir, name)
+        tmp = f"{path}.{_PID}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, separators=(",", ":"))
+        os.replace(tmp, path)
+        logger.info("dedup [%s]: version %s — %d file(s), %d changed, %d new byte(s) stored",
+                    title, name, len(files), len(todo), new_bytes)
+
+        if max_versions > 0:
+            for _num, old_path in _versions(key_dir)[:-max_versions]:
+                _silent_unlink(old_path)
+                self.pruned = True
+
+    def _store_all(self, todo: list, files: list, cancel: threading.Event, emit) -> int:
+        new_bytes = 0
+        ok: list = []
+        er: list = []
+
+        def _done(rel: str, path: str, st, fut) -> None:
+            nonlocal new_bytes, ok, er
+            try:
+                cids, stored = fut.result()
+            except OSError as exc:
+                logger.error("dedup %s: %s", path, exc)
+                er.append((path, str(exc), 0))
+            else:
+                files.append([rel, st.st_mode & 0o7777, st.st_mtime_ns, st.st_size, cids])
+                ok.append((path, path, st.st_size))
+                new_bytes += stored
+            if len(ok) + len(er) >= _RESULT_BATCH:
+                emit(ok, [], er)
+                ok, er = [], []
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=_WORKERS) as pool:
+            futs = {pool.submit(_store_file, self.root, path): (rel, path, st) for rel, path, st in todo}
+            for fut in concurrent.futures.as_completed(futs):
+                if cancel.is_set():
+                    for f in futs:
+                        f.cancel()
+                    break
+                _done(*futs[fut], fut)
+        if ok or er:
+            emit(ok, [], er)
+        return new_bytes
+
+    def collect_garbage(self) -> int:
+        live: set[str] = set()
+        for key in os.listdir(os.path.join(self.root, _MANIFEST_DIR)):
+            for _num, path in _versions(os.path.join(self.root, _MANIFEST_DIR, key)):
+                try:
+                    for f in _load_manifest(path)["files"]:
+                        live.update(f[4])
+                except (OSError, ValueError) as exc:
+                    logger.error("dedup gc: manifest %s unreadable (%s) — garbage collection skipped", path, exc)
+                    return 0
+        removed = 0
+        chunk_root = os.path.join(self.root, _CHUNK_DIR)
+        for sub in os.listdir(chunk_root):
+            sub_path = os.path.join(chunk_root, sub)
+            try:
+                names = os.listdir(sub_path)
+            except OSError:
+                continue
+            for name in names:
+                if name not in live:
+                    _silent_unlink(os.path.join(sub_path, name))
+                    removed += 1
+        logger.info("dedup gc %s: %d unreferenced chunk(s) removed, %d live", self.root, removed, len(live))
+        self.pruned = False
+        return removed
+
+    def _restore_file(self, meta: list, dst: str, cancel: threading.Event) -> tuple:
+        rel, mode, mtime_ns, size, cids = meta
+        try:
+            d = os.stat(dst, follow_symlinks=False)
+            if d.st_size == size and abs(d.st_mtime_ns - mtime_ns) <= 2_000_000_000:
+                return "skip", tr("Up to date"), size
+        except OSError:
+            pass
+        if not _ensure_dir(os.path.dirname(dst)):
+            return "error", tr("Directory could not be created"), 0
+        tmp = f"{dst}.{_PID}.{threading.get_ident()}.part"
+        try:
+            with open(tmp, "wb") as f:
+                for cid in cids:
+                    if cancel.is_set():
+                        raise InterruptedError
+                    f.write(_read_chunk(self.root, cid))
+            os.chmod(tmp, mode)
+            os.utime(tmp, ns=(mtime_ns, mtime_ns))
+            os.replace(tmp, dst)
+        except InterruptedError:
+            _silent_unlink(tmp)
+            return "skip", tr("Cancelled"), 0
+        except OSError as exc:
+            _silent_unlink(tmp)
+            logger.error("dedup restore %s: %s", dst, exc)
+            return "error", str(exc), 0
+        return "ok", dst, size
+
+    def restore(self, title: str, dst: str, cancel: threading.Event, emit) -> bool:
+        versions = _versions(_find_key(self.root, title, dst))
+        if not versions:
+            return False
+        try:
+            man = _load_manifest(versions[-1][1])
+        except (OSError, ValueError) as exc:
+            emit([], [], [(versions[-1][1], str(exc), 0)])
+            return True
+        for rel, mode in man.get("dirs", []):
+            try:
+                os.makedirs(os.path.join(dst, rel), mode=mode, exist_ok=True)
+            except OSError:
+                pass
+        ok: list = []
+        sk: list = []
+        er: list = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=_WORKERS) as pool:
+            futs = {pool.submit(self._restore_file, meta, os.path.join(dst, meta[0]), cancel): meta
+                    for meta in man["files"]}
+            for fut in concurrent.futures.as_completed(futs):
+                status, aux, size = fut.result()
+                path = os.path.join(dst, futs[fut][0])
+                if status == "ok":
+                    ok.append((path, path, size))
+                elif status == "skip":
+                    sk.append((path, aux, size))
+                else:
+                    er.append((path, aux, 0))
+                if len(ok) + len(sk) + len(er) >= _RESULT_BATCH:
+                    emit(ok, sk, er)
+                    ok, sk, er = [], [], []
+        for rel, target in man.get("links", []):
+            path = os.path.join(dst, rel)
+            try:
+                if os.path.islink(path) and os.readlink(path) == target:
+                    sk.append((path, tr("Up to date"), 0))
+                    continue
+                _silent_unlink(path)
+                os.symlink(target, path)
+                ok.append((path, path, 0))
+            except OSError as exc:
+                er.append((path, str(exc), 0))
+        emit(ok, sk, er)
+        return True
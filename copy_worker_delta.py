@@ -0,0 +1,201 @@
+import errno
+import fcntl
+import hashlib
+import os
+import struct
+import threading
+
+from state import _CONFIG_DIR, logger
+from translations import tr
+from copy_worker_core import _LARGE_FILE, _PID, _silent_unlink
+from copy_worker_profile import PROFILER
+
+_DELTA_MIN = _LARGE_FILE
+_BLOCK     = 1024 * 1024
+_DIGEST    = 16
+_MAP_DIR   = _CONFIG_DIR / "blockhashes"
+_MAP_HDR   = struct.Struct("<QqI")
+_FICLONE   = 0x40049409
+
+
+def _map_path(key: str) -> str:
+    return str(_MAP_DIR / f"{hashlib.sha1(key.encode()).hexdigest()}.bin")
+
+
+def load_map(key: str, size: int, mtime_ns: "int | None" = None,
+             ctime_ns: "int | None" = None) -> "bytes | None":
+    try:
+        with open(_map_path(key), "rb") as f:
+            raw = f.read()
+            written = os.fstat(f.fileno()).st_mtime_ns
+    except OSError:
+        return None
+    if len(raw) < _MAP_HDR.size:
+        return None
+    m_size, m_mtime, m_block = _MAP_HDR.unpack_from(raw)
+    digests = raw[_MAP_HDR.size:]
+    if (m_size != size or m_block != _BLOCK or len(digests) != -(-size // _BLOCK) * _DIGEST
+            or (mtime_ns is not None and abs(m_mtime - mtime_ns) > 2_000_000_000)):
+        return None
+    if ctime_ns is not None and (m_mtime != mtime_ns or written <= ctime_ns):
+        return None
+    return digests
+
+
+def save_map(key: str, size: int, mtime_ns: int, digests: bytes) -> None:
+    path = _map_path(key)
+    tmp = f"{path}.{_PID}.{threading.get_ident()}.tmp"
+    try:
+        _MAP_DIR.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(_MAP_HDR.pack(size, mtime_ns, _BLOCK))
+            f.write(digests)
+        os.replace(tmp, path)
+    except OSError as exc:
+        _silent_unlink(tmp)
+        logger.debug("block map %s not saved: %s", key, exc)
+
+
+def drop_map(key: str) -> None: _silent_unlink(_map_path(key))
+
+
+def _digest(buf) -> bytes:
+    return hashlib.blake2b(buf, digest_size=_DIGEST).digest()
+
+
+def hash_blocks(fd: int, size: int, cancel: threading.Event) -> bytes:
+    out = bytearray()
+    off = 0
+    while off < size:
+        if cancel.is_set():
+            raise InterruptedError
+        buf = os.pread(fd, min(_BLOCK, size - off), off)
+        if not buf:
+            raise OSError(tr("File shrank while reading"))
+        out += _digest(buf)
+        off += len(buf)
+    return bytes(out)
+
+
+def _open_target(tmp: str, dfd: int) -> "tuple[int, bool]":
+    tfd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        fcntl.ioctl(tfd, _FICLONE, dfd)
+        return tfd, True
+    except OSError as exc:
+        if exc.errno not in (errno.EOPNOTSUPP, errno.ENOTSUP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.EBADF):
+            os.close(tfd)
+            raise
+    return tfd, False
+
+
+def _copy_range(dfd: int, wfd: int, off: int, n: int) -> None:
+    end = off + n
+    while off < end:
+        try:
+            done = os.copy_file_range(dfd, wfd, end - off, off, off)
+        except OSError as exc:
+            if exc.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                raise
+            done = 0
+        if not done:
+            buf = os.pread(dfd, min(_BLOCK, end - off), off)
+            if not buf:
+                raise OSError(tr("File shrank while reading"))
+            done = os.pwrite(wfd, buf, off)
+        off += done
+
+
+def delta_copy(src: str, dst: str, st: "os.stat_result", cancel: threading.Event) -> "tuple | None":
+    try:
+        d = os.stat(dst, follow_symlinks=False)
+    except OSError:
+        return None
+    if not os.path.isfile(dst) or d.st_size == 0 or d.st_nlink > 1:
+        return None
+    t0 = PROFILER.clock()
+    tmp = f"{dst}.{_PID}.{threading.get_ident()}.part"
+    rfd = dfd = wfd = None
+    cloned = False
+    changed = 0
+    try:
+        rfd = os.open(src, os.O_RDONLY)
+        dfd = os.open(dst, os.O_RDONLY)
+        old = load_map(dst, d.st_size, d.st_mtime_ns)
+        if old is None:
+            old = hash_blocks(dfd, d.st_size, cancel)
+        wfd, cloned = _open_target(tmp, dfd)
+        os.posix_fadvise(rfd, 0, st.st_size, os.POSIX_FADV_SEQUENTIAL)
+        new = bytearray()
+        off = 0
+        while off < st.st_size:
+            if cancel.is_set():
+                raise InterruptedError
+            buf = os.pread(rfd, min(_BLOCK, st.st_size - off), off)
+            if not buf:
+                raise OSError(f"Incomplete copy: {off}/{st.st_size} bytes read")
+            digest = _digest(buf)
+            i = len(new)
+            if old[i:i + _DIGEST] != digest:
+                view = memoryview(buf)
+                pos = 0
+                while pos < len(buf):
+                    pos += os.pwrite(wfd, view[pos:], off + pos)
+                changed += len(buf)
+            elif not cloned:
+                _copy_range(dfd, wfd, off, len(buf))
+            new += digest
+            off += len(buf)
+        os.ftruncate(wfd, st.st_size)
+        os.fchmod(wfd, st.st_mode & 0o777)
+        os.close(wfd)
+        wfd = None
+        os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp, dst)
+        d = os.stat(dst)
+        save_map(dst, d.st_size, d.st_mtime_ns, bytes(new))
+    except InterruptedError:
+        _silent_unlink(tmp)
+        return "skip", tr("Cancelled"), 0
+    except OSError as exc:
+        _silent_unlink(tmp)
+        logger.debug("delta %s → %s: %s — copying in full", src, dst, exc)
+        return None
+    finally:
+        for fd in (rfd, dfd, wfd):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        PROFILER.record("delta_copy", t0)
+    logger.debug("delta %s → %s: %d of %d byte(s) rewritten%s", src, dst, changed, st.st_size,
+                 " (reflinked)" if cloned else "")
+    return "ok", dst, st.st_size
+
+
+def resumable(src: str, key: str, remote_size: int, local_size: int,
+              cancel: threading.Event) -> "tuple[bool, bytes | None]":
+    try:
+        fd = os.open(src, os.O_RDONLY)
+    except OSError:
+        return False, None
+    try:
+        new = hash_blocks(fd, local_size, cancel)
+        if not 0 < remote_size < local_size:
+            return False, new
+        old = load_map(key, remote_size)
+        if old is None:
+            return False, new
+        full = remote_size // _BLOCK
+        if old[:full * _DIGEST] != new[:full * _DIGEST]:
+            return False, new
+        tail = remote_size - full * _BLOCK
+        if tail and old[full * _DIGEST:] != _digest(os.pread(fd, tail, full * _BLOCK)):
+            return False, new
+        return True, new
+    except (OSError, InterruptedError) as exc:
+        logger.debug("delta check %s: %s", src, exc)
+        return False, None
+    finally:
+        os.close(fd)
@@ -701,7 +701,7 @@ class _LogWidget(QWidget):
 class CopyDialog(_StandardKeysMixin, QDialog):
 
     def __init__(self, parent, tasks, operation: str, *,
-                pre_deleted: "list | None" = None, pre_errors: "list | None" = None) -> None:
+                pre_deleted: "list | None" = None, pre_errors: "list | None" = None, journal: bool = False) -> None:
         super().__init__(parent)
         self.setWindowTitle(operation)
 
@@ -730,7 +730,7 @@ class CopyDialog(_StandardKeysMixin, QDialog):
         size_to_screen(self, 1900, 925, fraction=0.9)
 
         self._operation = operation
-        self.worker     = CopyWorker(tasks)
+        self.worker     = CopyWorker(tasks, journal=journal)
         self.copied = self.skipped = self.errors = self.deleted = 0
         self._done  = self._total = 0
         self._final_elapsed: int | None = None
@@ -740,6 +740,7 @@ class CopyDialog(_StandardKeysMixin, QDialog):
         self._pending_er = deque()
         self._size_copied = self._size_skipped = self._size_deleted = 0
         self._not_found_paths: list[tuple[str, str]] = []
+        self._run_metrics: dict = {}
 
         self._preseed_deleted = 0
         self._preseed_deleted_size = 0
@@ -807,6 +808,7 @@ class CopyDialog(_StandardKeysMixin, QDialog):
         self.worker.finished_work.connect(self._on_done)
         self.worker.scan_progress.connect(self._on_scan_progress)
         self.worker.entry_status.connect(self._summary.on_entry_status)
+        self.worker.run_metrics.connect(self._on_run_metrics)
 
         if self._preseed_deleted or self._preseed_errors:
             self._update_tab_labels()
@@ -947,6 +949,8 @@ class CopyDialog(_StandardKeysMixin, QDialog):
         if total > 0:
             self._summary.update_progress_bar(done, total)
 
+    def _on_run_metrics(self, metrics: dict) -> None: self._run_metrics = metrics
+
     def _on_done(self, c, s, e, d, cancelled) -> None:
         self._tick.stop()
         elapsed = self._final_elapsed = self.timer.elapsed() // 1000
@@ -958,7 +962,8 @@ class CopyDialog(_StandardKeysMixin, QDialog):
         try:
             from history import append_history
             append_history(operation=self._operation, copied=c, skipped=s, errors=self._display_errors,
-                           deleted=self._display_deleted, duration_s=elapsed, cancelled=cancelled)
+                           deleted=self._display_deleted, duration_s=elapsed, cancelled=cancelled,
+                           metrics=self._run_metrics)
         except Exception as exc:
             logger.debug("append_history failed: %s", exc)
 
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import secrets
+import shutil
+import subprocess
+import tarfile
+import threading
+from datetime import datetime
+
+from state import _CONFIG_DIR, logger
+from translations import tr
+from copy_worker_core import _scan_dir_entries, _silent_unlink
+
+_PACK_DIRNAME   = ".backup-helper-packs"
+_PACK_INDEX     = "index.json"
+_PACK_MAX_FILE  = 64 * 1024
+_BUNDLE_TARGET  = 64 * 1024 * 1024
+_PACK_CACHE_DIR = _CONFIG_DIR / "packs"
+_ZSTD: str | None = shutil.which("zstd")
+
+
+def pack_staging_dir(src: str, dst: str) -> str:
+    key = hashlib.sha1(f"{src}\0{dst}".encode()).hexdigest()[:16]
+    return str(_PACK_CACHE_DIR / key)
+
+
+def _load_index(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            idx = json.load(f)
+        if isinstance(idx, dict) and isinstance(idx.get("files"), dict):
+            idx.setdefault("bundles", {})
+            return idx
+    except (OSError, ValueError) as exc:
+        if not isinstance(exc, FileNotFoundError):
+            logger.warning("pack index %s unreadable: %s", path, exc)
+    return {"version": 1, "files": {}, "bundles": {}}
+
+
+def _write_index(path: str, idx: dict) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(idx, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+class _BundleWriter:
+    def __init__(self, out_dir: str) -> None:
+        self._out_dir = out_dir
+        self._stamp   = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+        self._seq     = 0
+        self._tar: "tarfile.TarFile | None" = None
+        self._proc: "subprocess.Popen | None" = None
+        self._bytes   = 0
+        self.name     = ""
+        self.written: dict[str, dict] = {}
+
+    def _roll(self) -> None:
+        self._close_current()
+        ext = "tar.zst" if _ZSTD else "tar.gz"
+        self.name = f"bundle-{self._stamp}-{self._seq:03d}.{ext}"
+        self._seq += 1
+        path = os.path.join(self._out_dir, self.name)
+        if _ZSTD:
+            self._proc = subprocess.Popen([_ZSTD, "-q", "-f", "-T0", "-3", "-o", path], stdin=subprocess.PIPE)
+            self._tar = tarfile.open(fileobj=self._proc.stdin, mode="w|")
+        else:
+            self._tar = tarfile.open(path, "w:gz", compresslevel=6)
+        self._bytes = 0
+        self.written[self.name] = {"files": 0, "bytes": 0}
+
+    def add(self, path: str, rel: str, size: int) -> str:
+        if self._tar is None or self._bytes >= _BUNDLE_TARGET:
+            self._roll()
+        assert self._tar is not None
+        self._tar.add(path, arcname=rel, recursive=False)
+        self._bytes += size
+        info = self.written[self.name]
+        info["files"] += 1
+        info["bytes"] += size
+        return self.name
+
+    def _close_current(self) -> None:
+        if self._tar is None:
+            return
+        self._tar.close()
+        self._tar = None
+        if self._proc is not None:
+            assert self._proc.stdin is not None
+            self._proc.stdin.close()
+            rc = self._proc.wait()
+            self._proc = None
+            if rc != 0:
+                raise OSError(f"zstd exited with code {rc}")
+
+    def close(self) -> None: self._close_current()
+
+
+def _walk_small(src: str, excl: frozenset, cancel: threading.Event):
+    stack = [src]
+    while stack and not cancel.is_set():
+        cur = stack.pop()
+        try:
+            for is_dir, path, _dst, st in _scan_dir_entries(cur, "", excl, cancel, True):
+                if is_dir:
+                    if os.path.basename(path) != _PACK_DIRNAME:
+                        stack.append(path)
+                elif st is not None and st is not True and st.st_size <= _PACK_MAX_FILE:
+                    yield path, st
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            continue
+        except OSError as exc:
+            logger.warning("pack scan %s: %s", cur, exc)
+
+
+def prepare_packed_task(src: str, dst: str, excl: frozenset, cancel: threading.Event,
+                        key_path: str | None = None) -> tuple[frozenset, str, int, bool]:
+    staging = pack_staging_dir(key_path or src, dst)
+    os.makedirs(staging, exist_ok=True)
+    index_path = os.path.join(staging, _PACK_INDEX)
+    idx = _load_index(index_path)
+    old_files: dict = idx["files"]
+    new_files: dict = {}
+    packed: set[str] = set()
+    loose = False
+    writer = _BundleWriter(staging)
+    n_new = 0
+    try:
+        for path, st in _walk_small(src, excl, cancel):
+            rel = os.path.relpath(path, src)
+            prev = old_files.get(rel)
+            if prev and prev[0] == st.st_size and prev[1] == st.st_mtime_ns and prev[3] in idx["bundles"]:
+                new_files[rel] = prev
+            else:
+                try:
+                    bundle = writer.add(path, rel, st.st_size)
+                except OSError as exc:
+                    logger.warning("pack %s: %s — copying unpacked", path, exc)
+                    loose = True
+                    continue
+                new_files[rel] = [st.st_size, st.st_mtime_ns, st.st_mode & 0o7777, bundle]
+                n_new += 1
+            packed.add(path)
+    finally:
+        writer.close()
+    if cancel.is_set():
+        for name in writer.written:
+            _silent_unlink(os.path.join(staging, name))
+        return excl, staging, 0, True
+    bundles = {name: info for name, info in idx["bundles"].items()
+               if any(f[3] == name for f in new_files.values())}
+    bundles.update(writer.written)
+    _write_index(index_path, {"version": 1, "files": new_files, "bundles": bundles})
+    logger.info("pack %s: %d small file(s) indexed, %d packed into %d new bundle(s)",
+                src, len(new_files), n_new, len(writer.written))
+    return excl | packed | {os.path.join(src, _PACK_DIRNAME)}, staging, n_new, loose
+
+
+def prune_uploaded(staging: str) -> None:
+    try:
+        names = os.listdir(staging)
+    except OSError:
+        return
+    for name in names:
+        if name.startswith("bundle-"):
+            _silent_unlink(os.path.join(staging, name))
+
+
+def _open_bundle(path: str) -> "tuple[tarfile.TarFile, subprocess.Popen | None]":
+    if path.endswith(".tar.zst"):
+        if not _ZSTD:
+            raise OSError(tr("zstd is required to unpack {name}", name=os.path.basename(path)))
+        proc = subprocess.Popen([_ZSTD, "-q", "-d", "-c", path], stdout=subprocess.PIPE)
+        return tarfile.open(fileobj=proc.stdout, mode="r|"), proc
+    return tarfile.open(path, "r:gz"), None
+
+
+def _extract_member(tar: tarfile.TarFile, member: tarfile.TarInfo, dst: str, meta: list) -> None:
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    fobj = tar.extractfile(member)
+    if fobj is None:
+        raise OSError(tr("Bundle member unreadable"))
+    tmp = f"{dst}.{os.getpid()}.unpack"
+    try:
+        with open(tmp, "wb") as out:
+            shutil.copyfileobj(fobj, out)
+        os.chmod(tmp, meta[2])
+        os.utime(tmp, ns=(meta[1], meta[1]))
+        os.replace(tmp, dst)
+    except OSError:
+        _silent_unlink(tmp)
+        raise
+
+
+def unpack_bundles(dst_dir: str, cancel: threading.Event) -> tuple[list, list, list]:
+    pack_dir = os.path.join(dst_dir, _PACK_DIRNAME)
+    idx = _load_index(os.path.join(pack_dir, _PACK_INDEX))
+    ok: list = []
+    sk: list = []
+    er: list = []
+    by_bundle: dict[str, dict[str, list]] = {}
+    for rel, meta in idx["files"].items():
+        if os.path.isabs(rel) or rel.split(os.sep)[0] == os.pardir or os.pardir + os.sep in rel:
+            er.append((os.path.join(pack_dir, rel), tr("Unsafe path in pack index"), 0))
+            continue
+        by_bundle.setdefault(meta[3], {})[rel] = meta
+    for bundle, wanted in by_bundle.items():
+        if cancel.is_set():
+            break
+        todo: dict[str, list] = {}
+        for rel, meta in wanted.items():
+            dst = os.path.join(dst_dir, rel)
+            try:
+                d = os.stat(dst, follow_symlinks=False)
+                if d.st_size == meta[0] and abs(d.st_mtime_ns - meta[1]) <= 2_000_000_000:
+                    sk.append((dst, tr("Up to date"), meta[0]))
+                    continue
+            except OSError:
+                pass
+            todo[rel] = meta
+        if not todo:
+            continue
+        bundle_path = os.path.join(pack_dir, bundle)
+        proc = None
+        try:
+            tar, proc = _open_bundle(bundle_path)
+            with tar:
+                for member in tar:
+                    meta = todo.pop(member.name, None)
+                    if meta is None or not member.isfile():
+                        continue
+                    dst = os.path.join(dst_dir, member.name)
+                    try:
+                        _extract_member(tar, member, dst, meta)
+                        ok.append((dst, dst, meta[0]))
+                    except OSError as exc:
+                        er.append((dst, str(exc), 0))
+                    if not todo or cancel.is_set():
+                        break
+        except (OSError, tarfile.TarError) as exc:
+            logger.error("unpack %s: %s", bundle_path, exc)
+            er.extend((os.path.join(dst_dir, rel), str(exc), 0) for rel in todo)
+            todo = {}
+        finally:
+            if proc is not None:
+                proc.kill()
+                proc.wait()
+        er.extend((os.path.join(dst_dir, rel), tr("Missing from bundle {name}", name=bundle), 0) for rel in todo)
+    if not er and not cancel.is_set():
+        shutil.rmtree(pack_dir, ignore_errors=True)
+    return ok, sk, er
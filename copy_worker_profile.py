@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from state import S, _LOG_HIST_DIR, logger
+
+_ENV_VAR     = "BACKUP_HELPER_PROFILE"
+_TRACE_DIR   = _LOG_HIST_DIR / "traces"
+_TRACE_KEEP  = 20
+_MAX_EVENTS  = 250_000
+_HIST_BUCKETS = 32
+
+
+def _env_mode() -> str:
+    raw = os.environ.get(_ENV_VAR, "").strip().lower()
+    if raw in ("trace", "2"):
+        return "trace"
+    if raw in ("1", "on", "yes", "true", "counters"):
+        return "counters"
+    return ""
+
+
+def profiling_mode() -> str:
+    env = _env_mode()
+    if env:
+        return env
+    return "trace" if S.ui.get("profile_backups", False) else ""
+
+
+class _StageStats:
+    __slots__ = ("buckets", "count", "max_ns", "total_ns")
+
+    def __init__(self) -> None:
+        self.count    = 0
+        self.total_ns = 0
+        self.max_ns   = 0
+        self.buckets  = [0] * _HIST_BUCKETS
+
+    def add(self, dur_ns: int) -> None:
+        self.count    += 1
+        self.total_ns += dur_ns
+        if dur_ns > self.max_ns:
+            self.max_ns = dur_ns
+        self.buckets[min(_HIST_BUCKETS - 1, (dur_ns // 1000).bit_length())] += 1
+
+    def merge(self, other: "_StageStats") -> None:
+        self.count    += other.count
+        self.total_ns += other.total_ns
+        self.max_ns    = max(self.max_ns, other.max_ns)
+        for i, n in enumerate(other.buckets):
+            self.buckets[i] += n
+
+    def percentile_us(self, pct: float) -> int:
+        target = self.count * pct
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return 1 << i if i else 0
+        return 0
+
+
+class _ThreadLog:
+    __slots__ = ("events", "stages", "tid")
+
+    def __init__(self, tid: int) -> None:
+        self.tid = tid
+        self.stages: dict[str, _StageStats] = {}
+        self.events: list[tuple[str, int, int]] = []
+
+
+class _Profiler:
+    def __init__(self) -> None:
+        self.enabled  = False
+        self._trace   = False
+        self._label   = ""
+        self._t0      = 0
+        self._tls     = threading.local()
+        self._logs: list[_ThreadLog] = []
+        self._lock    = threading.Lock()
+        self._n_events = 0
+
+    def start(self, label: str, mode: str) -> None:
+        with self._lock:
+            self._logs     = []
+            self._n_events = 0
+        self._tls     = threading.local()
+        self._label   = label
+        self._trace   = mode == "trace"
+        self._t0      = time.perf_counter_ns()
+        self.enabled  = bool(mode)
+
+    def clock(self) -> int:
+        return time.perf_counter_ns() if self.enabled else 0
+
+    def _log(self) -> _ThreadLog:
+        log = getattr(self._tls, "log", None)
+        if log is None:
+            log = self._tls.log = _ThreadLog(threading.get_ident())
+            with self._lock:
+                self._logs.append(log)
+        return log
+
+    def record(self, stage: str, t0: int) -> None:
+        if not self.enabled or not t0:
+            return
+        now = time.perf_counter_ns()
+        log = self._log()
+        st = log.stages.get(stage)
+        if st is None:
+            st = log.stages[stage] = _StageStats()
+        st.add(now - t0)
+        if self._trace and self._n_events < _MAX_EVENTS:
+            self._n_events += 1
+            log.events.append((stage, t0, now - t0))
+
+    def summary(self) -> dict[str, dict]:
+        merged: dict[str, _StageStats] = {}
+        with self._lock:
+            logs = list(self._logs)
+        for log in logs:
+            for stage, st in log.stages.items():
+                merged.setdefault(stage, _StageStats()).merge(st)
+        return {
+            stage: {"count":    st.count,
+                    "total_ms": round(st.total_ns / 1e6, 3),
+                    "mean_us":  round(st.total_ns / st.count / 1e3, 1) if st.count else 0.0,
+                    "p50_us":   st.percentile_us(0.50),
+                    "p95_us":   st.percentile_us(0.95),
+                    "max_us":   st.max_ns // 1000}
+            for stage, st in sorted(merged.items(), key=lambda kv: -kv[1].total_ns)
+        }
+
+    def _write_trace(self, summary: dict) -> str:
+        with self._lock:
+            logs = list(self._logs)
+        events: list[dict] = [{"name": "process_name", "ph": "M", "pid": os.getpid(), "tid": 0,
+                               "args": {"name": f"Backup Helper — {self._label}"}}]
+        for log in logs:
+            for stage, t0, dur in log.events:
+                events.append({"name": stage, "cat": "copy", "ph": "X", "pid": os.getpid(), "tid": log.tid,
+                               "ts": (t0 - self._t0) / 1000, "dur": dur / 1000})
+        path = _TRACE_DIR / f"copy-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        _TRACE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                       "otherData": {"label": self._label, "stages": summary,
+                                     "truncated": self._n_events >= _MAX_EVENTS}}, f)
+        for old in sorted(_TRACE_DIR.glob("copy-*.json"))[:-_TRACE_KEEP]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+        return str(path)
+
+    def finish(self) -> dict:
+        if not self.enabled:
+            return {}
+        self.enabled = False
+        summary = self.summary()
+        for stage, st in summary.items():
+            logger.info("profile %-12s n=%-8d total=%10.1f ms  mean=%8.1f µs  p50≤%d µs  p95≤%d µs  max=%d µs",
+                        stage, st["count"], st["total_ms"], st["mean_us"], st["p50_us"], st["p95_us"],
+                        st["max_us"])
+        result: dict = {"stages": summary}
+        if self._trace:
+            try:
+                result["trace"] = self._write_trace(summary)
+                logger.info("profile: trace written to %s", result["trace"])
+            except OSError as exc:
+                logger.warning("profile: could not write trace: %s", exc)
+        return result
+
+
+PROFILER = _Profiler()
@@ -19,10 +19,12 @@ if TYPE_CHECKING:
 
 from copy_worker_core import (
     _SMB_WORKERS, _SMB_TIMEOUT, _SMB_FILE_SECS, _SMB_CHUNK, _SMB_MIN_BYTES_PER_SEC,
-    _SHM_DIR, _smb_procs, _smb_procs_lock, _SMB_LINE_RE, _SKIP_RE, _CACHE_MISS,
+    _SHM_DIR, _smb_procs, _smb_procs_lock, _SMB_LINE_RE, _CACHE_MISS, _skip_re_for,
     _is_unreachable, _parse_smb, _q, _run_futures, _ensure_dir, _silent_unlink,
     _parse_smb_mtime, _SMB_MTIME_TOLERANCE
 )
+from copy_worker_profile import PROFILER
+from copy_worker_delta import _DELTA_MIN, drop_map, resumable, save_map
 
 
 class _SecurePw(Protocol):
@@ -127,6 +129,7 @@ class _SmbJob:
     local_size:   int = -1
     remote_mtime: int = -1
     local_mtime:  int = -1
+    resume:       bool = False
 
     def size_matches_local(self) -> bool:
         if self.kind != "smb_get" or self.remote_size < 0:
@@ -176,7 +179,8 @@ def _build_smb_put_cmds(jobs: list[_SmbJob]) -> str:
         if r_dir != curr_r:
             cmds.append(f'cd "/{_q(r_dir)}"' if r_dir else 'cd "/"')
             curr_r = r_dir
-        cmds.append(f'put "{_q(os.path.basename(j.src_url))}" "{_q(os.path.basename(j.remote_path))}"')
+        verb = "reput" if j.resume else "put"
+        cmds.append(f'{verb} "{_q(os.path.basename(j.src_url))}" "{_q(os.path.basename(j.remote_path))}"')
     cmds.append("exit\n")
     return "\n".join(cmds)
 
@@ -197,6 +201,7 @@ class _SmbClient:
                cancel: "threading.Event | None" = None) -> "tuple[subprocess.Popen | None, str, str]":
         tid = threading.get_ident()
         env = dict(os.environ, LC_ALL="C", LANG="C")
+        t0 = PROFILER.clock()
         try:
             proc = subprocess.Popen(argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
                                     text=True, encoding="utf-8", env=env)
@@ -219,6 +224,7 @@ class _SmbClient:
             logger.error("SMB run error: %s", exc)
             return None, "", str(exc)
         finally:
+            PROFILER.record("smb_cmd", t0)
             with _smb_procs_lock:
                 _smb_procs.pop(tid, None)
             if wipe_fn is not None:
@@ -457,7 +463,7 @@ class _SmbScanner:
         elif kind == "missing":
             lerr.append((src_url, "Path does not exist — skipping", title))
         elif kind == "file":
-            if not _SKIP_RE.search(os.path.basename(rpath)) and not _smb_path_excluded(src_url, excludes):
+            if not _skip_re_for(src_url).search(os.path.basename(rpath)) and not _smb_path_excluded(src_url, excludes):
                 lexp.append(_SmbJob(src_url=src_url, dst_path=dst, kind="smb_get", host=host, share=share,
                                     remote_path=rpath, remote_size=size, remote_mtime=mtime, title=title))
         else:
@@ -466,10 +472,11 @@ class _SmbScanner:
                 lerr.append((src_url, "NT_STATUS_HOST_UNREACHABLE", title))
             elif idx:
                 prefix = rpath.rstrip("/") + "/" if rpath else None
+                skip_re = _skip_re_for(src_url)
                 for path, (sz, mt) in idx.items():
                     if self._cancel.is_set():
                         break
-                    if _SKIP_RE.search(os.path.basename(path)):
+                    if skip_re.search(os.path.basename(path)):
                         continue
                     full_url = f"smb://{host}/{share}/{path}"
                     if _smb_path_excluded(full_url, excludes):
@@ -490,7 +497,7 @@ class _SmbScanner:
 
     def _do_put_file(self, src: str, host: str, share: str, rpath: str, title: str, expanded: list,
                       excludes: frozenset = frozenset()) -> None:
-        if _SKIP_RE.search(os.path.basename(src)) or src in excludes:
+        if _skip_re_for(src).search(os.path.basename(src)) or src in excludes:
             return
         rp = f"{rpath}/{os.path.basename(src)}".lstrip("/")
         try:
@@ -508,6 +515,7 @@ class _SmbScanner:
     def _do_put_dir(self, src, host, share, rpath, title, expanded, excludes: frozenset = frozenset()) -> None:
         lexp: list = []
         stack: list = [src]
+        skip_re = _skip_re_for(src)
 
         try:
             st = os.stat(src)
@@ -522,7 +530,7 @@ class _SmbScanner:
                 current_dir = stack.pop()
                 with os.scandir(current_dir) as it:
                     for e in it:
-                        if _SKIP_RE.search(e.name) or e.path in excludes:
+                        if skip_re.search(e.name) or e.path in excludes:
                             continue
                         try:
                             e_st = e.stat(follow_symlinks=True)
@@ -558,6 +566,7 @@ class _ShareProcessor:
         self._ri_lock     = ri_lock
         self._unreachable = threading.Event()
         self._url_title:  dict[str, tuple[str, int]] = {}
+        self._put_maps:   dict[str, tuple[str, int, bytes]] = {}
 
     @property
     def host(self) -> str:  return self._client.host
@@ -620,6 +629,8 @@ class _ShareProcessor:
                 if same_size and (mtime_known_and_matches or mtime_unknown):
                     sk_immediate.append((j.src_url, tr("Up to date")))
                 else:
+                    if local_sz >= _DELTA_MIN and not self._cancel.is_set():
+                        self._plan_delta(j, meta[0] if meta else -1, local_sz)
                     put_transfer.append(j)
             if ri is None:
                 self._unreachable.set()
@@ -660,12 +671,31 @@ class _ShareProcessor:
                     return
                 ok_c, er_c = self._transfer(batch, _build_smb_put_cmds)
                 self._record(ok_c, [], er_c)
+                self._store_maps(ok_c, er_c)
 
             with concurrent.futures.ThreadPoolExecutor(
                     max_workers=min(4, len(put_batches) or 1)) as _ppool:
                 pfuts = [_ppool.submit(_run_put_batch, b) for b in put_batches if not self._cancel.is_set()]
                 _run_futures(pfuts, self._cancel, "smb put batch")
 
+    def _plan_delta(self, job: "_SmbJob", remote_size: int, local_size: int) -> None:
+        key = self._remote_url(job.remote_path)
+        job.resume, digests = resumable(job.src_url, key, remote_size, local_size, self._cancel)
+        if digests is not None:
+            self._put_maps[job.src_url] = (key, local_size, digests)
+        if job.resume:
+            logger.debug("smb delta %s: %d byte(s) already on the share — resuming", key, remote_size)
+
+    def _store_maps(self, ok_c: list, er_c: list) -> None:
+        for s, _d in ok_c:
+            hit = self._put_maps.pop(s, None)
+            if hit is not None:
+                save_map(hit[0], hit[1], 0, hit[2])
+        for s, _e in er_c:
+            hit = self._put_maps.pop(s, None)
+            if hit is not None:
+                drop_map(hit[0])
+
     def _split_unsafe(self, jobs: list, *, is_get: bool) -> "tuple[list, list]":
         safe: list = []
         errors: list = []
@@ -777,7 +807,7 @@ class _ShareProcessor:
         for s, _e, _ in er_w:
             _count(_meta(s)[0], 2)
 
-        self._flusher.push(ok=ok_w, sk=sk_w, er=er_w)
+        self._flusher.push(ok=ok_w, sk=sk_w, er=er_w, backend="smb")
         self._tracker.batch_update(batch_counts)
 
     def _fail_batch(self, remaining: list, *, is_get: bool) -> None:
@@ -0,0 +1,249 @@
+import os
+import secrets
+import shutil
+import subprocess
+import tempfile
+import threading
+
+from drive_utils import mount_of
+from state import logger
+from copy_worker_core import _SNAP_MARK
+
+_SNAP_TIMEOUT  = 120
+_BTRFS_ROOT_INO = 256
+_LVM_EXTENTS   = "20%ORIGIN"
+
+
+def _run(args: list[str]) -> tuple[bool, str]:
+    attempts = [args] if os.geteuid() == 0 or not shutil.which("sudo") else [args, ["sudo", "-n", *args]]
+    err = ""
+    for argv in attempts:
+        try:
+            r = subprocess.run(argv, capture_output=True, text=True, timeout=_SNAP_TIMEOUT)
+        except (OSError, subprocess.SubprocessError) as exc:
+            err = str(exc)
+            continue
+        if r.returncode == 0:
+            return True, r.stdout
+        err = (r.stderr or r.stdout).strip()
+    return False, err
+
+
+def _snap_name() -> str:
+    return f"{_SNAP_MARK}{os.getpid()}-{secrets.token_hex(4)}"
+
+
+def _is_stale(name: str) -> bool:
+    pid = name.rpartition(_SNAP_MARK)[2].split("-")[0]
+    if not pid.isdigit():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        pass
+    return False
+
+
+def _btrfs_nested(root: str) -> list[str]:
+    try:
+        dev = os.stat(root).st_dev
+    except OSError:
+        return []
+    found: list[str] = []
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for e in it:
+                    if e.name.startswith(f".{_SNAP_MARK}") or not e.is_dir(follow_symlinks=False):
+                        continue
+                    st = e.stat(follow_symlinks=False)
+                    if st.st_dev == dev:
+                        stack.append(e.path)
+                    elif st.st_ino == _BTRFS_ROOT_INO:
+                        found.append(e.path)
+        except OSError:
+            continue
+    return found
+
+
+def _btrfs_subvolume(path: str) -> "str | None":
+    cur = path
+    try:
+        dev = os.stat(cur).st_dev
+        while cur != "/":
+            parent = os.path.dirname(cur)
+            if os.stat(parent).st_dev != dev:
+                break
+            cur = parent
+        return cur if os.stat(cur).st_ino == _BTRFS_ROOT_INO else None
+    except OSError:
+        return None
+
+
+class _Snapshot:
+    __slots__ = ("base", "kind", "origin", "path", "release_cmds", "tmp_dir")
+
+    def __init__(self, kind: str, origin: str, base: str, path: str, release_cmds: list[list[str]],
+                 tmp_dir: str = "") -> None:
+        self.kind         = kind
+        self.origin       = origin
+        self.base         = base
+        self.path         = path
+        self.release_cmds = release_cmds
+        self.tmp_dir      = tmp_dir
+
+    def map(self, real: str) -> str:
+        rel = os.path.relpath(real, self.base)
+        return self.path if rel == "." else os.path.join(self.path, rel)
+
+    def release(self) -> None:
+        for cmd in self.release_cmds:
+            ok, err = _run(cmd)
+            if not ok:
+                logger.error("snapshot %s: '%s' failed: %s — remove it manually", self.path, " ".join(cmd), err)
+                break
+        if self.tmp_dir:
+            try:
+                os.rmdir(self.tmp_dir)
+            except OSError:
+                pass
+        logger.info("snapshot released: %s", self.path)
+
+
+def _take_btrfs(real: str) -> "_Snapshot | None":
+    subvol = _btrfs_subvolume(real)
+    if subvol is None or not shutil.which("btrfs"):
+        return None
+    try:
+        with os.scandir(subvol) as it:
+            stale = [e.path for e in it if e.name.startswith(f".{_SNAP_MARK}") and _is_stale(e.name)]
+    except OSError:
+        stale = []
+    for old in stale:
+        ok, err = _run(["btrfs", "subvolume", "delete", old])
+        if ok:
+            logger.info("snapshot: leftover %s removed", old)
+        else:
+            logger.warning("snapshot: leftover %s could not be removed: %s", old, err)
+    path = os.path.join(subvol, f".{_snap_name()}")
+    ok, err = _run(["btrfs", "subvolume", "snapshot", "-r", subvol, path])
+    if not ok:
+        logger.warning("btrfs snapshot of %s failed: %s", subvol, err)
+        return None
+    return _Snapshot("btrfs", subvol, subvol, path, [["btrfs", "subvolume", "delete", path]])
+
+
+def _take_zfs(dataset: str, mountpoint: str) -> "_Snapshot | None":
+    if not shutil.which("zfs"):
+        return None
+    ok, out = _run(["zfs", "list", "-H", "-t", "snapshot", "-o", "name", "-d", "1", dataset])
+    for old in out.split() if ok else []:
+        if old.partition("@")[2].startswith(_SNAP_MARK) and _is_stale(old):
+            if _run(["zfs", "destroy", old])[0]:
+                logger.info("snapshot: leftover %s removed", old)
+    name = _snap_name()
+    ok, err = _run(["zfs", "snapshot", f"{dataset}@{name}"])
+    if not ok:
+        logger.warning("zfs snapshot of %s failed: %s", dataset, err)
+        return None
+    path = os.path.join(mountpoint, ".zfs", "snapshot", name)
+    return _Snapshot("zfs", dataset, mountpoint, path, [["zfs", "destroy", f"{dataset}@{name}"]])
+
+
+def _take_lvm(device: str, mountpoint: str, fstype: str) -> "_Snapshot | None":
+    if not shutil.which("lvs"):
+        return None
+    ok, out = _run(["lvs", "--noheadings", "-o", "vg_name,lv_name", device])
+    parts = out.split() if ok else []
+    if len(parts) != 2:
+        return None
+    vg, lv = parts
+    _remove_stale_lvm(vg)
+    name = _snap_name()
+    ok, err = _run(["lvcreate", "-s", "-n", name, "-l", _LVM_EXTENTS, "-p", "r", f"{vg}/{lv}"])
+    if not ok:
+        logger.warning("LVM snapshot of %s/%s failed: %s", vg, lv, err)
+        return None
+    tmp_dir = tempfile.mkdtemp(prefix=f"{_SNAP_MARK}{os.getpid()}-")
+    opts = "ro,nouuid" if fstype == "xfs" else "ro"
+    ok, err = _run(["mount", "-o", opts, f"/dev/{vg}/{name}", tmp_dir])
+    if not ok:
+        logger.warning("LVM snapshot %s/%s could not be mounted: %s", vg, name, err)
+        _run(["lvremove", "-f", f"{vg}/{name}"])
+        os.rmdir(tmp_dir)
+        return None
+    return _Snapshot("lvm", f"{vg}/{lv}", mountpoint, tmp_dir,
+                     [["umount", tmp_dir], ["lvremove", "-f", f"{vg}/{name}"]], tmp_dir)
+
+
+def _remove_stale_lvm(vg: str) -> None:
+    try:
+        with open("/proc/mounts", encoding="utf-8", errors="replace") as f:
+            mounts = [line.split()[1] for line in f if len(line.split()) > 1]
+    except OSError:
+        mounts = []
+    for mnt in mounts:
+        if (os.path.dirname(mnt) == tempfile.gettempdir() and os.path.basename(mnt).startswith(_SNAP_MARK)
+                and _is_stale(os.path.basename(mnt)) and _run(["umount", mnt])[0]):
+            try:
+                os.rmdir(mnt)
+            except OSError:
+                pass
+    ok, out = _run(["lvs", "--noheadings", "-o", "lv_name", vg])
+    for name in out.split() if ok else []:
+        if name.startswith(_SNAP_MARK) and _is_stale(name) and _run(["lvremove", "-f", f"{vg}/{name}"])[0]:
+            logger.info("snapshot: leftover %s/%s removed", vg, name)
+
+
+class SnapshotSet:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snaps: dict[str, "_Snapshot | None"] = {}
+
+    def _take(self, real: str) -> "_Snapshot | None":
+        device, mountpoint, fstype = mount_of(real)
+        if fstype == "btrfs":
+            key = f"btrfs:{_btrfs_subvolume(real)}"
+        elif fstype == "zfs" or device.startswith("/dev/"):
+            key = f"{fstype}:{device}"
+        else:
+            logger.warning("snapshot: %s is on %s, which has no snapshot support — copying the live files",
+                           real, fstype or "an unknown filesystem")
+            return None
+        if key in self._snaps:
+            return self._snaps[key]
+        if fstype == "btrfs":
+            snap = _take_btrfs(real)
+        elif fstype == "zfs":
+            snap = _take_zfs(device, mountpoint)
+        else:
+            snap = _take_lvm(device, mountpoint, fstype)
+        if snap is None:
+            logger.warning("snapshot: no snapshot could be taken for %s — copying the live files", real)
+        else:
+            logger.info("snapshot: %s %s → %s", snap.kind, snap.origin, snap.path)
+        self._snaps[key] = snap
+        return snap
+
+    def map(self, path: str) -> "str | None":
+        real = os.path.realpath(path)
+        with self._lock:
+            snap = self._take(real)
+        if snap is None:
+            return None
+        mapped = snap.map(real)
+        return mapped if os.path.lexists(mapped) else None
+
+    @staticmethod
+    def nested(path: str) -> list[str]:
+        real = os.path.realpath(path)
+        return _btrfs_nested(real) if mount_of(real)[2] == "btrfs" else []
+
+    def release_all(self) -> None:
+        with self._lock:
+            snaps, self._snaps = [s for s in self._snaps.values() if s is not None], {}
+        for snap in snaps:
+            snap.release()
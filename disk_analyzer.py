@@ -11,12 +11,13 @@ from pathlib import Path
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QPoint
 from PyQt6.QtGui import QColor, QCloseEvent, QKeySequence, QShortcut
 from PyQt6.QtWidgets import (
-    QComboBox, QDialog, QFileDialog, QFrame, QHBoxLayout, QLabel,
+    QCheckBox, QComboBox, QDialog, QFileDialog, QFrame, QHBoxLayout, QLabel,
     QLineEdit, QListWidget, QListWidgetItem, QMessageBox, QProgressBar,
     QPushButton, QVBoxLayout, QApplication,
 )
 
-from state import _HOME, logger
+from disk_scan import DiskScan, ScanIndex, list_dir, read_mounts
+from state import S, _HOME, logger, save_profile
 from themes import current_theme, font_sz
 from translations import tr
 from ui_utils import footer_bar_style, header_bar_style, _StandardKeysMixin
@@ -29,6 +30,11 @@ _R_SIZE       = 1
 _R_IS_DIR     = 2
 _R_FILE_COUNT = 3
 _R_IS_MOUNT   = 4
+_R_APPARENT   = 5
+_R_SHARED     = 6
+
+_EMIT_SECS = 0.25
+_MAX_ROWS  = 2000
 
 
 def _fmt_size(value: float) -> str:
@@ -114,133 +120,61 @@ def _get_disk_info(path: Path) -> dict:
     return info
 
 
+def _index_rows(index: ScanIndex, i: int, mounts: frozenset) -> list[tuple]:
+    rows = [(Path(row[0]), *row[1:]) for row in list_dir(index, i, mounts)]
+    rows.sort(key=lambda x: x[_R_SIZE], reverse=True)
+    return rows[:_MAX_ROWS]
+
+
 class _ScanWorker(QThread):
     progress = pyqtSignal(str)
+    partial  = pyqtSignal(list)
+    indexed  = pyqtSignal(object)
     finished = pyqtSignal(list, float, int)
 
-    def __init__(self, root: Path, cancel: threading.Event) -> None:
+    def __init__(self, root: Path, cancel: threading.Event, prior: "ScanIndex | None" = None,
+                 prior_idx: int = 0, extents: bool = False) -> None:
         super().__init__()
-        self._root   = root
-        self._cancel = cancel
+        self._root      = root
+        self._cancel    = cancel
+        self._prior     = prior
+        self._prior_idx = prior_idx
+        self._extents   = extents
 
     def run(self) -> None:
         t0 = time.monotonic()
-        results: list[tuple[Path, int, bool, int, bool]] = []
-        skipped_mounts = 0
-
-        mount_points: set[str] = set()
-        try:
-            with open("/proc/mounts", encoding="utf-8", errors="replace") as f:
-                for line in f:
-                    cols = line.split()
-                    if len(cols) >= 2:
-                        mount_points.add(os.path.realpath(cols[1]))
-        except OSError:
-            pass
-
-        root_real = os.path.realpath(str(self._root))
-        try:
-            root_dev = os.lstat(self._root).st_dev
-        except OSError:
-            root_dev = -1
-
-        sizes: dict[Path, int] = {}
-        try:
-            proc = subprocess.Popen(
-                ["du", "-x", "--block-size=1", "--max-depth=1", str(self._root)],
-                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
-            )
-            n_found = 0
-
-            if proc.stdout:
-                try:
-                    for line in proc.stdout:
-                        if self._cancel.is_set():
-                            proc.kill()
-                            break
-                        line = line.rstrip("\n")
-                        if not line:
-                            continue
-                        parts = line.split("\t", 1)
-                        if len(parts) == 2:
-                            try:
-                                sz = int(parts[0])
-                                path = Path(parts[1])
-                                if path != self._root:
-                                    sizes[path] = sz
-                                    n_found += 1
-                                    self.progress.emit(tr("Scanning\u2026 {n} entries found", n=n_found))
-                            except ValueError:
-                                pass
-                finally:
-                    proc.stdout.close()
-            proc.wait()
-        except (OSError, subprocess.SubprocessError) as exc:
-            logger.warning("DiskAnalyzer du: %s", exc)
+        results: list[tuple] = []
+        mounts = read_mounts() - {os.path.realpath(str(self._root))}
+
+        scan = DiskScan(str(self._root), self._cancel, mounts, self._prior, self._prior_idx, self._extents)
+        scan.start()
+        while True:
+            done = scan.wait(_EMIT_SECS)
+            rows: list[tuple] = [
+                (Path(n.path), n.alloc, True, n.files, False, n.apparent, n.shared)
+                for n in scan.drain() if n.parent is scan.root
+            ]
+            if rows:
+                results.extend(rows)
+                self.partial.emit(rows)
+            if done or self._cancel.is_set():
+                break
+            self.progress.emit(tr("Scanning\u2026 {n} folders read", n=_fmt_count(scan.scanned)))
+        if scan.errors:
+            logger.info("DiskAnalyzer %s: %d unreadable entries skipped", self._root, scan.errors)
+        if self._cancel.is_set():
+            results.sort(key=lambda x: x[_R_SIZE], reverse=True)
+            self.finished.emit(results[:_MAX_ROWS], time.monotonic() - t0, 0)
+            return
 
-        try:
-            for entry in os.scandir(self._root):
-                if self._cancel.is_set():
-                    break
-                try:
-                    if entry.is_symlink():
-                        continue
-                    path = Path(entry.path)
-
-                    if entry.is_file(follow_symlinks=False):
-                        size = sizes.get(path, 0)
-                        if size == 0:
-                            try:
-                                st   = entry.stat(follow_symlinks=False)
-                                size = st.st_blocks * 512
-                            except OSError:
-                                pass
-                        results.append((path, size, False, 1, False))
-
-                    elif entry.is_dir(follow_symlinks=False):
-                        entry_real = str(path.resolve())
-                        is_mount = (
-                            entry_real in mount_points
-                            and entry_real != root_real
-                        )
-                        if is_mount:
-                            results.append((path, 0, True, 0, True))
-                            skipped_mounts += 1
-                        else:
-                            size       = sizes.get(path, 0)
-                            file_count = self._count_files(path, root_dev)
-                            results.append((path, size, True, file_count, False))
-
-                except (OSError, PermissionError):
-                    pass
-        except (OSError, PermissionError) as exc:
-            logger.warning("DiskAnalyzer scan: %s", exc)
-
-        results.sort(key=lambda x: x[_R_SIZE], reverse=True)
-        elapsed = time.monotonic() - t0
-        self.finished.emit(results[:500], elapsed, skipped_mounts)
-
-    def _count_files(self, path: Path, root_dev: int) -> int:
-        count = 0
-        try:
-            for dirpath, dirnames, filenames in os.walk(
-                path, followlinks=False, topdown=True, onerror=lambda e: None
-            ):
-                if self._cancel.is_set():
-                    break
-                if root_dev != -1:
-                    keep = []
-                    for d in dirnames:
-                        try:
-                            if os.lstat(os.path.join(dirpath, d)).st_dev == root_dev:
-                                keep.append(d)
-                        except OSError:
-                            keep.append(d)
-                    dirnames[:] = keep
-                count += len(filenames)
-        except OSError:
-            pass
-        return count
+        index = ScanIndex.build(scan.root, self._extents)
+        logger.info("DiskAnalyzer %s: %d folders (%d unchanged since the last scan) in %.1fs",
+                    self._root, len(index), scan.reused, time.monotonic() - t0)
+        if S.ui.get("disk_index", False):
+            index.save()
+        self.indexed.emit(index)
+        results = _index_rows(index, 0, mounts)
+        self.finished.emit(results, time.monotonic() - t0, sum(1 for x in results if x[_R_IS_MOUNT]))
 
 
 class _DiskInfoBar(QFrame):
@@ -336,6 +270,8 @@ class DiskAnalyzerDialog(_StandardKeysMixin, QDialog):
         self._elapsed:      float       = 0.0
         self._sort_mode:    int         = self._SORT_SIZE_DESC
         self._skipped_mounts: int       = 0
+        self._index:        ScanIndex | None = None
+        self._cached_at:    float       = 0.0
 
         self._nav_back:    list[Path] = []
         self._nav_forward: list[Path] = []
@@ -344,6 +280,7 @@ class DiskAnalyzerDialog(_StandardKeysMixin, QDialog):
         self._refresh_nav_buttons()
 
         QShortcut(QKeySequence("F5"), self).activated.connect(self._start_scan)
+        QShortcut(QKeySequence("Ctrl+F5"), self).activated.connect(lambda: self._start_scan(full=True))
 
     def _build_ui(self) -> None:
         t   = current_theme()
@@ -362,7 +299,7 @@ class DiskAnalyzerDialog(_StandardKeysMixin, QDialog):
         )
         hl.addWidget(title)
         hl.addStretch()
-        kbd = QLabel(tr("F5 = Refresh"))
+        kbd = QLabel(tr("F5 = Refresh  ·  Ctrl+F5 = Full rescan"))
         kbd.setStyleSheet(f"color:{dim};font-size:{font_sz(-2)}px;background:transparent;")
         hl.addWidget(kbd)
 
@@ -499,6 +436,30 @@ class DiskAnalyzerDialog(_StandardKeysMixin, QDialog):
         export_btn.setStyleSheet(self._btn_ss(t))
         export_btn.clicked.connect(self._export_clipboard)
 
+        dup_btn = QPushButton(tr("🔁 Duplicates"))
+        dup_btn.setFixedHeight(26)
+        dup_btn.setToolTip(tr("Find files with identical content below the current directory"))
+        dup_btn.setStyleSheet(self._btn_ss(t))
+        dup_btn.clicked.connect(self._find_duplicates)
+
+        reports_btn = QPushButton(tr("📊 Reports"))
+        reports_btn.setFixedHeight(26)
+        reports_btn.setToolTip(tr("Largest files, space by extension and file age below the current directory"))
+        reports_btn.setStyleSheet(self._btn_ss(t))
+        reports_btn.clicked.connect(self._show_reports)
+
+        self._remember_cb = QCheckBox(tr("Remember scans"))
+        self._remember_cb.setToolTip(tr("Keep the folder index on disk so the next scan of this directory "
+                                        "only re-reads folders that changed"))
+        self._remember_cb.setChecked(bool(S.ui.get("disk_index", False)))
+        self._remember_cb.toggled.connect(self._on_remember_toggled)
+
+        self._extents_cb = QCheckBox(tr("Shared extents"))
+        self._extents_cb.setToolTip(tr("Ask the filesystem which blocks are shared with other files or snapshots "
+                                       "(reflinks, btrfs/XFS snapshots). Slower: every file is opened."))
+        self._extents_cb.setChecked(bool(S.ui.get("disk_extents", False)))
+        self._extents_cb.toggled.connect(self._on_extents_toggled)
+
         cl.addWidget(sort_lbl)
         cl.addWidget(self._sort_combo)
         cl.addSpacing(12)
@@ -506,6 +467,10 @@ class DiskAnalyzerDialog(_StandardKeysMixin, QDialog):
         cl.addWidget(self._filter_edit, 1)
         cl.addWidget(clear_btn)
         cl.addSpacing(12)
+        cl.addWidget(self._remember_cb)
+        cl.addWidget(self._extents_cb)
+        cl.addWidget(dup_btn)
+        cl.addWidget(reports_btn)
         cl.addWidget(export_btn)
 
         self._list = QListWidget()
@@ -594,7 +559,7 @@ class DiskAnalyzerDialog(_StandardKeysMixin, QDialog):
         self._nav_forward.append(self._scan_root)
         dest = self._nav_back.pop()
         self._path_edit.setText(str(dest))
-        self._start_scan(push_history=False)
+        self._start_scan(push_history=False, cached=True)
 
     def _nav_forward_action(self) -> None:
         if not self._nav_forward:
@@ -602,7 +567,7 @@ class DiskAnalyzerDialog(_StandardKeysMixin, QDialog):
         self._nav_back.append(self._scan_root)
         dest = self._nav_forward.pop()
         self._path_edit.setText(str(dest))
-        self._start_scan(push_history=False)
+        self._start_scan(push_history=False, cached=True)
 
     def _nav_up(self) -> None:
         parent = self._scan_root.parent
@@ -611,7 +576,7 @@ class DiskAnalyzerDialog(_StandardKeysMixin, QDialog):
         self._nav_back.append(self._scan_root)
         self._nav_forward.clear()
         self._path_edit.setText(str(parent))
-        self._start_scan(push_history=False)
+        self._start_scan(push_history=False, cached=True)
 
     def _drill_into(self, path: Path) -> None:
         if not path.is_dir():
@@ -619,15 +584,44 @@ class DiskAnalyzerDialog(_StandardKeysMixin, QDialog):
         self._nav_back.append(self._scan_root)
         self._nav_forward.clear()
         self._path_edit.setText(str(path))
-        self._start_scan(push_history=False)
+        self._start_scan(push_history=False, cached=True)
+
+    def _on_remember_toggled(self, checked: bool) -> None:
+        S.ui["disk_index"] = checked
+        save_profile()
+        if checked and self._index is not None:
+            self._index.save()
+
+    def _on_extents_toggled(self, checked: bool) -> None:
+        S.ui["disk_extents"] = checked
+        save_profile()
+
+    def _show_cached(self, root: Path) -> bool:
+        i = self._index.find(str(root)) if self._index is not None else None
+        if i is None:
+            return False
+        self._filter_edit.blockSignals(True)
+        self._filter_edit.clear()
+        self._filter_edit.blockSignals(False)
+        self._list.clear()
+        self._results        = _index_rows(self._index, i, read_mounts())
+        self._elapsed        = 0.0
+        self._cached_at      = self._index.created
+        self._skipped_mounts = sum(1 for x in self._results if x[_R_IS_MOUNT])
+        self._legend.setText("")
+        self._status.setText(tr("Empty directory."))
+        self._apply_filter()
+        return True
 
-    def _start_scan(self, *, push_history: bool = True) -> None:
+    def _start_scan(self, *, push_history: bool = True, cached: bool = False, full: bool = False) -> None:
         if self._worker and self._worker.isRunning():
             self._cancel.set()
             self._worker.wait(500)
             try:
                 self._worker.finished.disconnect()
                 self._worker.progress.disconnect()
+                self._worker.partial.disconnect()
+                self._worker.indexed.disconnect()
             except (RuntimeError, TypeError):
                 pass
 
@@ -648,6 +642,17 @@ class DiskAnalyzerDialog(_StandardKeysMixin, QDialog):
         self._disk_info = _get_disk_info(root)
         self._disk_bar.update_info(self._disk_info)
 
+        if cached and self._show_cached(root):
+            return
+
+        prior, prior_idx = None, 0
+        if not full:
+            idx = self._index.find(str(root)) if self._index is not None else None
+            if idx is not None:
+                prior, prior_idx = self._index, idx
+            else:
+                prior = ScanIndex.load(str(root))
+
         self._cancel = threading.Event()
         self._filter_edit.blockSignals(True)
         self._filter_edit.clear()
@@ -660,13 +665,23 @@ class DiskAnalyzerDialog(_StandardKeysMixin, QDialog):
         self._scan_btn.setEnabled(False)
         self._status.setText(tr("Scanning…"))
 
-        self._worker = _ScanWorker(root, self._cancel)
+        self._worker = _ScanWorker(root, self._cancel, prior, prior_idx, self._extents_cb.isChecked())
         self._worker.progress.connect(self._status.setText)
+        self._worker.partial.connect(self._on_partial)
+        self._worker.indexed.connect(self._on_indexed)
         self._worker.finished.connect(self._on_done)
         self._worker.start()
 
+    def _on_partial(self, rows: list) -> None:
+        self._results.extend(rows)
+        self._apply_filter(self._filter_edit.text())
+
+    def _on_indexed(self, index: ScanIndex) -> None:
+        self._index = index
+
     def _on_done(self, results: list, elapsed: float, skipped_mounts: int) -> None:
         self._results        = results
+        self._cached_at      = 0.0
         self._elapsed        = elapsed
         self._skipped_mounts = skipped_mounts
         self._progress.setVisible(False)
@@ -744,6 +759,11 @@ class DiskAnalyzerDialog(_StandardKeysMixin, QDialog):
             pct_scan = (size / max(scan_total, 1)) * 100
 
             count_str = tr("  [{n} files]", n=_fmt_count(file_count)) if is_dir else ""
+            apparent = entry[_R_APPARENT]
+            if abs(apparent - size) * 10 > max(size, apparent):
+                count_str += tr("  (apparent {size})", size=_fmt_size(apparent))
+            if entry[_R_SHARED]:
+                count_str += tr("  ({size} shared)", size=_fmt_size(entry[_R_SHARED]))
 
             line1 = f"{icon}{display}"
             line2 = (
@@ -759,6 +779,9 @@ class DiskAnalyzerDialog(_StandardKeysMixin, QDialog):
             shown_count += 1
 
         elapsed_str = tr("  (Scan: {s:.1f}s)", s=self._elapsed) if self._elapsed else ""
+        if self._cached_at:
+            elapsed_str = tr("  (from the scan of {when})",
+                             when=time.strftime("%H:%M", time.localtime(self._cached_at)))
 
         visible_mounts = sum(
             1 for x in sorted_r
@@ -788,7 +811,10 @@ class DiskAnalyzerDialog(_StandardKeysMixin, QDialog):
                    mounts=mount_note, elapsed=elapsed_str)
             )
 
-        legend_parts = [tr("% = share of total scanned size"), tr("Sizes = actual allocated blocks (same as `du -sh`)")]
+        legend_parts = [tr("% = share of total scanned size"), tr("Sizes = actual allocated blocks (same as `du -sh`)"),
+                        tr("Hard-linked files are counted once")]
+        if any(x[_R_SHARED] for x in sorted_r):
+            legend_parts.append(tr("shared = blocks also used by other files or snapshots"))
 
         if self._skipped_mounts or visible_mounts:
             legend_parts.append(
@@ -895,12 +921,28 @@ class DiskAnalyzerDialog(_StandardKeysMixin, QDialog):
                "Please install one (e.g. gnome-terminal, konsole, alacritty, xterm)."),
         )
 
+    def _find_duplicates(self) -> None:
+        from disk_duplicates import DuplicatesDialog
+        root = self._scan_root
+        if not root.is_dir():
+            return
+        DuplicatesDialog(root, self).exec()
+        if self._index is not None and self._index.find(str(root)) is not None:
+            self._start_scan(push_history=False)
+
+    def _show_reports(self) -> None:
+        from disk_reports import ReportsDialog
+        root = self._scan_root
+        if root.is_dir():
+            ReportsDialog(root, self).exec()
+
     def _export_clipboard(self) -> None:
         if not self._results:
             return
         buf = io.StringIO()
         w   = csv.writer(buf)
-        w.writerow([tr("Name"), tr("Path"), tr("Size (bytes)"), tr("Size (human)"), tr("Type"), tr("Files")])
+        w.writerow([tr("Name"), tr("Path"), tr("Size (bytes)"), tr("Size (human)"), tr("Type"), tr("Files"),
+                    tr("Apparent size (bytes)"), tr("Shared (bytes)")])
         for entry in self._sorted_results():
             path       = entry[_R_PATH]
             size       = entry[_R_SIZE]
@@ -912,7 +954,8 @@ class DiskAnalyzerDialog(_StandardKeysMixin, QDialog):
             except ValueError:
                 name = str(path)
             kind = tr("mount") if is_mount else (tr("dir") if is_dir else tr("file"))
-            w.writerow([name, str(path), size, _fmt_size(size), kind, file_count])
+            w.writerow([name, str(path), size, _fmt_size(size), kind, file_count, entry[_R_APPARENT],
+                        entry[_R_SHARED]])
         QApplication.clipboard().setText(buf.getvalue())
         self._status.setText(tr("✓ Results copied to clipboard as CSV"))
 
@@ -0,0 +1,398 @@
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import count
+from pathlib import Path
+
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtGui import QCloseEvent, QColor
+from PyQt6.QtWidgets import (
+    QDialog, QHeaderView, QMessageBox, QProgressBar, QPushButton, QTreeWidget, QTreeWidgetItem, QLabel,
+)
+
+from copy_worker_delta import _DELTA_MIN, hash_blocks, load_map, save_map
+from disk_analyzer import _fmt_size
+from disk_scan import DiskScan, read_mounts
+from state import apply_replacements, logger
+from themes import current_theme, font_sz
+from translations import tr
+from ui_utils import _StandardKeysMixin, build_dialog_shell, size_to_screen
+
+__all__ = ["DuplicatesDialog"]
+
+_DUP_MIN      = 4096
+_PART_SIZE    = 64 * 1024
+_HASH_WORKERS = min(8, max(2, os.cpu_count() or 2))
+_IN_FLIGHT    = 4
+_EMIT_SECS    = 0.25
+_DIGEST       = 16
+
+
+def _partial_digest(path: str, size: int) -> "bytes | None":
+    h = hashlib.blake2b(size.to_bytes(8, "little"), digest_size=_DIGEST)
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        if size <= 2 * _PART_SIZE:
+            h.update(os.pread(fd, size, 0))
+        else:
+            h.update(os.pread(fd, _PART_SIZE, 0))
+            h.update(os.pread(fd, _PART_SIZE, size - _PART_SIZE))
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    return h.digest()
+
+
+def _full_digest(path: str, size: int, mtime_ns: int, cancel: threading.Event) -> "bytes | None":
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if st.st_size != size or st.st_mtime_ns != mtime_ns:
+        return None
+    digests = load_map(path, size, mtime_ns, st.st_ctime_ns)
+    if digests is None:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            digests = hash_blocks(fd, size, cancel)
+            st = os.fstat(fd)
+        except (OSError, InterruptedError):
+            return None
+        finally:
+            os.close(fd)
+        if st.st_size != size or st.st_mtime_ns != mtime_ns:
+            return None
+        if size >= _DELTA_MIN:
+            save_map(path, size, mtime_ns, digests)
+    return hashlib.blake2b(digests, digest_size=_DIGEST).digest()
+
+
+def _regroup(entries: list, digests) -> list[list]:
+    groups: dict[bytes, list] = {}
+    for entry, digest in zip(entries, digests):
+        if digest is not None:
+            groups.setdefault(digest, []).append(entry)
+    return [g for g in groups.values() if len(g) > 1]
+
+
+class _DupWorker(QThread):
+    progress = pyqtSignal(str)
+    group    = pyqtSignal(object)
+    done     = pyqtSignal(int, int, float)
+
+    def __init__(self, root: Path, cancel: threading.Event) -> None:
+        super().__init__()
+        self._root   = root
+        self._cancel = cancel
+
+    def run(self) -> None:
+        t0 = time.monotonic()
+        scan = DiskScan(str(self._root), self._cancel, read_mounts() - {os.path.realpath(str(self._root))},
+                        collect_min=_DUP_MIN, retain=False)
+        scan.start()
+        while not scan.wait(_EMIT_SECS):
+            self.progress.emit(tr("Reading folders… {n} files", n=len(scan.collected)))
+
+        by_size: dict[int, dict[tuple[int, int], tuple[str, int]]] = {}
+        for path, size, dev, ino, mtime_ns in scan.collected:
+            by_size.setdefault(size, {}).setdefault((dev, ino), (path, mtime_ns))
+        sizes = sorted((s for s, inodes in by_size.items() if len(inodes) > 1), reverse=True)
+        n_groups = wasted = compared = 0
+
+        buckets: dict[int, list] = {}
+        full_jobs: deque[tuple[int, int]] = deque()
+        ids = count(len(sizes))
+        part_jobs = ((b, i) for b, size in enumerate(sizes) for i in range(len(by_size[size])))
+        for b, size in enumerate(sizes):
+            buckets[b] = [size, False, list(by_size[size].values()), {}]
+        running: dict = {}
+        with ThreadPoolExecutor(max_workers=_HASH_WORKERS, thread_name_prefix="dup-hash") as pool:
+            while not self._cancel.is_set():
+                while len(running) < _HASH_WORKERS * _IN_FLIGHT:
+                    job = full_jobs.popleft() if full_jobs else next(part_jobs, None)
+                    if job is None:
+                        break
+                    size, full, entries, _ = buckets[job[0]]
+                    path, mtime_ns = entries[job[1]]
+                    fut = (pool.submit(_full_digest, path, size, mtime_ns, self._cancel) if full
+                           else pool.submit(_partial_digest, path, size))
+                    running[fut] = job
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    b, i = running.pop(fut)
+                    size, full, entries, digests = buckets[b]
+                    digests[i] = fut.result()
+                    if len(digests) < len(entries):
+                        continue
+                    del buckets[b]
+                    if not full:
+                        compared += 1
+                        self.progress.emit(tr("Comparing files of the same size… {i}/{n}", i=compared, n=len(sizes)))
+                    for g in _regroup(entries, map(digests.get, range(len(entries)))):
+                        if not full and size > 2 * _PART_SIZE:
+                            nb = next(ids)
+                            buckets[nb] = [size, True, g, {}]
+                            full_jobs.extend((nb, k) for k in range(len(g)))
+                            continue
+                        n_groups += 1
+                        wasted += size * (len(g) - 1)
+                        self.group.emit((size, sorted(g)))
+            for fut in running:
+                fut.cancel()
+        self.done.emit(n_groups, wasted, time.monotonic() - t0)
+
+
+class _ActWorker(QThread):
+    progress = pyqtSignal(str)
+    applied  = pyqtSignal(str)
+    done     = pyqtSignal(int, int)
+
+    def __init__(self, plan: list[tuple[int, str, int, list[tuple[str, int]]]], link: bool,
+                 cancel: threading.Event) -> None:
+        super().__init__()
+        self._plan   = plan
+        self._link   = link
+        self._cancel = cancel
+
+    def run(self) -> None:
+        n = sum(len(t) for *_x, t in self._plan)
+        i = done = errors = 0
+        for size, keep_path, keep_mtime, targets in self._plan:
+            for path, mtime_ns in targets:
+                if self._cancel.is_set():
+                    break
+                i += 1
+                self.progress.emit(tr("Checking {i}/{n}: {name}", i=i, n=n, name=os.path.basename(path)))
+                err = _apply_one(keep_path, keep_mtime, path, mtime_ns, size, self._link, self._cancel)
+                if err:
+                    errors += 1
+                    logger.warning("Duplicates: %s: %s", apply_replacements(path), err)
+                    continue
+                done += 1
+                self.applied.emit(path)
+        self.done.emit(done, errors)
+
+
+# noinspection PyUnresolvedReferences
+class DuplicatesDialog(_StandardKeysMixin, QDialog):
+    def __init__(self, root: Path, parent=None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle(tr("Duplicate Files"))
+        size_to_screen(self, 1300, 1000)
+        self._root   = root
+        self._cancel = threading.Event()
+        self._worker: _DupWorker | None = None
+        self._act_worker: _ActWorker | None = None
+        self._items: dict[str, QTreeWidgetItem] = {}
+        self._build()
+        self._start()
+
+    def _build(self) -> None:
+        t = current_theme()
+        self._t = t
+        self._run_btn = QPushButton(f"▶  {tr('Search again')}")
+        self._run_btn.setFixedHeight(34)
+        self._run_btn.clicked.connect(self._start)
+
+        self._link_btn = QPushButton(tr("🔗 Replace checked with hard links"))
+        self._link_btn.clicked.connect(lambda: self._act(link=True))
+        self._del_btn = QPushButton(tr("🗑 Delete checked"))
+        self._del_btn.clicked.connect(lambda: self._act(link=False))
+
+        self._status_lbl = QLabel("")
+        self._status_lbl.setStyleSheet(
+            f"color:{t['text_dim']};font-size:{font_sz(-1)}px;background:transparent;border:none;"
+        )
+
+        lay, body, _ = build_dialog_shell(
+            self, t, font_sz, tr("Duplicate Files"), "🔁",
+            header_extra=[self._run_btn],
+            footer_extra=[self._status_lbl, self._link_btn, self._del_btn],
+        )
+
+        self._progress = QProgressBar()
+        self._progress.setRange(0, 0)
+        self._progress.setFixedHeight(4)
+        self._progress.setTextVisible(False)
+        self._progress.setStyleSheet(
+            f"QProgressBar{{background:{t['bg3']};border:none;}}"
+            f"QProgressBar::chunk{{background:{t['accent']};}}"
+        )
+        lay.insertWidget(1, self._progress)
+
+        hint = QLabel(tr("Files under {root} with identical content. Checked copies are deleted or replaced "
+                         "by a hard link to the unchecked copy of their group.", root=self._root))
+        hint.setWordWrap(True)
+        hint.setStyleSheet(f"color:{t['text_dim']};font-size:{font_sz(-1)}px;background:transparent;border:none;")
+
+        self._tree = QTreeWidget()
+        self._tree.setHeaderLabels([tr("File"), tr("Size"), tr("Modified")])
+        self._tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self._tree.setStyleSheet(
+            f"QTreeWidget{{background:{t['bg3']};border:1px solid {t['header_sep']};border-radius:4px;"
+            f"font-family:monospace;font-size:{font_sz(-1)}px;color:{t['text']};}}"
+        )
+        body.addWidget(hint)
+        body.addWidget(self._tree, 1)
+
+    def _start(self) -> None:
+        if self._act_worker and self._act_worker.isRunning():
+            return
+        if self._worker and self._worker.isRunning():
+            self._cancel.set()
+            self._worker.wait(2000)
+        self._cancel = threading.Event()
+        self._tree.clear()
+        self._progress.show()
+        self._run_btn.setEnabled(False)
+        self._worker = _DupWorker(self._root, self._cancel)
+        self._worker.progress.connect(self._status_lbl.setText)
+        self._worker.group.connect(self._on_group)
+        self._worker.done.connect(self._on_done)
+        self._worker.start()
+
+    def _on_group(self, group: tuple) -> None:
+        size, entries = group
+        head = QTreeWidgetItem([tr("{n} copies · {wasted} reclaimable", n=len(entries),
+                                   wasted=_fmt_size(size * (len(entries) - 1))), _fmt_size(size), ""])
+        head.setForeground(0, QColor(self._t["accent"]))
+        head.setData(0, Qt.ItemDataRole.UserRole, size)
+        for i, (path, mtime_ns) in enumerate(entries):
+            child = QTreeWidgetItem([path, "", time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime_ns / 1e9))])
+            child.setData(0, Qt.ItemDataRole.UserRole, (path, mtime_ns))
+            child.setCheckState(0, Qt.CheckState.Unchecked if i == 0 else Qt.CheckState.Checked)
+            head.addChild(child)
+        pos = self._tree.topLevelItemCount()
+        while pos and self._tree.topLevelItem(pos - 1).data(0, Qt.ItemDataRole.UserRole) < size:
+            pos -= 1
+        self._tree.insertTopLevelItem(pos, head)
+        head.setExpanded(True)
+
+    def _on_done(self, groups: int, wasted: int, elapsed: float) -> None:
+        self._progress.hide()
+        self._run_btn.setEnabled(True)
+        self._status_lbl.setText(tr("{n} duplicate groups · {wasted} reclaimable  (search: {s:.1f}s)",
+                                    n=groups, wasted=_fmt_size(wasted), s=elapsed))
+
+    def _act(self, link: bool) -> None:
+        if self._act_worker and self._act_worker.isRunning():
+            return
+        plan: list[tuple[int, str, int, list[tuple[str, int]]]] = []
+        self._items = {}
+        for g in range(self._tree.topLevelItemCount()):
+            head = self._tree.topLevelItem(g)
+            kids = [head.child(i) for i in range(head.childCount())]
+            targets = [k for k in kids if k.checkState(0) == Qt.CheckState.Checked]
+            keep = next((k for k in kids if k.checkState(0) != Qt.CheckState.Checked), None)
+            if targets and keep is not None:
+                plan.append((head.data(0, Qt.ItemDataRole.UserRole), *keep.data(0, Qt.ItemDataRole.UserRole),
+                             [k.data(0, Qt.ItemDataRole.UserRole) for k in targets]))
+                self._items.update((k.data(0, Qt.ItemDataRole.UserRole)[0], k) for k in targets)
+        n = sum(len(t) for *_x, t in plan)
+        if not n:
+            QMessageBox.information(self, tr("Duplicate Files"),
+                                    tr("Check the copies to remove; every group must keep one unchecked copy."))
+            return
+        question = (tr("Replace {n} file(s) with hard links to the kept copy?", n=n) if link
+                    else tr("Permanently delete {n} file(s)?", n=n))
+        if QMessageBox.question(self, tr("Duplicate Files"), question) != QMessageBox.StandardButton.Yes:
+            return
+        for btn in (self._run_btn, self._link_btn, self._del_btn):
+            btn.setEnabled(False)
+        self._progress.show()
+        self._act_worker = _ActWorker(plan, link, self._cancel)
+        self._act_worker.progress.connect(self._status_lbl.setText)
+        self._act_worker.applied.connect(self._on_applied)
+        self._act_worker.done.connect(self._on_act_done)
+        self._act_worker.start()
+
+    def _on_applied(self, path: str) -> None:
+        item = self._items.pop(path, None)
+        head = item.parent() if item is not None else None
+        if head is None:
+            return
+        head.removeChild(item)
+        if head.childCount() < 2:
+            self._tree.takeTopLevelItem(self._tree.indexOfTopLevelItem(head))
+
+    def _on_act_done(self, done: int, errors: int) -> None:
+        self._items = {}
+        self._progress.hide()
+        for btn in (self._run_btn, self._link_btn, self._del_btn):
+            btn.setEnabled(True)
+        self._status_lbl.setText(tr("✓ {done} file(s) processed, {errors} error(s) — see log", done=done, errors=errors)
+                                 if errors else tr("✓ {done} file(s) processed", done=done))
+
+    def closeEvent(self, a0: QCloseEvent | None) -> None:
+        self._cancel.set()
+        for worker in (self._worker, self._act_worker):
+            if worker and worker.isRunning():
+                worker.wait(2000)
+        super().closeEvent(a0)
+
+
+def _apply_one(keep: str, keep_mtime: int, path: str, mtime_ns: int, size: int, link: bool,
+               cancel: threading.Event) -> str:
+    try:
+        k = os.stat(keep, follow_symlinks=False)
+        st = os.stat(path, follow_symlinks=False)
+    except OSError as exc:
+        return str(exc)
+    if (st.st_size, st.st_mtime_ns, k.st_size, k.st_mtime_ns) != (size, mtime_ns, size, keep_mtime):
+        return tr("changed since the search")
+    if (st.st_dev, st.st_ino) == (k.st_dev, k.st_ino):
+        return ""
+    if not _same_content(keep, path, size, cancel):
+        return tr("Cancelled") if cancel.is_set() else tr("content differs from the kept copy")
+    try:
+        if link:
+            if st.st_dev != k.st_dev:
+                return tr("on a different filesystem than the kept copy")
+            tmp = f"{path}.{os.getpid()}.link"
+            os.link(keep, tmp)
+            try:
+                os.replace(tmp, path)
+            except OSError:
+                os.unlink(tmp)
+                raise
+        else:
+            os.remove(path)
+    except OSError as exc:
+        return str(exc)
+    return ""
+
+
+def _same_content(a: str, b: str, size: int, cancel: threading.Event) -> bool:
+    try:
+        fa = os.open(a, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        fb = os.open(b, os.O_RDONLY)
+    except OSError:
+        os.close(fa)
+        return False
+    try:
+        for off in range(0, size, _PART_SIZE * 16):
+            if cancel.is_set():
+                return False
+            if os.pread(fa, _PART_SIZE * 16, off) != os.pread(fb, _PART_SIZE * 16, off):
+                return False
+        return os.pread(fa, 1, size) == os.pread(fb, 1, size) == b""
+    except OSError:
+        return False
+    finally:
+        os.close(fa)
+        os.close(fb)
@@ -0,0 +1,220 @@
+import csv
+import os
+import threading
+import time
+from pathlib import Path
+
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtGui import QCloseEvent
+from PyQt6.QtWidgets import (
+    QAbstractItemView, QDialog, QFileDialog, QHeaderView, QLabel, QMessageBox, QProgressBar, QPushButton,
+    QSpinBox, QTableWidget, QTableWidgetItem, QTabWidget,
+)
+
+from disk_analyzer import _fmt_count, _fmt_size
+from disk_scan import _EXT_OTHER, DiskScan, ScanReport, read_mounts
+from themes import current_theme, font_sz
+from translations import tr
+from ui_utils import _StandardKeysMixin, build_dialog_shell, size_to_screen
+
+__all__ = ["ReportsDialog"]
+
+_DEFAULT_K  = 1000
+_LIVE_ROWS  = 200
+_EMIT_SECS  = 1.0
+_TAB_TOP    = 0
+_TAB_EXT    = 1
+_TAB_AGE    = 2
+
+
+def _age_labels() -> list[str]:
+    names = [tr("1 day"), tr("1 week"), tr("1 month"), tr("3 months"), tr("6 months"), tr("1 year"),
+             tr("2 years"), tr("5 years")]
+    return ([tr("Less than {age}", age=names[0])]
+            + [f"{lo} – {hi}" for lo, hi in zip(names, names[1:])]
+            + [tr("More than {age}", age=names[-1])])
+
+
+class _ReportWorker(QThread):
+    progress = pyqtSignal(str)
+    snapshot = pyqtSignal(object, bool)
+    done     = pyqtSignal(float)
+
+    def __init__(self, root: Path, k: int, cancel: threading.Event) -> None:
+        super().__init__()
+        self._root   = root
+        self._cancel = cancel
+        self.report  = ScanReport(k)
+
+    def run(self) -> None:
+        t0 = time.monotonic()
+        scan = DiskScan(str(self._root), self._cancel, read_mounts() - {os.path.realpath(str(self._root))},
+                        report=self.report, retain=False)
+        scan.start()
+        while not scan.wait(_EMIT_SECS):
+            self.progress.emit(tr("Scanning… {n} folders read", n=_fmt_count(scan.scanned)))
+            self.snapshot.emit(self.report.snapshot(), False)
+        self.snapshot.emit(self.report.snapshot(), True)
+        self.done.emit(time.monotonic() - t0)
+
+
+# noinspection PyUnresolvedReferences
+class ReportsDialog(_StandardKeysMixin, QDialog):
+    def __init__(self, root: Path, parent=None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle(tr("Disk Reports"))
+        size_to_screen(self, 1300, 1000)
+        self._root   = root
+        self._cancel = threading.Event()
+        self._worker: _ReportWorker | None = None
+        self._shown_top: list = []
+        self._build()
+        self._start()
+
+    def _build(self) -> None:
+        t = current_theme()
+        self._k_spin = QSpinBox()
+        self._k_spin.setRange(10, 100_000)
+        self._k_spin.setSingleStep(100)
+        self._k_spin.setValue(_DEFAULT_K)
+        self._k_spin.setPrefix(tr("Top "))
+        self._run_btn = QPushButton(f"▶  {tr('Run')}")
+        self._run_btn.setFixedHeight(34)
+        self._run_btn.clicked.connect(self._start)
+
+        export_btn = QPushButton(tr("💾 Export CSV"))
+        export_btn.clicked.connect(self._export)
+        self._status_lbl = QLabel("")
+        self._status_lbl.setStyleSheet(
+            f"color:{t['text_dim']};font-size:{font_sz(-1)}px;background:transparent;border:none;"
+        )
+
+        lay, body, _ = build_dialog_shell(
+            self, t, font_sz, tr("Disk Reports"), "📊",
+            header_extra=[self._k_spin, self._run_btn],
+            footer_extra=[self._status_lbl, export_btn],
+        )
+
+        self._progress = QProgressBar()
+        self._progress.setRange(0, 0)
+        self._progress.setFixedHeight(4)
+        self._progress.setTextVisible(False)
+        self._progress.setStyleSheet(
+            f"QProgressBar{{background:{t['bg3']};border:none;}}"
+            f"QProgressBar::chunk{{background:{t['accent']};}}"
+        )
+        lay.insertWidget(1, self._progress)
+
+        table_ss = (f"QTableWidget{{background:{t['bg3']};border:1px solid {t['header_sep']};"
+                    f"font-size:{font_sz(-1)}px;color:{t['text']};}}")
+        self._tables: list[QTableWidget] = []
+        self._tabs = QTabWidget()
+        for n, (title, headers) in enumerate((
+            (tr("Largest files"), [tr("Size"), tr("Allocated"), tr("Modified"), tr("Path")]),
+            (tr("By extension"), [tr("Extension"), tr("Size"), tr("Files"), tr("Share")]),
+            (tr("Age"), [tr("Age"), tr("Size (modified)"), tr("Files (modified)"),
+                         tr("Size (accessed)"), tr("Files (accessed)")]),
+        )):
+            table = QTableWidget(0, len(headers))
+            table.setHorizontalHeaderLabels(headers)
+            stretch = len(headers) - 1 if n == _TAB_TOP else 0
+            table.horizontalHeader().setSectionResizeMode(stretch, QHeaderView.ResizeMode.Stretch)
+            table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+            table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+            table.verticalHeader().setVisible(False)
+            table.setStyleSheet(table_ss)
+            self._tables.append(table)
+            self._tabs.addTab(table, title)
+
+        hint = QLabel(tr("Reports for {root}. Hard-linked files are counted once. Access times are only as "
+                         "accurate as the mount options allow (relatime, noatime).", root=self._root))
+        hint.setWordWrap(True)
+        hint.setStyleSheet(f"color:{t['text_dim']};font-size:{font_sz(-1)}px;background:transparent;border:none;")
+        body.addWidget(hint)
+        body.addWidget(self._tabs, 1)
+
+    def _start(self) -> None:
+        if self._worker and self._worker.isRunning():
+            self._cancel.set()
+            self._worker.wait(2000)
+        self._cancel = threading.Event()
+        for table in self._tables:
+            table.setRowCount(0)
+        self._shown_top = []
+        self._progress.show()
+        self._run_btn.setEnabled(False)
+        self._worker = _ReportWorker(self._root, self._k_spin.value(), self._cancel)
+        self._worker.progress.connect(self._status_lbl.setText)
+        self._worker.snapshot.connect(self._on_snapshot)
+        self._worker.done.connect(self._on_done)
+        self._worker.start()
+
+    @staticmethod
+    def _fill(table: QTableWidget, rows: list[list]) -> None:
+        table.setUpdatesEnabled(False)
+        table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, (text, sort_val) in enumerate(row):
+                item = QTableWidgetItem(text)
+                item.setData(Qt.ItemDataRole.UserRole, sort_val)
+                if isinstance(sort_val, int):
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                table.setItem(r, c, item)
+        table.setUpdatesEnabled(True)
+
+    def _on_snapshot(self, snap: tuple, final: bool) -> None:
+        top, exts, ages = snap
+        if not final:
+            top = top[:_LIVE_ROWS]
+        if top != self._shown_top:
+            self._shown_top = top
+            self._fill(self._tables[_TAB_TOP], [
+                [(_fmt_size(size), size), (_fmt_size(alloc), alloc),
+                 (time.strftime("%Y-%m-%d", time.localtime(mtime)), mtime), (path, path)]
+                for size, alloc, mtime, path in top
+            ])
+        total = sum(size for _e, size, _n in exts) or 1
+        self._fill(self._tables[_TAB_EXT], [
+            [(tr("(other)") if ext == _EXT_OTHER else ext or tr("(none)"), ext), (_fmt_size(size), size), (_fmt_count(n), n),
+             (f"{size * 100 / total:.1f}%", size)]
+            for ext, size, n in exts
+        ])
+        self._fill(self._tables[_TAB_AGE], [
+            [(label, label), (_fmt_size(row[0]), row[0]), (_fmt_count(row[1]), row[1]),
+             (_fmt_size(row[2]), row[2]), (_fmt_count(row[3]), row[3])]
+            for label, row in zip(_age_labels(), ages)
+        ])
+
+    def _on_done(self, elapsed: float) -> None:
+        self._progress.hide()
+        self._run_btn.setEnabled(True)
+        self._status_lbl.setText(tr("  (Scan: {s:.1f}s)", s=elapsed).strip())
+
+    def _export(self) -> None:
+        idx = self._tabs.currentIndex()
+        table = self._tables[idx]
+        if not table.rowCount():
+            return
+        name = ("largest-files", "extensions", "ages")[idx]
+        path, _ = QFileDialog.getSaveFileName(
+            self, tr("Export report as a CSV file"), f"{self._root.name or 'root'}-{name}.csv", tr("CSV files (*.csv)")
+        )
+        if not path:
+            return
+        headers = [table.horizontalHeaderItem(c).text() for c in range(table.columnCount())]
+        try:
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                w = csv.writer(f)
+                w.writerow(headers)
+                for r in range(table.rowCount()):
+                    w.writerow([table.item(r, c).data(Qt.ItemDataRole.UserRole) for c in range(table.columnCount())])
+        except OSError as exc:
+            QMessageBox.critical(self, tr("Export failed"), tr("The file could not be written:\n{err}", err=exc))
+            return
+        self._status_lbl.setText(tr("✓ Report exported to {path}", path=path))
+
+    def closeEvent(self, a0: QCloseEvent | None) -> None:
+        self._cancel.set()
+        if self._worker and self._worker.isRunning():
+            self._worker.wait(2000)
+        super().closeEvent(a0)
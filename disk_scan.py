@@ -0,0 +1,507 @@
+import fcntl
+import hashlib
+import heapq
+import json
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections import deque
+
+from state import _CONFIG_DIR, logger
+from copy_worker_core import _FIEMAP_EXT, _FIEMAP_HDR, _FS_IOC_FIEMAP, _O_NOATIME
+
+_SCAN_WORKERS = min(16, max(4, (os.cpu_count() or 4) * 2))
+_IDLE_WAIT    = 0.05
+_BLOCK        = 512
+_INDEX_DIR    = _CONFIG_DIR / "diskindex"
+_INDEX_KEEP   = 8
+_INDEX_VER    = 3
+_INDEX_ARRAYS = ("parent", "first", "nkids", "mtime", "own_alloc", "own_apparent", "own_files", "own_shared")
+_FIEMAP_BATCH = 64
+_EXTENT_LAST   = 0x0001
+_EXTENT_SHARED = 0x2000
+_AGE_DAYS      = (1, 7, 30, 91, 182, 365, 730, 1825)
+_EXT_MAX_LEN   = 12
+_EXT_KEEP      = 256
+_EXT_OTHER     = "?"
+
+
+def read_mounts() -> frozenset[str]:
+    mounts: set[str] = set()
+    try:
+        with open("/proc/mounts", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                cols = line.split()
+                if len(cols) >= 2:
+                    mounts.add(os.path.realpath(cols[1]))
+    except OSError:
+        pass
+    return frozenset(mounts)
+
+
+def shared_bytes(path: str) -> int:
+    try:
+        fd = os.open(path, os.O_RDONLY | _O_NOATIME)
+    except PermissionError:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return 0
+    except OSError:
+        return 0
+    shared = 0
+    start = 0
+    try:
+        while True:
+            buf = bytearray(_FIEMAP_HDR.pack(start, 0xFFFFFFFFFFFFFFFF - start, 0, 0, _FIEMAP_BATCH, 0)
+                            + bytes(_FIEMAP_EXT.size * _FIEMAP_BATCH))
+            fcntl.ioctl(fd, _FS_IOC_FIEMAP, buf)
+            mapped = _FIEMAP_HDR.unpack_from(buf)[3]
+            if not mapped:
+                break
+            last = False
+            for k in range(mapped):
+                logical, _phys, length, _r1, _r2, flags, *_ = _FIEMAP_EXT.unpack_from(
+                    buf, _FIEMAP_HDR.size + k * _FIEMAP_EXT.size)
+                if flags & _EXTENT_SHARED:
+                    shared += length
+                start = logical + length
+                last = last or bool(flags & _EXTENT_LAST)
+            if last:
+                break
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+    return shared
+
+
+class _ReportPart:
+    __slots__ = ("ages", "exts", "top")
+
+    def __init__(self) -> None:
+        self.top: list[tuple[int, int, int, str]] = []
+        self.exts: dict[str, list[int]] = {}
+        self.ages = [[0, 0, 0, 0] for _ in range(len(_AGE_DAYS) + 1)]
+
+
+class ScanReport:
+    def __init__(self, k: int) -> None:
+        self.k = k
+        self._now = time.time()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._parts: list[_ReportPart] = []
+
+    def _part(self) -> _ReportPart:
+        part = getattr(self._local, "part", None)
+        if part is None:
+            part = self._local.part = _ReportPart()
+            with self._lock:
+                self._parts.append(part)
+        return part
+
+    def add(self, path: str, st: os.stat_result) -> None:
+        part = self._part()
+        item = (st.st_size, st.st_blocks * _BLOCK, int(st.st_mtime), path)
+        if len(part.top) < self.k:
+            heapq.heappush(part.top, item)
+        elif item > part.top[0]:
+            heapq.heapreplace(part.top, item)
+        ext = os.path.splitext(os.path.basename(path))[1].lower()
+        if len(ext) > _EXT_MAX_LEN:
+            ext = _EXT_OTHER
+        tot = part.exts.get(ext)
+        if tot is None:
+            if len(part.exts) >= 2 * _EXT_KEEP:
+                _fold_exts(part.exts, _EXT_KEEP)
+            tot = part.exts.setdefault(ext, [0, 0])
+        tot[0] += st.st_size
+        tot[1] += 1
+        m = part.ages[bisect_right(_AGE_DAYS, (self._now - st.st_mtime) / 86400)]
+        a = part.ages[bisect_right(_AGE_DAYS, (self._now - st.st_atime) / 86400)]
+        m[0] += st.st_size
+        m[1] += 1
+        a[2] += st.st_size
+        a[3] += 1
+
+    def snapshot(self) -> tuple[list[tuple[int, int, int, str]], list[tuple[str, int, int]], list[list[int]]]:
+        with self._lock:
+            parts = list(self._parts)
+        top = heapq.nlargest(self.k, (x for p in parts for x in list(p.top)))
+        exts: dict[str, list[int]] = {}
+        ages = [[0, 0, 0, 0] for _ in range(len(_AGE_DAYS) + 1)]
+        for p in parts:
+            for ext, (size, count) in dict(p.exts).items():
+                tot = exts.setdefault(ext, [0, 0])
+                tot[0] += size
+                tot[1] += count
+            for row, part_row in zip(ages, p.ages):
+                for j in range(4):
+                    row[j] += part_row[j]
+        _fold_exts(exts, _EXT_KEEP)
+        return top, sorted(((e, t[0], t[1]) for e, t in exts.items()), key=lambda x: -x[1]), ages
+
+
+def _fold_exts(exts: dict[str, list[int]], keep: int) -> None:
+    if len(exts) <= keep:
+        return
+    other = exts.pop(_EXT_OTHER, [0, 0])
+    for ext in sorted(exts, key=lambda e: exts[e][0])[:len(exts) - keep + 1]:
+        size, count = exts.pop(ext)
+        other[0] += size
+        other[1] += count
+    exts[_EXT_OTHER] = other
+
+
+class DirNode:
+    __slots__ = ("alloc", "apparent", "dirs", "files", "idx", "kids", "mtime", "own", "parent", "path", "pending",
+                 "shared")
+
+    def __init__(self, path: str, parent: "DirNode | None", idx: int = -1, mtime: int = -1) -> None:
+        self.path     = path
+        self.parent   = parent
+        self.idx      = idx
+        self.mtime    = mtime
+        self.alloc    = 0
+        self.apparent = 0
+        self.files    = 0
+        self.dirs     = 0
+        self.shared   = 0
+        self.pending  = 1
+        self.own      = (0, 0, 0, 0)
+        self.kids: list[DirNode] = []
+
+
+class ScanIndex:
+    def __init__(self, root: str, created: float, extents: bool, parent: array, first: array, nkids: array,
+                 mtime: array, own_alloc: array, own_apparent: array, own_files: array, own_shared: array,
+                 names: list[str]) -> None:
+        self.root         = root
+        self.created      = created
+        self.extents      = extents
+        self.parent       = parent
+        self.first        = first
+        self.nkids        = nkids
+        self.mtime        = mtime
+        self.own_alloc    = own_alloc
+        self.own_apparent = own_apparent
+        self.own_files    = own_files
+        self.own_shared   = own_shared
+        self.names        = names
+        self.alloc        = array("q", own_alloc)
+        self.apparent     = array("q", own_apparent)
+        self.files        = array("q", own_files)
+        self.shared       = array("q", own_shared)
+        self.dirs         = array("q", nkids)
+        for i in range(len(parent) - 1, 0, -1):
+            p = parent[i]
+            self.alloc[p]    += self.alloc[i]
+            self.apparent[p] += self.apparent[i]
+            self.files[p]    += self.files[i]
+            self.shared[p]   += self.shared[i]
+            self.dirs[p]     += self.dirs[i]
+
+    @classmethod
+    def build(cls, root: DirNode, extents: bool = False) -> "ScanIndex":
+        order = [root]
+        parent = array("q", [-1])
+        first  = array("q")
+        nkids  = array("q")
+        i = 0
+        while i < len(order):
+            node = order[i]
+            first.append(len(order))
+            nkids.append(len(node.kids))
+            order.extend(node.kids)
+            parent.extend([i] * len(node.kids))
+            i += 1
+        return cls(root.path, time.time(), extents, parent, first, nkids,
+                   array("q", (n.mtime for n in order)),
+                   *(array("q", (n.own[k] for n in order)) for k in range(4)),
+                   [""] + [os.path.basename(n.path) for n in order[1:]])
+
+    def __len__(self) -> int: return len(self.parent)
+
+    def kids(self, i: int) -> range:
+        return range(self.first[i], self.first[i] + self.nkids[i])
+
+    def path(self, i: int) -> str:
+        parts = []
+        while i > 0:
+            parts.append(self.names[i])
+            i = self.parent[i]
+        return os.path.join(self.root, *reversed(parts))
+
+    def find(self, path: str) -> "int | None":
+        rel = os.path.relpath(os.path.normpath(path), self.root)
+        if rel == os.curdir:
+            return 0
+        if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+            return None
+        i = 0
+        for name in rel.split(os.sep):
+            i = next((k for k in self.kids(i) if self.names[k] == name), -1)
+            if i < 0:
+                return None
+        return i
+
+    def save(self) -> None:
+        path = _index_path(self.root)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        head = {"v": _INDEX_VER, "root": self.root, "created": self.created, "extents": self.extents,
+                "n": len(self)}
+        try:
+            _INDEX_DIR.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(json.dumps(head).encode() + b"\n")
+                for name in _INDEX_ARRAYS:
+                    getattr(self, name).tofile(f)
+                f.write("\0".join(self.names).encode("utf-8", "surrogateescape"))
+            os.replace(tmp, path)
+        except OSError as exc:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            logger.debug("disk index %s not saved: %s", self.root, exc)
+            return
+        old = sorted(_INDEX_DIR.glob("*.idx"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for p in old[_INDEX_KEEP:]:
+            p.unlink(missing_ok=True)
+
+    @classmethod
+    def load(cls, root: str) -> "ScanIndex | None":
+        try:
+            with open(_index_path(root), "rb") as f:
+                head = json.loads(f.readline())
+                if head.get("v") != _INDEX_VER or head.get("root") != root:
+                    return None
+                n = int(head["n"])
+                arrays = []
+                for _name in _INDEX_ARRAYS:
+                    a = array("q")
+                    a.fromfile(f, n)
+                    arrays.append(a)
+                names = f.read().decode("utf-8", "surrogateescape").split("\0")
+        except (OSError, ValueError, KeyError, EOFError) as exc:
+            logger.debug("disk index %s not loaded: %s", root, exc)
+            return None
+        if len(names) != n:
+            return None
+        return cls(root, float(head.get("created", 0.0)), bool(head.get("extents")), *arrays, names)
+
+
+def _index_path(root: str) -> str:
+    return str(_INDEX_DIR / f"{hashlib.sha1(root.encode('utf-8', 'surrogateescape')).hexdigest()}.idx")
+
+
+def list_dir(index: ScanIndex, i: int, mounts: frozenset = frozenset()) -> list[tuple[str, int, bool, int, bool, int, int]]:
+    base = index.path(i)
+    known = {index.names[k]: k for k in index.kids(i)}
+    rows = [(os.path.join(base, name), index.alloc[k], True, index.files[k], False, index.apparent[k],
+             index.shared[k]) for name, k in known.items()]
+    try:
+        dev = os.lstat(base).st_dev
+        with os.scandir(base) as it:
+            for e in it:
+                try:
+                    if e.is_symlink():
+                        continue
+                    st = e.stat(follow_symlinks=False)
+                    if e.is_dir(follow_symlinks=False):
+                        if e.name not in known and (st.st_dev != dev or os.path.realpath(e.path) in mounts):
+                            rows.append((e.path, 0, True, 0, True, 0, 0))
+                        continue
+                except OSError:
+                    continue
+                shared = shared_bytes(e.path) if index.extents and st.st_blocks else 0
+                rows.append((e.path, st.st_blocks * _BLOCK, False, 1, False, st.st_size, shared))
+    except OSError as exc:
+        logger.debug("DiskScan list %s: %s", base, exc)
+    return rows
+
+
+class DiskScan:
+    def __init__(self, root: str, cancel: threading.Event, mounts: frozenset = frozenset(),
+                 prior: "ScanIndex | None" = None, prior_idx: int = 0, extents: bool = False,
+                 collect_min: int = -1, report: "ScanReport | None" = None, workers: int = _SCAN_WORKERS,
+                 retain: bool = True) -> None:
+        if prior is not None and prior.extents != extents:
+            prior = None
+        self.root    = DirNode(root, None, prior_idx if prior is not None else -1)
+        self._errors  = [0] * workers
+        self._scanned = [0] * workers
+        self._reused  = [0] * workers
+        self.extents = extents
+        self.collected: list[tuple[str, int, int, int, int]] = []
+        self._collect_min = collect_min
+        self._report = report
+        self._retain = retain
+        self._cancel = cancel
+        self._mounts = mounts
+        self._prior  = prior
+        self._links: dict[tuple[int, int], str] = {}
+        self._done: deque[DirNode] = deque()
+        self._queues: list[deque[DirNode]] = [deque() for _ in range(workers)]
+        self._cv = threading.Condition()
+        self._outstanding = 1
+        try:
+            st = os.lstat(root)
+            self._dev = st.st_dev
+            self.root.mtime    = st.st_mtime_ns
+            self.root.alloc    = st.st_blocks * _BLOCK
+            self.root.apparent = st.st_size
+        except OSError:
+            self._dev = -1
+        self._queues[0].append(self.root)
+        self._threads = [threading.Thread(target=self._work, args=(i,), name=f"disk-scan-{i}", daemon=True)
+                         for i in range(workers)]
+
+    @property
+    def errors(self) -> int: return sum(self._errors)
+
+    @property
+    def scanned(self) -> int: return sum(self._scanned)
+
+    @property
+    def reused(self) -> int: return sum(self._reused)
+
+    def start(self) -> None:
+        for t in self._threads:
+            t.start()
+
+    def wait(self, timeout: float) -> bool:
+        for t in self._threads:
+            if t.is_alive():
+                t.join(timeout)
+                return not any(t.is_alive() for t in self._threads)
+        return True
+
+    def drain(self) -> list[DirNode]:
+        out = []
+        while self._done:
+            out.append(self._done.popleft())
+        return out
+
+    def _take(self, i: int) -> "DirNode | None":
+        own = self._queues[i]
+        while not self._cancel.is_set():
+            try:
+                return own.pop()
+            except IndexError:
+                pass
+            for q in self._queues:
+                try:
+                    return q.popleft()
+                except IndexError:
+                    continue
+            with self._cv:
+                if self._outstanding == 0:
+                    return None
+                self._cv.wait(_IDLE_WAIT)
+        return None
+
+    def _work(self, i: int) -> None:
+        while True:
+            node = self._take(i)
+            if node is None:
+                with self._cv:
+                    self._cv.notify_all()
+                return
+            self._scan(i, node)
+
+    def _reuse(self, w: int, node: DirNode) -> "list[DirNode] | None":
+        prior = self._prior
+        if prior is None or node.idx < 0:
+            return None
+        i = node.idx
+        if node.mtime < 0:
+            try:
+                st = os.lstat(node.path)
+            except OSError:
+                return None
+            node.mtime    = st.st_mtime_ns
+            node.alloc    = st.st_blocks * _BLOCK
+            node.apparent = st.st_size
+        if node.mtime != prior.mtime[i]:
+            return None
+        node.alloc    = prior.own_alloc[i]
+        node.apparent = prior.own_apparent[i]
+        node.files    = prior.own_files[i]
+        node.shared   = prior.own_shared[i]
+        self._reused[w] += 1
+        return [DirNode(os.path.join(node.path, prior.names[k]), node, k) for k in prior.kids(i)]
+
+    def _read(self, w: int, node: DirNode) -> list[DirNode]:
+        children: list[DirNode] = []
+        prior = self._prior
+        known = {prior.names[k]: k for k in prior.kids(node.idx)} if prior is not None and node.idx >= 0 else {}
+        at_top = node is self.root
+        try:
+            with os.scandir(node.path) as it:
+                for e in it:
+                    if self._cancel.is_set():
+                        break
+                    try:
+                        st = e.stat(follow_symlinks=False)
+                        if e.is_dir(follow_symlinks=False):
+                            if st.st_dev != self._dev or (at_top and os.path.realpath(e.path) in self._mounts):
+                                continue
+                            child = DirNode(e.path, node, known.get(e.name, -1), st.st_mtime_ns)
+                            child.alloc    = st.st_blocks * _BLOCK
+                            child.apparent = st.st_size
+                            children.append(child)
+                            continue
+                    except OSError:
+                        self._errors[w] += 1
+                        continue
+                    node.files += 1
+                    if 0 <= self._collect_min <= st.st_size and e.is_file(follow_symlinks=False):
+                        self.collected.append((e.path, st.st_size, st.st_dev, st.st_ino, st.st_mtime_ns))
+                    if st.st_nlink > 1 and self._links.setdefault((st.st_dev, st.st_ino), e.path) != e.path:
+                        continue
+                    node.alloc    += st.st_blocks * _BLOCK
+                    node.apparent += st.st_size
+                    if self.extents and st.st_blocks and e.is_file(follow_symlinks=False):
+                        node.shared += shared_bytes(e.path)
+                    if self._report is not None and e.is_file(follow_symlinks=False):
+                        self._report.add(e.path, st)
+        except OSError as exc:
+            self._errors[w] += 1
+            logger.debug("DiskScan %s: %s", node.path, exc)
+        return children
+
+    def _scan(self, i: int, node: DirNode) -> None:
+        children = self._reuse(i, node)
+        if children is None:
+            children = self._read(i, node)
+        self._scanned[i] += 1
+        node.own  = (node.alloc, node.apparent, node.files, node.shared)
+        if self._retain:
+            node.kids = children
+        node.dirs = len(children)
+        finished: list[DirNode] = []
+        with self._cv:
+            node.pending += len(children) - 1
+            self._outstanding += len(children) - 1
+            self._queues[i].extend(children)
+            cur = node
+            while cur.pending == 0:
+                finished.append(cur)
+                parent = cur.parent
+                if parent is None:
+                    break
+                parent.alloc    += cur.alloc
+                parent.apparent += cur.apparent
+                parent.files    += cur.files
+                parent.shared   += cur.shared
+                parent.dirs     += cur.dirs
+                parent.pending  -= 1
+                cur = parent
+            if children or self._outstanding == 0:
+                self._cv.notify_all()
+        if self._retain:
+            self._done.extend(finished)
@@ -29,6 +29,7 @@ _session_managed_mounts: list[dict] = []
 _session_mounts_lock = threading.Lock()
 _OCTAL_ESCAPE_RE = re.compile(r"\\(\d{3})")
 _mounts_cache: tuple[float, list] = (0.0, [])
+_mount_fstypes: dict[str, str] = {}
 _mounts_cache_lock = threading.Lock()
 _MOUNT_TIMEOUT_S   = 15
 _UNMOUNT_TIMEOUT_S = 30
@@ -43,12 +44,15 @@ def get_mounts(max_age: float = 0.5) -> list[tuple[str, str]]:
         stale_ts = _mounts_cache[0]
 
     mounts: list[tuple[str, str]] = []
+    fstypes: dict[str, str] = {}
     try:
         with open("/proc/mounts", encoding="utf-8", errors="replace") as fh:
             for line in fh:
                 parts = line.split()
                 if len(parts) >= 2:
                     mounts.append((_decode_octal(parts[0]), _decode_octal(parts[1])))
+                    if len(parts) >= 3:
+                        fstypes[mounts[-1][1]] = parts[2]
     except OSError as e:
         logger.warning("get_mounts: /proc/mounts not available: %s", e)
         with _mounts_cache_lock:
@@ -57,9 +61,20 @@ def get_mounts(max_age: float = 0.5) -> list[tuple[str, str]]:
     with _mounts_cache_lock:
         if _mounts_cache[0] == stale_ts:
             _mounts_cache = (now, mounts)
+            _mount_fstypes.clear()
+            _mount_fstypes.update(fstypes)
         return _mounts_cache[1]
 
 
+def mount_of(path: str) -> tuple[str, str, str]:
+    real = os.path.realpath(path)
+    best = ("", "/", "")
+    for dev, mnt in get_mounts(max_age=5.0):
+        if _is_subpath(mnt, real) and len(mnt) >= len(best[1]):
+            best = (dev, mnt, _mount_fstypes.get(mnt, ""))
+    return best
+
+
 def _decode_octal(s: str) -> str:
     return _OCTAL_ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 8)), s)
 
@@ -301,7 +316,7 @@ def _clean_subprocess_env() -> dict:
 
 
 def build_rsync_cmd(src: str, dst: str, *, delete: bool = False, exclude: list[str] | None = None,
-                    dry_run: bool = False) -> list[str]:
+                    dry_run: bool = False, exclude_from: str | None = None, min_size: int = 0) -> list[str]:
     info = "progress2,del" if delete else "progress2"
     cmd = ["rsync", "-az", f"--info={info}", "-e", "ssh -o StrictHostKeyChecking=accept-new"]
     if delete:
@@ -310,6 +325,10 @@ def build_rsync_cmd(src: str, dst: str, *, delete: bool = False, exclude: list[s
         cmd.append("--dry-run")
     for ex in (exclude or []):
         cmd += [f"--exclude={ex}"]
+    if exclude_from:
+        cmd.append(f"--exclude-from={exclude_from}")
+    if min_size:
+        cmd.append(f"--min-size={min_size}")
     cmd += ["--", src, dst]
     return cmd
 
@@ -283,21 +283,92 @@ class AdvancedOptionsDialog(QDialog):
         max_row.addStretch(1)
         lay.addLayout(max_row)
 
+        lay.addWidget(sep())
+
+        self._pack_cb = QCheckBox(tr("Pack small files into bundles (SMB/SSH destinations)"))
+        self._pack_cb.setChecked(bool(self._opt.get("pack_small_files", False)))
+        apply_tooltip(
+            self._pack_cb,
+            tr("Files of 64 KB or less are streamed into compressed tar bundles "
+              "(zstd when available, gzip otherwise) together with an index, and only the bundles "
+              "are sent to the remote destination — one transfer instead of thousands.<br><br>"
+              "Unchanged files are not packed again; changed ones go into a new bundle.<br><br>"
+              "<i>Only applies to Backup with a local source and an SMB or SSH destination. "
+              "Restore unpacks the bundles automatically.</i>"),
+        )
+        lay.addWidget(self._pack_cb)
+        lay.addWidget(_note(tr("Speeds up remote backups of mail folders, dotfiles and other "
+                            "trees with many tiny files.")))
+
+        self._compress_cb = QCheckBox(tr("Store files compressed at the destination"))
+        self._compress_cb.setChecked(bool(self._opt.get("compress_destination", False)))
+        apply_tooltip(
+            self._compress_cb,
+            tr("Every file is compressed on the fly into its own <code>.bh.gz</code> file, or "
+              "<code>.bh.zst</code> (multithreaded zstd) for files of 1 MB and more when zstd is installed, "
+              "so single files can still be restored quickly. An index at the destination keeps "
+              "up-to-date checks fast without decompressing anything.<br><br>"
+              "Already-compressed formats (images, videos, archives…) are copied as they are.<br><br>"
+              "<i>Only applies to Backup to local or mounted destinations, and cannot be combined with "
+              "mirror mode. Restore decompresses the files automatically.</i>"),
+        )
+        lay.addWidget(self._compress_cb)
+        lay.addWidget(_note(tr("Saves space and transfer time for text-heavy entries such as "
+                            "configs, source trees and logs.")))
+
+        self._dedup_cb = QCheckBox(tr("Store as deduplicated chunk store"))
+        self._dedup_cb.setChecked(bool(self._opt.get("dedup_store", False)))
+        apply_tooltip(
+            self._dedup_cb,
+            tr("Files are split into content-defined chunks (about 1 MB on average) and each unique chunk "
+              "is stored only once, compressed. Every backup adds a small manifest, so many versions of "
+              "large, slowly-changing files such as VM images or mailboxes cost little extra space.<br><br>"
+              "\"Keep at most\" limits the number of manifests; chunks no longer referenced are removed "
+              "afterwards.<br><br>"
+              "<i>Only applies to Backup to local or mounted destinations, and cannot be combined with "
+              "mirror, versioned or compressed mode. Restore rebuilds the latest version automatically.</i>"),
+        )
+        lay.addWidget(self._dedup_cb)
+        lay.addWidget(_note(tr("Keeps a history of large files in far less space than versioned folders.")))
+
+        lay.addWidget(sep())
+
+        self._snapshot_cb = QCheckBox(tr("Copy from a filesystem snapshot"))
+        self._snapshot_cb.setChecked(bool(self._opt.get("snapshot_source", False)))
+        apply_tooltip(
+            self._snapshot_cb,
+            tr("Before copying, a read-only snapshot of the source is taken (Btrfs subvolume, ZFS dataset "
+              "or LVM volume), the files are copied from the snapshot and the snapshot is removed afterwards. "
+              "Databases, browser profiles and VM images are then captured in a consistent state without "
+              "closing any application, so their journal and WAL files are backed up too.<br><br>"
+              "<i>Needs root, or a sudo rule that allows the snapshot commands without a password. "
+              "If no snapshot can be taken, the live files are copied as before.</i>"),
+        )
+        lay.addWidget(self._snapshot_cb)
+        lay.addWidget(_note(tr("Consistent backups of data that is in use while the backup runs.")))
+
         lay.addWidget(sep())
         lay.addWidget(ok_cancel_buttons(self, self._accept))
 
         self._mirror_cb.toggled.connect(self._sync_exclusive)
         self._versioned_cb.toggled.connect(self._sync_exclusive)
+        self._compress_cb.toggled.connect(self._sync_exclusive)
+        self._dedup_cb.toggled.connect(self._sync_exclusive)
         self._sync_exclusive()
 
     def _sync_exclusive(self) -> None:
-        if self._mirror_cb.isChecked() and self._versioned_cb.isChecked():
-            if self.sender() is self._versioned_cb:
-                block_set(self._mirror_cb, False)
-            else:
-                block_set(self._versioned_cb, False)
+        conflicts = (
+            (self._mirror_cb, self._versioned_cb),
+            (self._mirror_cb, self._compress_cb),
+            (self._mirror_cb, self._dedup_cb),
+            (self._versioned_cb, self._dedup_cb),
+            (self._compress_cb, self._dedup_cb),
+        )
+        for a, b in conflicts:
+            if a.isChecked() and b.isChecked():
+                block_set(a if self.sender() is b else b, False)
         self._confirm_cb.setEnabled(self._mirror_cb.isChecked())
-        self._max_spin.setEnabled(self._versioned_cb.isChecked())
+        self._max_spin.setEnabled(self._versioned_cb.isChecked() or self._dedup_cb.isChecked())
 
     def _accept(self) -> None:
         self._opt = {
@@ -305,6 +376,10 @@ class AdvancedOptionsDialog(QDialog):
             "confirm_before_delete": self._confirm_cb.isChecked(),
             "versioned_archive":     self._versioned_cb.isChecked(),
             "max_versions":          self._max_spin.value(),
+            "pack_small_files":      self._pack_cb.isChecked(),
+            "compress_destination":  self._compress_cb.isChecked(),
+            "dedup_store":           self._dedup_cb.isChecked(),
+            "snapshot_source":       self._snapshot_cb.isChecked(),
         }
         if self._on_save is not None:
             try:
@@ -341,6 +416,10 @@ class EntryDialog(QDialog):
             "confirm_before_delete": bool(raw_details.get("confirm_before_delete", True)),
             "versioned_archive":     bool(raw_details.get("versioned_archive", False)),
             "max_versions":          int(raw_details.get("max_versions", 0) or 0),
+            "pack_small_files":      bool(raw_details.get("pack_small_files", False)),
+            "compress_destination":  bool(raw_details.get("compress_destination", False)),
+            "dedup_store":           bool(raw_details.get("dedup_store", False)),
+            "snapshot_source":       bool(raw_details.get("snapshot_source", False)),
         }
         t = current_theme()
         self._COL_ACTIVE_BG  = QColor(t["info"])
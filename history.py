@@ -1,6 +1,9 @@
 import csv
 import io
 import json
+import sqlite3
+import threading
+from contextlib import closing
 from datetime import datetime
 from pathlib import Path
 
@@ -11,72 +14,247 @@ from PyQt6.QtWidgets import (
     QMessageBox, QPushButton, QTextEdit, QVBoxLayout
 )
 
-from state import S, _LOG_HIST_DIR, _atomic_write, logger
+from copy_worker_core import _format_unit
+from state import S, _LOG_HIST_DIR, logger
 from themes import current_theme, font_sz, register_style_listener, unregister_style_listener
 from translations import tr, register_language_listener, unregister_language_listener
 from ui_utils import footer_bar_style, header_bar_style, _StandardKeysMixin, size_to_screen
 
 
+_METRIC_COLS: dict[str, str] = {
+    "bytes":       "INTEGER NOT NULL DEFAULT 0",
+    "scan_s":      "REAL    NOT NULL DEFAULT 0",
+    "copy_s":      "REAL    NOT NULL DEFAULT 0",
+    "local_bytes": "INTEGER NOT NULL DEFAULT 0",
+    "smb_bytes":   "INTEGER NOT NULL DEFAULT 0",
+    "ssh_bytes":   "INTEGER NOT NULL DEFAULT 0",
+    "dedup_bytes": "INTEGER NOT NULL DEFAULT 0",
+}
+_BACKENDS       = ("local", "smb", "ssh", "dedup")
+_HISTORY_FIELDS = ("timestamp", "operation", "copied", "skipped", "deleted", "errors", "duration_s", "cancelled",
+                   *_METRIC_COLS)
+_HISTORY_COLS   = ", ".join(_HISTORY_FIELDS)
+_DB_TIMEOUT     = 5.0
+_LIST_LIMIT     = 1000
+_INSERT_SQL     = (f"INSERT INTO runs (day, {_HISTORY_COLS}) "
+                   f"VALUES ({', '.join('?' * (len(_HISTORY_FIELDS) + 1))})")
+
+
 def _history_path(profile_name: str) -> Path:
     return _LOG_HIST_DIR / f"{profile_name}.history.json"
 
 
-_MAX_HISTORY_ENTRIES = 500
+def _history_db_path(profile_name: str) -> Path:
+    return _LOG_HIST_DIR / f"{profile_name}.history.sqlite3"
+
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS runs ("
+    "  id         INTEGER PRIMARY KEY AUTOINCREMENT,"
+    "  timestamp  TEXT    NOT NULL,"
+    "  day        TEXT    NOT NULL,"
+    "  operation  TEXT    NOT NULL,"
+    "  copied     INTEGER NOT NULL DEFAULT 0,"
+    "  skipped    INTEGER NOT NULL DEFAULT 0,"
+    "  deleted    INTEGER NOT NULL DEFAULT 0,"
+    "  errors     INTEGER NOT NULL DEFAULT 0,"
+    "  duration_s INTEGER NOT NULL DEFAULT 0,"
+    "  cancelled  INTEGER NOT NULL DEFAULT 0"
+    + "".join(f", {col} {decl}" for col, decl in _METRIC_COLS.items()) + ")",
+    "CREATE INDEX IF NOT EXISTS runs_timestamp ON runs (timestamp)",
+    "CREATE INDEX IF NOT EXISTS runs_operation ON runs (operation, timestamp)",
+)
+
+_db_lock = threading.Lock()
+_db_ready: set[str] = set()
+
+
+def _norm_ts(ts) -> str:
+    ts = str(ts or "").replace("T", " ")[:19]
+    try:
+        datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
+        return ts
+    except ValueError:
+        return ""
+
+
+def _row_values(e: dict) -> tuple | None:
+    ts = _norm_ts(e.get("timestamp"))
+    if not ts:
+        return None
+    try:
+        return (ts[:10], ts, str(e.get("operation", "")),
+                int(e.get("copied", 0) or 0), int(e.get("skipped", 0) or 0), int(e.get("deleted", 0) or 0),
+                int(e.get("errors", 0) or 0), int(e.get("duration_s", 0) or 0), int(bool(e.get("cancelled"))),
+                int(e.get("bytes", 0) or 0), float(e.get("scan_s", 0) or 0), float(e.get("copy_s", 0) or 0),
+                *(int(e.get(f"{b}_bytes", 0) or 0) for b in _BACKENDS))
+    except (TypeError, ValueError):
+        return None
+
+
+def _migrate_json(conn: sqlite3.Connection, profile_name: str) -> None:
+    path = _history_path(profile_name)
+    if not path.exists() or conn.execute("SELECT 1 FROM runs LIMIT 1").fetchone():
+        return
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError) as exc:
+        logger.warning("history: could not read legacy history '%s': %s", path, exc)
+        return
+    rows = [v for e in (data if isinstance(data, list) else []) if isinstance(e, dict) and (v := _row_values(e))]
+    with conn:
+        conn.executemany(_INSERT_SQL, rows)
+    try:
+        path.replace(path.with_suffix(".json.migrated"))
+    except OSError as exc:
+        logger.warning("history: could not rename legacy history '%s': %s", path, exc)
+    logger.info("history: migrated %d run(s) of profile '%s' to SQLite", len(rows), profile_name)
+
+
+def _connect(profile_name: str) -> sqlite3.Connection:
+    path = _history_db_path(profile_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=_DB_TIMEOUT)
+    conn.row_factory = sqlite3.Row
+    key = str(path)
+    with _db_lock:
+        if key not in _db_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                for stmt in _SCHEMA:
+                    conn.execute(stmt)
+                have = {r["name"] for r in conn.execute("PRAGMA table_info(runs)")}
+                for col, decl in _METRIC_COLS.items():
+                    if col not in have:
+                        conn.execute(f"ALTER TABLE runs ADD COLUMN {col} {decl}")
+            _migrate_json(conn, profile_name)
+            _db_ready.add(key)
+    return conn
+
+
+def _since_clause(since: datetime | None) -> tuple[str, tuple]:
+    if since is None:
+        return "", ()
+    return " WHERE timestamp >= ?", (since.strftime("%Y-%m-%d %H:%M:%S"),)
+
+
+def _as_entry(row: sqlite3.Row) -> dict:
+    e = {k: row[k] for k in _HISTORY_FIELDS}
+    e["cancelled"] = bool(e["cancelled"])
+    return e
+
+
+def _query(profile_name: str, sql: str, params: tuple = ()) -> list[sqlite3.Row]:
+    if not profile_name:
+        return []
+    try:
+        with closing(_connect(profile_name)) as conn:
+            return conn.execute(sql, params).fetchall()
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning("history: query failed for '%s': %s", profile_name, exc)
+        return []
 
 
 def append_history(operation: str, copied: int, skipped: int, errors: int, duration_s: int, cancelled: bool,
-                   deleted: int = 0) -> None:
+                   deleted: int = 0, metrics: dict | None = None) -> None:
     name = S.profile_name
     if not name:
         return
-    path = _history_path(name)
+    metrics  = metrics or {}
+    backends = metrics.get("backends") or {}
+    values = _row_values({"timestamp":  datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                          "operation":  operation,
+                          "copied":     copied,
+                          "skipped":    skipped,
+                          "deleted":    deleted,
+                          "errors":     errors,
+                          "duration_s": duration_s,
+                          "cancelled":  cancelled,
+                          "bytes":      metrics.get("bytes", 0),
+                          "scan_s":     metrics.get("scan_s", 0),
+                          "copy_s":     metrics.get("copy_s", 0),
+                          **{f"{b}_bytes": (backends.get(b) or (0, 0))[1] for b in _BACKENDS}})
     try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        existing: list = []
-        if path.exists():
-            try:
-                existing = json.loads(path.read_text(encoding="utf-8"))
-                if not isinstance(existing, list):
-                    existing = []
-            except (json.JSONDecodeError, OSError):
-                existing = []
-        entry = {"timestamp":  datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                 "operation":  operation,
-                 "copied":     copied,
-                 "skipped":    skipped,
-                 "deleted":    deleted,
-                 "errors":     errors,
-                 "duration_s": duration_s,
-                 "cancelled":  cancelled}
-        existing.append(entry)
-        if len(existing) > _MAX_HISTORY_ENTRIES:
-            existing = existing[-_MAX_HISTORY_ENTRIES:]
-        _atomic_write(path, existing)
-    except (OSError, PermissionError) as exc:
+        with closing(_connect(name)) as conn, conn:
+            conn.execute(_INSERT_SQL, values)
+    except (sqlite3.Error, OSError) as exc:
         logger.warning("append_history: could not write history for '%s': %s", name, exc)
 
 
-def load_history(profile_name: str) -> list[dict]:
-    path = _history_path(profile_name)
-    if not path.exists():
-        return []
+def load_history(profile_name: str, since: datetime | None = None, limit: int = 0) -> list[dict]:
+    where, params = _since_clause(since)
+    if limit > 0:
+        rows = _query(profile_name, f"SELECT * FROM (SELECT {_HISTORY_COLS}, id FROM runs{where} "
+                                    f"ORDER BY timestamp DESC, id DESC LIMIT ?) ORDER BY timestamp, id",
+                      (*params, limit))
+    else:
+        rows = _query(profile_name, f"SELECT {_HISTORY_COLS} FROM runs{where} ORDER BY timestamp, id", params)
+    return [_as_entry(r) for r in rows]
+
+
+def last_history_entry(profile_name: str) -> dict | None:
+    entries = load_history(profile_name, limit=1)
+    return entries[0] if entries else None
+
+
+def history_totals(profile_name: str, since: datetime | None = None) -> dict:
+    where, params = _since_clause(since)
+    rows = _query(profile_name,
+                  "SELECT COUNT(*) AS runs,"
+                  " COALESCE(SUM(errors = 0 AND cancelled = 0), 0) AS successful,"
+                  " COALESCE(SUM(errors > 0), 0) AS failed,"
+                  " COALESCE(SUM(cancelled), 0) AS cancelled,"
+                  " COALESCE(SUM(copied), 0) AS copied,"
+                  " COALESCE(SUM(skipped), 0) AS skipped,"
+                  " COALESCE(SUM(deleted), 0) AS deleted,"
+                  " COALESCE(SUM(errors), 0) AS errors,"
+                  " COALESCE(SUM(duration_s), 0) AS duration_s,"
+                  " COALESCE(SUM(bytes), 0) AS bytes,"
+                  " COALESCE(SUM(CASE WHEN bytes > 0 THEN copy_s END), 0) AS copy_s,"
+                  " COALESCE(SUM(scan_s), 0) AS scan_s"
+                  + "".join(f", COALESCE(SUM({b}_bytes), 0) AS {b}_bytes" for b in _BACKENDS)
+                  + f" FROM runs{where}", params)
+    if not rows:
+        return {"runs": 0, "successful": 0, "failed": 0, "cancelled": 0, "copied": 0, "skipped": 0,
+                "deleted": 0, "errors": 0, "duration_s": 0, "bytes": 0, "copy_s": 0, "scan_s": 0,
+                **{f"{b}_bytes": 0 for b in _BACKENDS}}
+    return dict(rows[0])
+
+
+def history_by_day(profile_name: str, since: datetime | None = None) -> list[dict]:
+    where, params = _since_clause(since)
+    rows = _query(profile_name,
+                  f"SELECT day, SUM(copied) AS copied, COUNT(*) AS runs, SUM(errors > 0) AS errors,"
+                  f" SUM(bytes) AS bytes, SUM(CASE WHEN bytes > 0 THEN copy_s ELSE 0 END) AS copy_s,"
+                  f" SUM(scan_s) AS scan_s"
+                  f" FROM runs{where} GROUP BY day ORDER BY day", params)
+    return [dict(r) for r in rows]
+
+
+def history_by_operation(profile_name: str, since: datetime | None = None) -> list[tuple[str, int]]:
+    where, params = _since_clause(since)
+    rows = _query(profile_name,
+                  f"SELECT operation, COUNT(*) AS runs FROM runs{where} GROUP BY operation ORDER BY runs DESC",
+                  params)
+    return [(r["operation"], r["runs"]) for r in rows]
+
+
+def clear_history(profile_name: str) -> None:
+    if not profile_name:
+        return
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-        return data if isinstance(data, list) else []
-    except (json.JSONDecodeError, OSError):
-        return []
+        with closing(_connect(profile_name)) as conn, conn:
+            conn.execute("DELETE FROM runs")
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning("clear_history: could not clear history for '%s': %s", profile_name, exc)
 
 
 def export_history_csv(profile_name: str) -> str:
     entries = load_history(profile_name)
     out = io.StringIO()
-    writer = csv.DictWriter(
-        out,
-        fieldnames=["timestamp", "operation", "copied", "skipped", "deleted", "errors", "duration_s", "cancelled"],
-        extrasaction="ignore",
-    )
+    writer = csv.DictWriter(out, fieldnames=list(_HISTORY_FIELDS), extrasaction="ignore")
     writer.writeheader()
-    writer.writerows({"deleted": 0, **e} for e in entries)
+    writer.writerows(entries)
     return out.getvalue()
 
 
@@ -90,6 +268,10 @@ def _fmt_duration(s: int) -> str:
     m = (s % 3600) // 60
     return f"{h}h {m:02d}m {s % 60:02d}s"
 
+def _fmt_rate(n_bytes: float, secs: float) -> str:
+    return f"{_format_unit(n_bytes / secs)}/s" if n_bytes > 0 and secs > 0 else "—"
+
+
 def _op_classify(op: str) -> tuple[bool, bool]:
     lo = op.lower()
     is_restore = "restore" in lo
@@ -105,6 +287,9 @@ def _entry_detail_html(e: dict, t: dict) -> str:
     errors  = e.get("errors",    0)
     dur     = _fmt_duration(e.get("duration_s", 0))
     can     = e.get("cancelled", False)
+    moved   = e.get("bytes", 0) or 0
+    copy_s  = e.get("copy_s", 0) or 0
+    scan_s  = e.get("scan_s", 0) or 0
 
     ok_col = t["success"]
     sk_col = t["warning"]
@@ -131,6 +316,17 @@ def _entry_detail_html(e: dict, t: dict) -> str:
     op_label = tr("Backup created") if is_backup else (tr("Restored from backup") if is_restore else op)
     op_icon  = "⤵" if is_backup else ("⤴" if is_restore else "▶")
 
+    perf_rows = ""
+    if moved or copy_s:
+        backends = " · ".join(f"{b.upper()} {_format_unit(e.get(f'{b}_bytes', 0))}"
+                              for b in _BACKENDS if e.get(f"{b}_bytes"))
+        files_s  = f"{copied / copy_s:,.1f}" if copy_s > 0 else "—"
+        perf_rows = (f"{row(tr('Data moved'), _format_unit(moved))}"
+                     f"{row(tr('Throughput'), f'{_fmt_rate(moved, copy_s)}  ·  {files_s} files/s')}"
+                     f"{row(tr('Scan time'), f'{scan_s:.1f}s')}"
+                     f"{row(tr('Copy time'), f'{copy_s:.1f}s')}"
+                     + (row(tr("Per backend"), backends) if backends else ""))
+
     return (f"<div style='font-family:monospace;padding:4px;'>"
             f"<div style='font-size:{font_sz(4)}px;font-weight:bold;color:{acc};"
             f"padding:4px 0 14px 0;border-bottom:1px solid {sep};margin-bottom:14px;'>"
@@ -142,6 +338,7 @@ def _entry_detail_html(e: dict, t: dict) -> str:
             f"{row(tr('Deleted'),   f'{deleted:,}', de_col if deleted > 0 else dim)}"
             f"{row(tr('Errors'),    f'{errors:,}',  err_color)}"
             f"{row(tr('Duration'),  dur)}"
+            f"{perf_rows}"
             f"<tr>"
             f"<td style='color:{dim};padding:6px 20px 6px 0;font-size:{fs_sm}px;'>{tr('Cancelled')}</td>"
             f"<td style='padding:6px 0;'>{can_html}</td>"
@@ -302,7 +499,7 @@ class HistoryDialog(_StandardKeysMixin, QDialog):
     def _load(self) -> None:
         name = S.profile_name or tr("(no profile)")
         self._profile_lbl.setText(tr("Profile:  {name}", name=name))
-        self._entries = load_history(S.profile_name or "")
+        self._entries = load_history(S.profile_name or "", limit=_LIST_LIMIT)
         self._list.clear()
         self._detail.clear()
         t   = current_theme()
@@ -351,11 +548,12 @@ class HistoryDialog(_StandardKeysMixin, QDialog):
 
             self._list.addItem(item)
 
-        n = len(self._entries)
-        total_copied  = sum(e.get("copied",     0) for e in self._entries)
-        total_deleted = sum(e.get("deleted",    0) for e in self._entries)
-        total_errors  = sum(e.get("errors",     0) for e in self._entries)
-        total_dur     = sum(e.get("duration_s", 0) for e in self._entries)
+        totals = history_totals(S.profile_name or "")
+        n = totals["runs"]
+        total_copied  = totals["copied"]
+        total_deleted = totals["deleted"]
+        total_errors  = totals["errors"]
+        total_dur     = totals["duration_s"]
         del_part = tr("{n:,} files deleted  ·  ", n=total_deleted) if total_deleted else ""
         runs_word = tr("runs") if n != 1 else tr("run")
         self._count_lbl.setText(
@@ -382,11 +580,7 @@ class HistoryDialog(_StandardKeysMixin, QDialog):
         )
         if ans != QMessageBox.StandardButton.Yes:
             return
-        path = _history_path(name)
-        try:
-            path.unlink(missing_ok=True)
-        except OSError:
-            pass
+        clear_history(name)
         self._load()
 
     def _export_history(self) -> None:
@@ -406,7 +600,7 @@ class HistoryDialog(_StandardKeysMixin, QDialog):
             Path(path).write_text(csv_data, encoding="utf-8")
             QMessageBox.information(
                 self, tr("Export complete"),
-                tr("{n} Entries exported to:\n{path}", n=len(self._entries), path=path)
+                tr("{n} Entries exported to:\n{path}", n=history_totals(S.profile_name or "")["runs"], path=path)
             )
         except OSError as exc:
             QMessageBox.critical(self, tr("Export failed"), tr("The file could not be written:\n{err}", err=exc))
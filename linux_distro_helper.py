@@ -1,9 +1,13 @@
 import concurrent.futures
+import glob
 import os
 import re
 import shlex
 import shutil
 import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable
 
@@ -11,7 +15,8 @@ from constants import USER_SHELLS, ARCH_KERNEL_VARIANTS, PKG_NAME_RE
 from state import logger
 from translations import tr
 
-__all__ = ["ARCH_KERNEL_VARIANTS", "SESSIONS", "USER_SHELLS", "LinuxDistroHelper", "distro_family", "is_valid_pkg_name"]
+__all__ = ["ARCH_KERNEL_VARIANTS", "SESSIONS", "USER_SHELLS", "LinuxDistroHelper", "PackageSnapshot", "distro_family",
+           "is_valid_pkg_name", "warm_package_snapshot"]
 
 _MIN_PARALLEL = 5
 
@@ -89,9 +94,148 @@ def _solus_check(p: str) -> list[str]:
     return ["sh", "-c", "eopkg list-installed -N 2>/dev/null | grep -qxF -- " + shlex.quote(p)]
 
 
+_GENTOO_VER = re.compile(r"-\d+(\.\d+)*[a-z]?(_(alpha|beta|pre|rc|p)\d*)*(-r\d+)?$")
+
+
+def _listdir(path: str) -> list[str]:
+    try:
+        return os.listdir(path)
+    except OSError:
+        return []
+
+
+def _arch_provides(entry: str) -> list[str]:
+    try:
+        with open(os.path.join("/var/lib/pacman/local", entry, "desc"), encoding="utf-8", errors="replace") as fh:
+            _, sep, rest = fh.read().partition("%PROVIDES%\n")
+    except OSError:
+        return []
+    return [line.partition("=")[0] for line in rest.split("\n\n", 1)[0].splitlines() if line] if sep else []
+
+
+def _arch_installed() -> dict[str, str]:
+    entries = [d for d in _listdir("/var/lib/pacman/local") if d.count("-") >= 2]
+    versions = {name: f"{ver}-{rel}" for d in entries for name, ver, rel in [d.rsplit("-", 2)]}
+    for d in entries:
+        name, ver, rel = d.rsplit("-", 2)
+        for provided in _arch_provides(d):
+            versions.setdefault(provided, f"{ver}-{rel}")
+    return versions
+
+
+def _debian_installed() -> dict[str, str]:
+    versions: dict[str, str] = {}
+    fields: dict[str, str] = {}
+    try:
+        with open("/var/lib/dpkg/status", encoding="utf-8", errors="replace") as fh:
+            for line in fh:
+                if line.strip():
+                    key, sep, val = line.partition(": ")
+                    if sep and not line[0].isspace():
+                        fields[key] = val.strip()
+                    continue
+                if fields.get("Status", "").split() == ["install", "ok", "installed"] and "Package" in fields:
+                    versions[fields["Package"]] = fields.get("Version", "")
+                fields = {}
+        if fields.get("Status", "").split() == ["install", "ok", "installed"] and "Package" in fields:
+            versions[fields["Package"]] = fields.get("Version", "")
+    except OSError as exc:
+        logger.warning("dpkg status: %s", exc)
+    return versions
+
+
+def _rpm_installed() -> dict[str, str]:
+    versions: dict[str, str] = {}
+    for line in _run_capture(["rpm", "-qa", "--qf", "%{NAME} %{VERSION}-%{RELEASE} %{ARCH}\\n"]):
+        parts = line.split()
+        if len(parts) == 3:
+            name, ver, arch = parts
+            versions[name] = versions[f"{name}-{ver}"] = versions[f"{name}-{ver}.{arch}"] = ver
+    return versions
+
+
+def _void_installed() -> dict[str, str]:
+    return {name: ver for line in _run_capture(["xbps-query", "-l"]) if len(parts := line.split()) >= 2
+            for name, _, ver in [parts[1].rpartition("-")]}
+
+
+def _gentoo_installed() -> dict[str, str]:
+    versions: dict[str, str] = {}
+    for cat in _listdir("/var/db/pkg"):
+        for d in _listdir(f"/var/db/pkg/{cat}"):
+            m = _GENTOO_VER.search(d)
+            if m:
+                versions[d[:m.start()]] = versions[f"{cat}/{d[:m.start()]}"] = m.group()[1:]
+    return versions
+
+
+def _alpine_installed() -> dict[str, str]:
+    versions: dict[str, str] = {}
+    name = ""
+    try:
+        with open("/lib/apk/db/installed", encoding="utf-8", errors="replace") as fh:
+            for line in fh:
+                if line.startswith("P:"):
+                    name = line[2:].strip()
+                    versions[name] = ""
+                elif line.startswith("V:") and name:
+                    versions[name] = line[2:].strip()
+    except OSError as exc:
+        logger.warning("apk db: %s", exc)
+    return versions
+
+
+def _slackware_installed() -> dict[str, str]:
+    return {name: ver for d in _listdir("/var/log/packages") if d.count("-") >= 3
+            for name, ver, _arch, _build in [d.rsplit("-", 3)]}
+
+
+def _nixos_installed() -> dict[str, str]:
+    versions: dict[str, str] = {}
+    for line in _run_capture(["nix-env", "-q", "--installed"]):
+        m = _VER_PKG.search(line)
+        versions[line[:m.start()] if m else line] = m.group()[1:] if m else ""
+    return versions
+
+
+def _arch_available() -> set[str]:
+    return set(_run_capture(["pacman", "-Slq"])) | {line.split()[0] for line in _run_capture(["pacman", "-Sg"])}
+
+
+def _db_stamp(paths: tuple[str, ...]) -> tuple:
+    stamp = []
+    for pattern in paths:
+        for p in sorted(glob.glob(pattern)) if "*" in pattern else [os.path.expanduser(pattern)]:
+            try:
+                stamp.append((os.path.realpath(p), os.stat(p).st_mtime_ns))
+            except OSError:
+                continue
+    return tuple(stamp)
+
+
+@dataclass
+class PackageSnapshot:
+    stamp: tuple
+    versions: dict[str, str]
+    installed: frozenset[str] = field(init=False)
+    explicit: tuple[list[str], list[str]] | None = None
+
+    def __post_init__(self) -> None:
+        self.installed = frozenset(self.versions)
+
+
+_snapshot_lock = threading.Lock()
+_explicit_lock = threading.Lock()
+_snapshots: dict[str, PackageSnapshot] = {}
+
+
 _PKG: dict[str, dict[str, Any]] = {
     "arch": {
         "check": lambda p: ["pacman", "-Qi", p],
+        "installed": _arch_installed,
+        "db": ("/var/lib/pacman/local",),
+        "available": _arch_available,
+        "probe": lambda p: ["pacman", "-Sp", "--print-format", "%n", p],
         "install": "sudo pacman -S --needed --noconfirm {p}",
         "update": "sudo pacman -Syu --noconfirm",
         "remove": "sudo pacman -Rns --noconfirm {p}",
@@ -102,6 +246,10 @@ _PKG: dict[str, dict[str, Any]] = {
     },
     "debian": {
         "check": lambda p: ["sh", "-c", f"dpkg-query -W -f='${{Status}}' {shlex.quote(p)} 2>/dev/null | grep -q '^install ok installed$'"],
+        "installed": _debian_installed,
+        "db": ("/var/lib/dpkg/status", "/var/lib/apt/extended_states"),
+        "available": lambda: set(_run_capture(["apt-cache", "pkgnames"])),
+        "probe": lambda p: ["apt-get", "-s", "-qq", "install", p],
         "install": "sudo env DEBIAN_FRONTEND=noninteractive apt-get install -yq -o Dpkg::Options::='--force-confdef' -o Dpkg::Options::='--force-confold' {p}",
         "update": "sudo env DEBIAN_FRONTEND=noninteractive apt-get update && sudo env DEBIAN_FRONTEND=noninteractive apt-get upgrade -yq -o Dpkg::Options::='--force-confdef' -o Dpkg::Options::='--force-confold'",
         "remove": "sudo env DEBIAN_FRONTEND=noninteractive apt-get autoremove -yq {p}",
@@ -112,6 +260,10 @@ _PKG: dict[str, dict[str, Any]] = {
     },
     "fedora": {
         "check": lambda p: ["rpm", "-q", p],
+        "installed": _rpm_installed,
+        "db": ("/var/lib/rpm/*", "/usr/lib/sysimage/rpm/*"),
+        "available": lambda: set(_run_capture(["dnf", "-q", "repoquery", "--qf", "%{name}\\n"], timeout=120)),
+        "probe": lambda p: ["dnf", "-q", "repoquery", "--whatprovides", p],
         "install": "sudo dnf install -y {p}",
         "update": "sudo dnf upgrade -y",
         "remove": "sudo dnf remove -y {p}",
@@ -122,6 +274,10 @@ _PKG: dict[str, dict[str, Any]] = {
     },
     "suse": {
         "check": lambda p: ["rpm", "-q", p],
+        "installed": _rpm_installed,
+        "db": ("/var/lib/rpm/*", "/usr/lib/sysimage/rpm/*"),
+        "available": None,
+        "probe": None,
         "install": "sudo zypper --non-interactive install -y {p}",
         "update": "sudo zypper --non-interactive update -y",
         "remove": "sudo zypper --non-interactive remove -y {p}",
@@ -132,6 +288,10 @@ _PKG: dict[str, dict[str, Any]] = {
     },
     "void": {
         "check": lambda p: ["xbps-query", p],
+        "installed": _void_installed,
+        "db": ("/var/db/xbps/pkgdb-*.plist",),
+        "available": None,
+        "probe": None,
         "install": "sudo xbps-install -y {p}",
         "update": "sudo xbps-install -Su",
         "remove": "sudo xbps-remove -y {p}",
@@ -142,6 +302,10 @@ _PKG: dict[str, dict[str, Any]] = {
     },
     "gentoo": {
         "check": lambda p: ["qlist", "-Ie", p],
+        "installed": _gentoo_installed,
+        "db": ("/var/db/pkg", "/var/db/pkg/*"),
+        "available": None,
+        "probe": None,
         "install": "sudo emerge --ask=n {p}",
         "update": "sudo emerge --sync && sudo emerge -uDU @world",
         "remove": "sudo emerge --depclean {p}",
@@ -152,6 +316,10 @@ _PKG: dict[str, dict[str, Any]] = {
     },
     "nixos": {
         "check": _nixos_check,
+        "installed": _nixos_installed,
+        "db": ("~/.nix-profile",),
+        "available": None,
+        "probe": None,
         "install": "nix-env -iA nixpkgs.{p}",
         "update": "sudo nixos-rebuild switch --upgrade",
         "remove": "nix-env -e {p}",
@@ -162,6 +330,10 @@ _PKG: dict[str, dict[str, Any]] = {
     },
     "alpine": {
         "check": lambda p: ["apk", "info", "-e", p],
+        "installed": _alpine_installed,
+        "db": ("/lib/apk/db/installed",),
+        "available": None,
+        "probe": None,
         "install": "sudo apk add {p}",
         "update": "sudo apk update && sudo apk upgrade",
         "remove": "sudo apk del {p}",
@@ -172,6 +344,10 @@ _PKG: dict[str, dict[str, Any]] = {
     },
     "slackware": {
         "check": _slackware_check,
+        "installed": _slackware_installed,
+        "db": ("/var/log/packages",),
+        "available": None,
+        "probe": None,
         "install": "sudo installpkg {p}",
         "update": "sudo slackpkg update && sudo slackpkg upgrade-all",
         "remove": "sudo removepkg {p}",
@@ -182,6 +358,10 @@ _PKG: dict[str, dict[str, Any]] = {
     },
     "solus": {
         "check": _solus_check,
+        "installed": lambda: dict.fromkeys(_run_capture(["eopkg", "list-installed", "-N"]), ""),
+        "db": ("/var/lib/eopkg/package",),
+        "available": None,
+        "probe": None,
         "install": "sudo eopkg install {p}",
         "update": "sudo eopkg upgrade",
         "remove": "sudo eopkg remove {p}",
@@ -192,6 +372,10 @@ _PKG: dict[str, dict[str, Any]] = {
     },
     "unknown": {
         "check": lambda p: ["which", p],
+        "installed": None,
+        "db": (),
+        "available": None,
+        "probe": None,
         "install": "echo 'No package manager detected: {p}'",
         "update": "echo 'Update not available'",
         "remove": "echo 'Remove not available: {p}'",
@@ -369,6 +553,10 @@ class LinuxDistroHelper:
             logger.warning("Unknown distro '%s', using generic commands.", self.distro_id)
 
         self._check_fn: Callable[[str], list[str]] = cfg["check"]
+        self._installed_fn: Callable[[], dict[str, str]] | None = cfg["installed"]
+        self._db_paths: tuple[str, ...] = cfg["db"]
+        self._available_fn: Callable[[], set[str]] | None = cfg["available"]
+        self._probe_fn: Callable[[str], list[str]] | None = cfg["probe"]
         self._install: str = cfg["install"]
         self._update: str = cfg["update"]
         self._remove: str = cfg["remove"]
@@ -385,9 +573,35 @@ class LinuxDistroHelper:
     def valid(name: str) -> bool:
         return is_valid_pkg_name(name)
 
+    def package_snapshot(self) -> PackageSnapshot | None:
+        if self._installed_fn is None:
+            return None
+        stamp = _db_stamp(self._db_paths)
+        if not stamp:
+            return None
+        with _snapshot_lock:
+            snap = _snapshots.get(self._family)
+            if snap is not None and snap.stamp == stamp:
+                return snap if snap.versions else None
+            t0 = time.monotonic()
+            versions = self._installed_fn()
+            snap = _snapshots[self._family] = PackageSnapshot(stamp, versions or {})
+            if not versions:
+                logger.warning("installed package query returned nothing; checking packages one by one")
+                return None
+        logger.debug("package snapshot: %d names in %.2fs", len(versions), time.monotonic() - t0)
+        return snap
+
+    def installed_packages(self) -> frozenset[str] | None:
+        snap = self.package_snapshot()
+        return snap.installed if snap is not None else None
+
     def package_is_installed(self, pkg: str) -> bool:
         if not self.valid(pkg):
             return False
+        installed = self.installed_packages()
+        if installed is not None:
+            return pkg.strip() in installed
         try:
             r = subprocess.run(self._check_fn(pkg.strip()), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
                                timeout=10, check=False)
@@ -400,10 +614,24 @@ class LinuxDistroHelper:
         valid = [p.strip() for p in packages if self.valid(p)]
         if not valid:
             return []
+        installed = self.installed_packages()
+        if installed is not None:
+            return [p for p in valid if p not in installed]
         if len(valid) < _MIN_PARALLEL:
             return [p for p in valid if not self.package_is_installed(p)]
         return self._parallel_check(valid)
 
+    def filter_unavailable(self, packages: list[str]) -> list[str]:
+        if self._available_fn is None or not packages:
+            return []
+        names = self._available_fn()
+        if not names:
+            return []
+        misses = [p for p in packages if p not in names]
+        if not misses or self._probe_fn is None:
+            return misses
+        return [p for p in misses if not _run_capture(self._probe_fn(p))]
+
     def _parallel_check(self, packages: list[str]) -> list[str]:
         workers = min(4, len(packages))
         adaptive_timeout = max(15, len(packages) * 2)
@@ -536,6 +764,16 @@ class LinuxDistroHelper:
         return self._kernel_pkg
 
     def get_explicitly_installed_packages(self) -> tuple[list[str], list[str]]:
+        snap = self.package_snapshot()
+        if snap is None:
+            return self._query_explicit()
+        with _explicit_lock:
+            if snap.explicit is None:
+                snap.explicit = self._query_explicit()
+        basic, aur = snap.explicit
+        return list(basic), list(aur)
+
+    def _query_explicit(self) -> tuple[list[str], list[str]]:
         fam = self.family()
 
         if fam == "arch":
@@ -934,3 +1172,12 @@ class LinuxDistroHelper:
                 pass
 
         return found or LinuxDistroHelper.detect_running_kernel_variant()
+
+
+def warm_package_snapshot() -> None:
+    def _warm() -> None:
+        try:
+            LinuxDistroHelper().get_explicitly_installed_packages()
+        except Exception as exc:
+            logger.debug("package snapshot warm-up: %s", exc)
+    threading.Thread(target=_warm, name="pkg-snapshot", daemon=True).start()
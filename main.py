@@ -35,11 +35,13 @@ from PyQt6.QtWidgets import (
 )
 
 from backup_stats import BackupStatsDialog
+from change_journal import ChangeWatcher, watched_roots
 from misc_dialogs import LogViewer, SysInfoDialog, NotesDialog
 from drive_utils import get_mounts, is_mounted, unmount_drive, get_session_managed_mounts
 from dry_run import launch_dry_run
 from icons import _ICON_B64
 from integrity_checker import IntegrityCheckerDialog
+from linux_distro_helper import warm_package_snapshot
 from scan_verify import ScanVerifyDialog
 from state import S, _HOME, _PROFILES_DIR, _PROFILE_RE, RESTART_DIALOG, save_profile, logger, startup_load
 from status_panel import StatusPanel
@@ -84,6 +86,7 @@ class MainWindow(_StandardKeysMixin, QMainWindow):
         self._quitting = False
 
         self._status_panel: StatusPanel | None = None
+        self._watcher: ChangeWatcher | None = None
 
         self._build_menu_actions()
         self._build_ui()
@@ -185,6 +188,7 @@ class MainWindow(_StandardKeysMixin, QMainWindow):
                 break
         self.show()
         self._refresh_status_panel()
+        self._sync_watcher()
 
     def _open_settings(self) -> None:
         self._open(base_window, "Settings", setup_fn=lambda d: d.changed.connect(apply_style))
@@ -222,6 +226,7 @@ class MainWindow(_StandardKeysMixin, QMainWindow):
         self._build_tray_menu()
         self.tray.activated.connect(self._on_tray_activated)
         self.tray.show()
+        self._sync_watcher()
 
     def _apply_tray_setting(self) -> None:
         disabled = S.ui.get("disable_tray_icon", False)
@@ -236,6 +241,18 @@ class MainWindow(_StandardKeysMixin, QMainWindow):
         self._apply_tray_setting()
         if hasattr(self, "tray"):
             self._build_tray_menu()
+        self._sync_watcher()
+
+    def _sync_watcher(self) -> None:
+        roots = watched_roots(S.entries) if hasattr(self, "tray") and S.ui.get("change_journal", False) else []
+        if self._watcher is not None and self._watcher.roots == tuple(roots):
+            return
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+        if roots:
+            self._watcher = ChangeWatcher(roots)
+            self._watcher.start()
 
     def _build_tray_menu(self) -> None:
         menu = QMenu()
@@ -279,7 +296,7 @@ class MainWindow(_StandardKeysMixin, QMainWindow):
         adv = apply_advanced_options(tasks, interactive=True, parent=self)
         label = header or tr("All groups")
         CopyDialog(None, adv.tasks, f"{tr('Quick Backup')} — {label}",
-                   pre_deleted=adv.deleted, pre_errors=adv.errors).exec()
+                   pre_deleted=adv.deleted, pre_errors=adv.errors, journal=True).exec()
         self._refresh_status_panel()
 
     def _on_tray_activated(self, r: QSystemTrayIcon.ActivationReason) -> None:
@@ -352,6 +369,9 @@ class MainWindow(_StandardKeysMixin, QMainWindow):
     def closeEvent(self, a0: QCloseEvent | None) -> None:
         if self._quitting:
             self._refresh_timer.stop()
+            if self._watcher is not None:
+                self._watcher.stop()
+                self._watcher = None
             unregister_style_listener(self._build_ui)
             unregister_language_listener(self._retranslate)
             if a0 is not None:
@@ -507,7 +527,7 @@ def main():
         if tasks:
             adv = apply_advanced_options(tasks, interactive=False, parent=None)
             CopyDialog(None, adv.tasks, tr("Backup (scheduled)"),
-                       pre_deleted=adv.deleted, pre_errors=adv.errors).exec()
+                       pre_deleted=adv.deleted, pre_errors=adv.errors, journal=True).exec()
         else:
             logger.warning("Headless backup: no matching tasks found (headers=%s)", headers)
         sys.exit(0)
@@ -515,6 +535,7 @@ def main():
     win = MainWindow()
     apply_style()
     win.show()
+    warm_package_snapshot()
     if not has_profile:
         QTimer.singleShot(200, lambda: _first_run_wizard(win))
     sys.exit(app.exec())
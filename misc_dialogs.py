@@ -240,6 +240,7 @@ class _ThemeDialog(_StandardKeysMixin, QDialog):
         self._orig = (
             S.ui.get("theme", "Tokyo Night"), S.ui.get("font_family", ""), S.ui.get("font_size", 14),
             S.ui.get("disable_tray_icon", False), S.ui.get("language", "English"),
+            S.ui.get("profile_backups", False), S.ui.get("change_journal", False),
         )
         self._build_ui()
 
@@ -274,6 +275,14 @@ class _ThemeDialog(_StandardKeysMixin, QDialog):
         self._tray_cb.setChecked(bool(S.ui.get("disable_tray_icon", False)))
         layout.addWidget(self._tray_cb)
 
+        self._profile_cb = QCheckBox(tr("Profile backup runs (write a timing trace to the log folder)"))
+        self._profile_cb.setChecked(bool(S.ui.get("profile_backups", False)))
+        layout.addWidget(self._profile_cb)
+
+        self._journal_cb = QCheckBox(tr("Record file changes while the tray icon is running (faster quick and scheduled backups)"))
+        self._journal_cb.setChecked(bool(S.ui.get("change_journal", False)))
+        layout.addWidget(self._journal_cb)
+
         self._btn_box = ok_cancel_buttons(self, self._on_ok, ok_label=tr("Save"), cancel_label=tr("Cancel"),
                                           cancel_fn=self.reject)
         layout.addWidget(self._btn_box)
@@ -292,6 +301,8 @@ class _ThemeDialog(_StandardKeysMixin, QDialog):
         self.setWindowTitle(tr("Theme and Font Settings"))
         self._prev_btn.setText(tr("Preview"))
         self._tray_cb.setText(tr("Disable Tray Icon"))
+        self._profile_cb.setText(tr("Profile backup runs (write a timing trace to the log folder)"))
+        self._journal_cb.setText(tr("Record file changes while the tray icon is running (faster quick and scheduled backups)"))
         if ok_btn := self._btn_box.button(self._btn_box.StandardButton.Ok):
             ok_btn.setText(tr("Save"))
         if cancel_btn := self._btn_box.button(self._btn_box.StandardButton.Cancel):
@@ -310,7 +321,8 @@ class _ThemeDialog(_StandardKeysMixin, QDialog):
             chosen_font = ""
         S.ui.update(
             theme=self._theme_cb.currentText(), font_family=chosen_font, font_size=int(self._size_cb.currentText()),
-            disable_tray_icon=self._tray_cb.isChecked(), language=self._lang_cb.currentText())
+            disable_tray_icon=self._tray_cb.isChecked(), language=self._lang_cb.currentText(),
+            profile_backups=self._profile_cb.isChecked(), change_journal=self._journal_cb.isChecked())
         apply_style()
         notify_language_listeners()
         if save:
@@ -326,9 +338,9 @@ class _ThemeDialog(_StandardKeysMixin, QDialog):
         self.accept()
 
     def reject(self) -> None:
-        orig_theme, orig_font, orig_size, orig_tray, orig_lang = self._orig
+        orig_theme, orig_font, orig_size, orig_tray, orig_lang, orig_profile, orig_journal = self._orig
         S.ui.update(theme=orig_theme, font_family=orig_font, font_size=orig_size, disable_tray_icon=orig_tray,
-                   language=orig_lang)
+                   language=orig_lang, profile_backups=orig_profile, change_journal=orig_journal)
         apply_style()
         notify_language_listeners()
         super().reject()
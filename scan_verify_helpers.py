@@ -166,6 +166,8 @@ def _get_arch_de_deps(helper: LinuxDistroHelper) -> frozenset[str]:
 
     result: set[str] = set()
     for meta in _DE_META_PKGS:
+        if not helper.package_is_installed(meta):
+            continue
         try:
             r = subprocess.run(["pacman", "-Qi", meta],
                                capture_output=True, text=True, timeout=15,
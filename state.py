@@ -128,7 +128,9 @@ class State:
     ui: dict = field(default_factory=lambda: {"theme": "Tokyo Night", "font_family": "", "font_size": 14,
                                               "backup_window_columns": 2, "restore_window_columns": 2,
                                               "settings_window_columns": 2, "disable_tray_icon": False,
-                                              "language": "English"})
+                                              "language": "English", "profile_backups": False,
+                                              "change_journal": False, "disk_index": False,
+                                              "disk_extents": False})
     notes: str = ""
     firewall_config: dict = field(default_factory=dict)
 
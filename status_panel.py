@@ -69,7 +69,7 @@ class StatusPanel(QWidget):
 
     def refresh(self) -> None:
         from themes import current_theme, font_sz
-        from history import load_history
+        from history import last_history_entry
         from scheduler import is_timer_active, get_next_run_time, get_active_interval
         from drive_utils import get_mounts, is_mounted as _is_mounted
 
@@ -130,13 +130,12 @@ class StatusPanel(QWidget):
             self._next_run_lbl.hide()
 
         try:
-            history = load_history(S.profile_name or "")
+            last = last_history_entry(S.profile_name or "")
         except (OSError, ValueError) as e:
             logger.debug("Could not load history: %s", e)
-            history = []
+            last = None
 
-        if history:
-            last      = history[-1]
+        if last:
             ts        = last.get("timestamp", "?")
             copied    = last.get("copied",    0)
             errors    = last.get("errors",    0)
@@ -12,6 +12,7 @@ import threading
 import time
 import urllib.error
 import urllib.request
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from types import SimpleNamespace
 
@@ -50,6 +51,7 @@ _INFO_RE = re.compile(
 
 
 _PACMAN_PROGRESS_RE = re.compile(r'\[[-Co# ]+]\s*\d+%')
+_TASK_LABEL_RE = re.compile(r'^\[(\w+)] ')
 
 
 _PKG_LOCK_INFO: tuple[tuple[str, str, str], ...] = (
@@ -69,6 +71,28 @@ _PKG_LOCK_INFO: tuple[tuple[str, str, str], ...] = (
 class _Status: PENDING, IN_PROGRESS, SUCCESS, WARNING, ERROR = ("pending", "in_progress", "success", "warning", "error")
 
 
+_TASK_WORKERS = 3
+_PKGDB, _BOOTLOADER = "pkgdb", "bootloader"
+_TASK_LOCKS: dict[str, frozenset[str]] = {
+    "update_mirrors": frozenset({_PKGDB}), "update_system": frozenset({_PKGDB}),
+    "install_ucode": frozenset({_PKGDB, _BOOTLOADER}), "install_kernels": frozenset({_PKGDB, _BOOTLOADER}),
+    "install_kernel_headers": frozenset({_PKGDB}), "set_default_kernel": frozenset({_BOOTLOADER}),
+    "install_basic_packages": frozenset({_PKGDB}), "install_aur_helper": frozenset({_PKGDB}),
+    "install_aur_packages": frozenset({_PKGDB}), "install_specific_packages": frozenset({_PKGDB}),
+    "enable_flatpak_integration": frozenset({_PKGDB}), "remove_orphaned_packages": frozenset({_PKGDB}),
+    "clean_cache": frozenset({_PKGDB}), "clean_journal_logs": frozenset({"journal"}),
+}
+_TASK_REQUIRES: dict[str, tuple[str, ...]] = {
+    "install_aur_packages": ("install_aur_helper",),
+    "set_default_kernel": ("install_kernels",),
+}
+_TASK_REQUIRES_UNLESS: dict[str, tuple[str, ...]] = {
+    "install_aur_packages": ("makepkg", "git"),
+}
+_TASK_FIRST = "copy_dotfiles"
+_TASK_LAST = frozenset({"remove_orphaned_packages", "clean_cache"})
+
+
 _FONT_MONO = "DejaVu Sans Mono, Noto Sans Mono"
 _FONT_SANS = "Hack, Noto Serif, monospace"
 
@@ -129,33 +153,6 @@ class _SudoKeepalive(threading.Thread):
                 logger.debug("_SudoKeepalive: %s", exc)
 
 
-class _PackageCache:
-    _TTL, _MAX = 600, 1000
-
-    def __init__(self, distro) -> None:
-        self._distro = distro
-        self._cache: dict[str, tuple[bool, float]] = {}
-        self._lock = threading.Lock()
-
-    def is_installed(self, pkg: str) -> bool:
-        now = time.monotonic()
-        with self._lock:
-            entry = self._cache.get(pkg)
-            if entry is not None and now - entry[1] < self._TTL:
-                return entry[0]
-        result = self._distro.package_is_installed(pkg)
-        with self._lock:
-            if len(self._cache) >= self._MAX:
-                oldest = min(self._cache, key=lambda k: self._cache[k][1])
-                del self._cache[oldest]
-            self._cache[pkg] = (result, time.monotonic())
-        return result
-
-    def mark_installed(self, pkg: str) -> None:
-        with self._lock:
-            self._cache[pkg] = (True, time.monotonic())
-
-
 class SystemManagerDialog(_StandardKeysMixin, QDialog):
     DIALOG_SIZE = (1875, 1000)
     BUTTON_SIZE = (160, 50)
@@ -279,7 +276,8 @@ class SystemManagerDialog(_StandardKeysMixin, QDialog):
     def on_output(self, text: str, kind: str) -> None:
         for needle, pm_name, hint in _PKG_LOCK_INFO:
             if needle in text:
-                self._show_db_lock_error(pm_name, hint)
+                label = _TASK_LABEL_RE.match(text)
+                self._show_db_lock_error(pm_name, hint, label.group(1) if label else None)
                 return
         if kind == "finish": self._show_completion(); return
         if kind in _Style.KIND_CFG:
@@ -362,16 +360,14 @@ class SystemManagerDialog(_StandardKeysMixin, QDialog):
         except Exception as exc:
             logger.error("_append_html: %s", exc)
 
-    def _show_db_lock_error(self, pm_name: str = "pacman", hint: str = "sudo rm /var/lib/pacman/db.lck") -> None:
+    def _show_db_lock_error(self, pm_name: str = "pacman", hint: str = "sudo rm /var/lib/pacman/db.lck",
+                            task_id: str | None = None) -> None:
         t = current_theme()
 
-        for i in range(self._checklist.count()):
-            item = self._checklist.item(i)
-            if item:
-                task_id = item.data(Qt.ItemDataRole.UserRole)
-                if self._task_status.get(task_id) == _Status.IN_PROGRESS:
-                    self.on_task_status(task_id, _Status.ERROR)
-                    break
+        if task_id is None:
+            task_id = next((tid for tid, status in self._task_status.items() if status == _Status.IN_PROGRESS), None)
+        if task_id is not None:
+            self.on_task_status(task_id, _Status.ERROR)
 
         self._append_html(f"<p style='{_Style.style_str('error')}'>{tr('Operation failed!')}</p>")
 
@@ -472,14 +468,16 @@ class SystemManagerThread(QThread):
         self._task_status: dict[str, str] = {}
         self._input_event: threading.Event = threading.Event()
         self._input_value: str = ""
+        self._input_lock = threading.Lock()
+        self._task_ctx = threading.local()
+        self._task_locks: dict[str, frozenset[str]] = {}
+        self._service_locks: dict[str, frozenset[str]] = {}
         self._env_snapshot: dict = os.environ.copy()
         self._env_snapshot.update({"LC_ALL": "C", "LANG": "C", "LANGUAGE": "C"})
         self.distro: LinuxDistroHelper | None = None
-        self._pkg_cache: _PackageCache | None = None
         try:
             if distro is not None:
                 self.distro = distro
-                self._pkg_cache = _PackageCache(distro)
         except Exception as exc:
             logger.warning("distro init: %s", exc)
 
@@ -556,8 +554,15 @@ class SystemManagerThread(QThread):
             "clean_journal_logs": (tr("Cleaning systemd journal logs…"), self._clean_journal_logs)
         }
         self._enabled_tasks = {k: v for k, v in all_tasks.items() if k in S.system_manager_ops}
+        locks = {**_TASK_LOCKS, **self._service_locks}
+        if self.distro and "set_user_shell" in self._enabled_tasks:
+            locks["set_user_shell"] = self._pkg_locks([self.distro.get_shell_package_name(S.effective_shell)])
+        self._task_locks = {k: locks.get(k, frozenset()) for k in self._enabled_tasks}
         self.taskListReady.emit([(k, d) for k, (d, _) in self._enabled_tasks.items()])
 
+    def _pkg_locks(self, packages: list[str]) -> frozenset[str]:
+        return frozenset({_PKGDB}) if self.distro and self.distro.filter_not_installed(packages) else frozenset()
+
     def _base_tasks(self) -> dict:
         return {"copy_dotfiles": (tr("Copying Dotfiles…"), self._copy_dotfiles),
                 "update_mirrors": (tr("Updating mirrors…"), self._update_mirrors),
@@ -601,35 +606,98 @@ class SystemManagerThread(QThread):
             fw_pkgs = ["ufw"] if fw_backend == "ufw" else ["firewalld"]
             specs["enable_firewall"] = (tr("Initialising firewall…"), fw_backend, lambda: fw_pkgs)
 
+        self._service_locks = {k: self._pkg_locks(pkg_fn()) for k, (_d, _s, pkg_fn) in specs.items()
+                               if k in S.system_manager_ops}
         return {
             k: (desc, lambda s=svc, p=pkg_fn: self._setup_service(s, p(), optional=self._OPTIONAL_SVC_PKGS.get(s, ())))
             for k, (desc, svc, pkg_fn) in specs.items()}
 
-    def _run_all_tasks(self) -> None:
-        task_items = list(self._enabled_tasks.items())
-        for idx, (task_id, (desc, fn)) in enumerate(task_items):
-            if self.terminated:
-                for skipped_id, _ in task_items[idx:]:
-                    self.taskStatusChanged.emit(skipped_id, _Status.WARNING)
-                    self._task_status[skipped_id] = _Status.WARNING
-                break
-            self.taskStatusChanged.emit(task_id, _Status.IN_PROGRESS)
-            self._task_status[task_id] = _Status.IN_PROGRESS
-            self.outputReceived.emit(desc, "operation")
+    def _run_task(self, task_id: str, desc: str, fn) -> str:
+        self.taskStatusChanged.emit(task_id, _Status.IN_PROGRESS)
+        self._task_status[task_id] = _Status.IN_PROGRESS
+        self.outputReceived.emit(desc, "operation")
+        self._task_ctx.label = f"[{task_id}] "
+        try:
+            res = fn()
+            status = _Status.ERROR if res is False else _Status.WARNING if res == _Status.WARNING else _Status.SUCCESS
+        except Exception as exc:
+            self.outputReceived.emit(tr("Task '{task_id}' failed: {exc}", task_id=task_id, exc=exc), "error")
+            status = _Status.ERROR
+        finally:
+            self._task_ctx.label = ""
+        self.taskStatusChanged.emit(task_id, status)
+        self._task_status[task_id] = status
+        return status
+
+    def _labelled(self, text: str) -> str:
+        return getattr(self._task_ctx, "label", "") + text
+
+    def _with_label(self, fn):
+        label = getattr(self._task_ctx, "label", "")
+
+        def call(*args, **kwargs):
+            prev = getattr(self._task_ctx, "label", "")
+            self._task_ctx.label = label
             try:
-                res = fn()
-                status = _Status.ERROR if res is False else _Status.WARNING if res == _Status.WARNING else _Status.SUCCESS
-            except Exception as exc:
-                self.outputReceived.emit(tr("Task '{task_id}' failed: {exc}", task_id=task_id, exc=exc), "error")
-                status = _Status.ERROR
-            self.taskStatusChanged.emit(task_id, status)
-            self._task_status[task_id] = status
-            if status == _Status.ERROR:
-                self.outputReceived.emit(tr("Aborting remaining tasks due to failure in '{task_id}'.", task_id=task_id), "error")
-                for remaining_id, _ in task_items[idx + 1:]:
-                    self.taskStatusChanged.emit(remaining_id, _Status.WARNING)
-                    self._task_status[remaining_id] = _Status.WARNING
-                break
+                return fn(*args, **kwargs)
+            finally:
+                self._task_ctx.label = prev
+        return call
+
+    def _skip_task(self, task_id: str) -> None:
+        self.taskStatusChanged.emit(task_id, _Status.WARNING)
+        self._task_status[task_id] = _Status.WARNING
+
+    def _run_all_tasks(self) -> None:
+        order = list(self._enabled_tasks)
+        after = {t: set(_TASK_REQUIRES.get(t, ())) & set(order) for t in order}
+        for i, t in enumerate(order):
+            if t != _TASK_FIRST and _TASK_FIRST in self._enabled_tasks:
+                after[t].add(_TASK_FIRST)
+            if t in _TASK_LAST:
+                after[t].update(order[:i])
+        pending = list(order)
+        finished: set[str] = set()
+        failed: set[str] = set()
+        held: set[str] = set()
+        running: dict = {}
+        with ThreadPoolExecutor(max_workers=_TASK_WORKERS, thread_name_prefix="sm-task") as pool:
+            while pending or running:
+                blocked: set[str] = set()
+                for task_id in list(pending):
+                    if self.terminated:
+                        break
+                    locks = self._task_locks.get(task_id, frozenset())
+                    missing = [r for r in _TASK_REQUIRES.get(task_id, ()) if r in failed]
+                    tools = _TASK_REQUIRES_UNLESS.get(task_id)
+                    if missing and tools and all(shutil.which(tool) for tool in tools):
+                        missing = []
+                    if missing:
+                        pending.remove(task_id)
+                        failed.add(task_id)
+                        finished.add(task_id)
+                        self.outputReceived.emit(tr("Skipping '{task_id}' because '{dep}' failed.", task_id=task_id,
+                                                    dep=missing[0]), "warning")
+                        self._skip_task(task_id)
+                        continue
+                    if (len(running) < _TASK_WORKERS and after[task_id] <= finished
+                            and not locks & (held | blocked)):
+                        pending.remove(task_id)
+                        held |= locks
+                        desc, fn = self._enabled_tasks[task_id]
+                        running[pool.submit(self._run_task, task_id, desc, fn)] = task_id
+                    blocked |= locks
+                if not running:
+                    for task_id in pending:
+                        self._skip_task(task_id)
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    task_id = running.pop(fut)
+                    held -= self._task_locks.get(task_id, frozenset())
+                    finished.add(task_id)
+                    if fut.result() == _Status.ERROR:
+                        failed.add(task_id)
 
     @staticmethod
     def _inject(cmd: list[str]) -> list[str]:
@@ -877,7 +945,7 @@ class SystemManagerThread(QThread):
                 continue
 
             if tag == "auto_none":
-                self.outputReceived.emit(text, "subprocess")
+                self.outputReceived.emit(self._labelled(text), "subprocess")
                 try:
                     if proc.stdin and not proc.stdin.closed:
                         proc.stdin.write(b"\n")
@@ -907,13 +975,14 @@ class SystemManagerThread(QThread):
                     if len(_ft) <= 2 and _ft.lower().strip() in ("y", "n"):
                         continue
                     _fkind = "error" if _fe and not _INFO_RE.search(_ft) else "subprocess"
-                    self.outputReceived.emit(_ft, _fkind)
-                self.outputReceived.emit(text, "subprocess")
-                self._input_event.clear()
-                self._input_value = ""
-                self.inputRequested.emit(text)
-                answered = self._input_event.wait(timeout=300)
-                answer = self._input_value.strip() if answered and self._input_value.strip() else "1"
+                    self.outputReceived.emit(self._labelled(_ft), _fkind)
+                self.outputReceived.emit(self._labelled(text), "subprocess")
+                with self._input_lock:
+                    self._input_event.clear()
+                    self._input_value = ""
+                    self.inputRequested.emit(text)
+                    answered = self._input_event.wait(timeout=300)
+                    answer = self._input_value.strip() if answered and self._input_value.strip() else "1"
                 try:
                     if proc.stdin and not proc.stdin.closed:
                         proc.stdin.write((answer + "\n").encode("utf-8"))
@@ -936,7 +1005,7 @@ class SystemManagerThread(QThread):
             if re.search(r'\d+\s*(?:MiB|KiB|B)/s|\d+:\d{2}\s+\d+[KM]iB', text):
                 _kind = "dimmed"
 
-            self.outputReceived.emit(text, _kind)
+            self.outputReceived.emit(self._labelled(text), _kind)
 
         _wait_timeout = timeout if (not self.terminated) else 30
 
@@ -1051,39 +1120,75 @@ class SystemManagerThread(QThread):
     def _install_pkg(self, name: str, label: str | None = None) -> bool:
         if label is None:
             label = tr("Package")
-        if not self.distro or not self._pkg_cache: return False
+        if not self.distro: return False
         self.outputReceived.emit(tr("Installing {label}: {name}", label=label, name=name), "info")
-        if self._pkg_cache.is_installed(name):
+        if self.distro.package_is_installed(name):
             self.outputReceived.emit(tr("{name} already installed", name=name), "success")
             return True
         ok = (self._exec(self.distro.get_pkg_install_cmd(name), stream=True).returncode == 0)
-        if ok: self._pkg_cache.mark_installed(name)
         self._emit_result(ok, tr("{name} successfully installed", name=name), tr("failed to install {name}", name=name))
         return ok
 
-    def _install_with_retry(self, pkgs: list[str], bulk_fn, single_fn) -> list[str]:
+    def _install_with_retry(self, pkgs: list[str], install_fn) -> list[str]:
         if not self.distro:
             return pkgs
-        bulk_fn(pkgs)
+        install_fn(pkgs)
         if self.terminated:
             return pkgs
-        still_missing = self.distro.filter_not_installed(pkgs)
-        for p in pkgs:
-            if p not in still_missing and self._pkg_cache: self._pkg_cache.mark_installed(p)
-        failed = []
-        if still_missing:
-            self.outputReceived.emit(tr("Some packages were not installed — trying them individually…"), "warning")
-            for i, pkg in enumerate(still_missing):
+        missing = self.distro.filter_not_installed(pkgs)
+        if len(missing) > 1:
+            self.outputReceived.emit(tr("Some packages were not installed — isolating the failing ones…"), "warning")
+            return self._bisect_install(missing, install_fn, len(missing) < len(pkgs))
+        return missing
+
+    def _bisect_install(self, pkgs: list[str], install_fn, progress: bool = True) -> list[str]:
+        if len(pkgs) < 2 or not self.distro:
+            return pkgs
+        mid = len(pkgs) // 2
+        halves = (pkgs[:mid], pkgs[mid:])
+        missing = []
+        for half in halves:
+            if self.terminated:
+                return pkgs
+            install_fn(half)
+            missing.append(self.distro.filter_not_installed(half))
+        if not progress and missing[0] == halves[0] and missing[1] == halves[1]:
+            probes = [half[len(half) // 2] for half in halves]
+            for probe in probes:
                 if self.terminated:
-                    failed.extend(still_missing[i:])
-                    break
-                single_fn(pkg)
-                if self.distro.package_is_installed(pkg):
-                    if self._pkg_cache: self._pkg_cache.mark_installed(pkg)
-                else:
-                    failed.append(pkg)
+                    return pkgs
+                install_fn([probe])
+            installed = set(probes) - set(self.distro.filter_not_installed(probes))
+            if not installed:
+                self.outputReceived.emit(tr("Nothing could be installed, not even a single package — "
+                                            "giving up on the remaining retries"), "warning")
+                return pkgs
+            missing = [[p for p in m if p not in installed] for m in missing]
+        progress = progress or missing[0] != halves[0] or missing[1] != halves[1]
+        failed = []
+        for m in missing:
+            failed.extend(self._bisect_install(m, install_fn, progress))
         return failed
 
+    def _aur_build(self, names: list[str]) -> list[str]:
+        from aur_builder import AurBuild
+
+        def install(files: list[str], as_deps: bool) -> bool:
+            flags = ["--asdeps"] if as_deps else []
+            return self._exec(["sudo", "pacman", "-U", "--needed", "--noconfirm", *flags, *files],
+                              stream=True).returncode == 0
+
+        def install_repo(pkgs: list[str]) -> bool:
+            return self._exec(["sudo", "pacman", "-S", "--needed", "--noconfirm", "--asdeps", *pkgs],
+                              stream=True).returncode == 0
+
+        return AurBuild(
+            self._with_label(lambda cmd, cwd: self._exec(cmd, stream=True, timeout=None, cwd=cwd).returncode),
+            install, install_repo,
+            not_installed=self.distro.filter_not_installed, unavailable=self.distro.filter_unavailable,
+            cancel=self._stop, log=self.outputReceived.emit,
+        ).build(names)
+
     def _batch_install(self, pkg_list, label: str, *, use_aur: bool = False) -> str | bool:
         if not self.distro:
             self.outputReceived.emit(tr("Cannot install {label}s: no distro helper", label=label), "error")
@@ -1111,29 +1216,34 @@ class SystemManagerThread(QThread):
                 self.outputReceived.emit(tr("AUR is not supported on this distribution — skipping {label}s", label=label), "warning")
                 return _Status.WARNING
             helper = self._effective_aur_helper() or S.aur_helper
-            if not (shutil.which(helper) or (self._pkg_cache and self._pkg_cache.is_installed(helper))):
+            has_helper = bool(shutil.which(helper) or self.distro.package_is_installed(helper))
+            can_build = bool(shutil.which("makepkg") and shutil.which("git"))
+            if not (has_helper or can_build):
                 self.outputReceived.emit(
                     tr("AUR helper '{helper}' is not installed — cannot install {label}s. "
                     "Enable 'Install AUR helper' first.", helper=helper, label=label), "error")
                 return False
+            if can_build:
+                to_install = self._aur_build(to_install)
+                if not to_install or self.terminated or not has_helper:
+                    failed = to_install
+                    to_install = []
             def bulk(b):
                 return self._exec([helper, "-S", "--needed", "--noconfirm", *b], stream=True)
-            def single(_p):
-                return self._exec([helper, "-S", "--needed", "--noconfirm", _p], stream=True)
         else:
             _distro = self.distro
             def bulk(b):
                 return self._exec(_distro.get_batch_install_cmd(b), stream=True)
-            def single(p_):
-                return self._exec(_distro.get_pkg_install_cmd(p_), stream=True)
 
-        for i in range(0, len(to_install), 20):
-            if self.terminated:
-                failed.extend(to_install[i:])
-                break
-            batch = to_install[i:i + 20]
-            self.outputReceived.emit(tr("Installing: {names}", names=", ".join(batch)), "info")
-            failed.extend(self._install_with_retry(batch, bulk, single))
+            failed = self.distro.filter_unavailable(to_install)
+            if failed:
+                self.outputReceived.emit(tr("Not found in the repositories, skipping: {names}",
+                                            names=", ".join(failed)), "warning")
+                to_install = [p for p in to_install if p not in failed]
+
+        if to_install:
+            self.outputReceived.emit(tr("Installing: {names}", names=", ".join(to_install)), "info")
+            failed.extend(self._install_with_retry(to_install, bulk))
 
         self._emit_result(not failed, tr("All {label}s successfully installed", label=label), tr("Failed {label}(s): {names}", label=label, names=", ".join(failed)))
         return _Status.SUCCESS if not failed else _Status.WARNING
@@ -1213,12 +1323,12 @@ class SystemManagerThread(QThread):
         return self._exec(cmd, stream=True).returncode == 0
 
     def _effective_aur_helper(self) -> str | None:
-        if not self._pkg_cache:
+        if not self.distro:
             return None
-        if self._pkg_cache.is_installed(S.aur_helper):
+        if self.distro.package_is_installed(S.aur_helper):
             return S.aur_helper
         fallback = "paru" if S.aur_helper == "yay" else "yay"
-        return fallback if self._pkg_cache.is_installed(fallback) else None
+        return fallback if self.distro.package_is_installed(fallback) else None
 
     def _update_flatpak_apps(self) -> None:
         if shutil.which("flatpak"):
@@ -1299,7 +1409,7 @@ class SystemManagerThread(QThread):
             vendor = self.distro.detect_cpu_vendor() or "unknown"
             self.outputReceived.emit(tr("No microcode package available for {vendor} CPU on {pm} — skipping", vendor=vendor, pm=self.distro.pkg_manager_name()), "warning")
             return _Status.WARNING
-        if self._pkg_cache and self._pkg_cache.is_installed(pkg):
+        if self.distro and self.distro.package_is_installed(pkg):
             self.outputReceived.emit(tr("Microcode already installed ({pkg})", pkg=pkg), "success")
             return True
         return self._install_pkg(pkg, tr("CPU Microcode"))
@@ -1325,7 +1435,7 @@ class SystemManagerThread(QThread):
                 self.outputReceived.emit(tr("Unknown kernel variant: {variant!r} — skipping", variant=variant), "warning")
                 continue
 
-            if self._pkg_cache and self._pkg_cache.is_installed(pkgs[0]):
+            if self.distro and self.distro.package_is_installed(pkgs[0]):
                 self.outputReceived.emit(tr("{variant} already installed — skipping", variant=variant), "success")
                 continue
 
@@ -1376,7 +1486,7 @@ class SystemManagerThread(QThread):
                 if not pkgs or len(pkgs) < 2:
                     continue
                 header_pkg = pkgs[1]
-                if self._pkg_cache and self._pkg_cache.is_installed(header_pkg):
+                if self.distro and self.distro.package_is_installed(header_pkg):
                     self.outputReceived.emit(tr("{header_pkg} already installed — skipping", header_pkg=header_pkg), "success")
                     continue
                 if not self._install_pkg(header_pkg, tr("Headers Package")):
@@ -1722,7 +1832,7 @@ class SystemManagerThread(QThread):
         if not self.distro or not self.distro.has_aur:
             self.outputReceived.emit(tr("{helper} is not supported on this distribution", helper=helper), "warning")
             return True
-        if self._pkg_cache and self._pkg_cache.is_installed(helper):
+        if self.distro and self.distro.package_is_installed(helper):
             self.outputReceived.emit(tr("{helper} already installed", helper=helper), "success")
             return True
 
@@ -1779,7 +1889,6 @@ class SystemManagerThread(QThread):
 
         ok = (self._exec(["sudo", "pacman", "-U", "--noconfirm", str(pkgs[0])], stream=True).returncode == 0)
         shutil.rmtree(target_dir, ignore_errors=True)
-        if ok and self._pkg_cache: self._pkg_cache.mark_installed(helper)
         self._emit_result(ok, tr("{helper} successfully installed", helper=helper), tr("{helper} installation failed", helper=helper))
         return ok
 
@@ -1798,10 +1907,16 @@ class SystemManagerThread(QThread):
             self.outputReceived.emit(tr("All Specific Packages for {session} already installed", session=session), "success")
             return _Status.SUCCESS
 
-        self.outputReceived.emit(tr("Installing: {names}", names=", ".join(to_install)), "info")
-        _distro = self.distro
-        failed = self._install_with_retry(to_install, lambda batch: self._exec(_distro.get_batch_install_cmd(batch), stream=True),
-                                          lambda pkg: self._exec(_distro.get_pkg_install_cmd(pkg), stream=True))
+        failed = self.distro.filter_unavailable(to_install)
+        if failed:
+            self.outputReceived.emit(tr("Not found in the repositories, skipping: {names}",
+                                        names=", ".join(failed)), "warning")
+            to_install = [p for p in to_install if p not in failed]
+        if to_install:
+            self.outputReceived.emit(tr("Installing: {names}", names=", ".join(to_install)), "info")
+            _distro = self.distro
+            failed.extend(self._install_with_retry(
+                to_install, lambda batch: self._exec(_distro.get_batch_install_cmd(batch), stream=True)))
 
         self._emit_result(not failed, tr("All Specific Packages successfully installed"), tr("Failed to install: {names}", names=", ".join(failed)))
         return _Status.SUCCESS if not failed else _Status.WARNING
@@ -1466,6 +1466,145 @@ LANGUAGES: dict[str, dict[str, str]] = {
         'Select Font:': 'Schriftart auswählen:',
         'Select Font Size:': 'Schriftgröße auswählen:',
         'Select Language:': 'Sprache auswählen:',
+        'Data moved': 'Übertragene Daten',
+        'Throughput': 'Durchsatz',
+        'Scan time': 'Scan-Dauer',
+        'Copy time': 'Kopier-Dauer',
+        'Per backend': 'Pro Backend',
+        'Avg Throughput': 'Ø Durchsatz',
+        'Throughput per Day (MB/s)': 'Durchsatz pro Tag (MB/s)',
+        'Data Moved by Backend': 'Übertragene Daten nach Backend',
+        'Profile backup runs (write a timing trace to the log folder)':
+            'Backup-Läufe profilieren (Zeit-Trace im Log-Ordner speichern)',
+        'Packing small files': 'Kleine Dateien werden gepackt',
+        'Unpacking small files': 'Kleine Dateien werden entpackt',
+        'zstd is required to unpack {name}': 'zstd wird zum Entpacken von {name} benötigt',
+        'Bundle member unreadable': 'Bündel-Eintrag nicht lesbar',
+        'Unsafe path in pack index': 'Unsicherer Pfad im Paketindex',
+        'Missing from bundle {name}': 'Fehlt im Bündel {name}',
+        'Pack small files into bundles (SMB/SSH destinations)': 'Kleine Dateien in Bündel packen (SMB-/SSH-Ziele)',
+        'Files of 64 KB or less are streamed into compressed tar bundles (zstd when available, gzip otherwise) together with an index, and only the bundles are sent to the remote destination — one transfer instead of thousands.<br><br>Unchanged files are not packed again; changed ones go into a new bundle.<br><br><i>Only applies to Backup with a local source and an SMB or SSH destination. Restore unpacks the bundles automatically.</i>':
+            'Dateien bis 64 KB werden in komprimierte tar-Bündel (zstd, falls verfügbar, sonst gzip) samt Index geschrieben, und nur die Bündel werden zum entfernten Ziel übertragen — eine Übertragung statt Tausender.<br><br>Unveränderte Dateien werden nicht erneut gepackt; geänderte kommen in ein neues Bündel.<br><br><i>Gilt nur für Sicherungen mit lokaler Quelle und SMB- oder SSH-Ziel. Die Wiederherstellung entpackt die Bündel automatisch.</i>',
+        'Speeds up remote backups of mail folders, dotfiles and other trees with many tiny files.':
+            'Beschleunigt entfernte Sicherungen von Mail-Ordnern, Dotfiles und anderen Bäumen mit vielen winzigen Dateien.',
+        'zstd failed: {err}': 'zstd fehlgeschlagen: {err}',
+        'Store files compressed at the destination': 'Dateien am Ziel komprimiert speichern',
+        'Every file is compressed on the fly into its own <code>.bh.gz</code> file, or <code>.bh.zst</code> (multithreaded zstd) for files of 1 MB and more when zstd is installed, so single files can still be restored quickly. An index at the destination keeps up-to-date checks fast without decompressing anything.<br><br>Already-compressed formats (images, videos, archives…) are copied as they are.<br><br><i>Only applies to Backup to local or mounted destinations, and cannot be combined with mirror mode. Restore decompresses the files automatically.</i>':
+            'Jede Datei wird beim Kopieren in eine eigene <code>.bh.gz</code>-Datei komprimiert, bzw. <code>.bh.zst</code> (zstd mit mehreren Threads) für Dateien ab 1 MB, wenn zstd installiert ist, sodass einzelne Dateien weiterhin schnell wiederhergestellt werden können. Ein Index am Ziel hält die Aktualitätsprüfung schnell, ohne etwas zu entpacken.<br><br>Bereits komprimierte Formate (Bilder, Videos, Archive…) werden unverändert kopiert.<br><br><i>Gilt nur für Sicherungen auf lokale oder eingehängte Ziele und lässt sich nicht mit dem Spiegelmodus kombinieren. Die Wiederherstellung entpackt die Dateien automatisch.</i>',
+        'Saves space and transfer time for text-heavy entries such as configs, source trees and logs.':
+            'Spart Platz und Übertragungszeit bei textlastigen Einträgen wie Konfigurationen, Quellbäumen und Logs.',
+        'Chunk {cid} is corrupt': 'Block {cid} ist beschädigt',
+        'Deduplicating {title}': 'Dedupliziere {title}',
+        'Restoring from chunk store': 'Wiederherstellung aus dem Blockspeicher',
+        'No backup of this entry in the chunk store': 'Keine Sicherung dieses Eintrags im Blockspeicher',
+        'Removing unreferenced chunks': 'Entferne nicht mehr benötigte Blöcke',
+        'Store as deduplicated chunk store': 'Als deduplizierten Blockspeicher sichern',
+        'Files are split into content-defined chunks (about 1 MB on average) and each unique chunk is stored only once, compressed. Every backup adds a small manifest, so many versions of large, slowly-changing files such as VM images or mailboxes cost little extra space.<br><br>"Keep at most" limits the number of manifests; chunks no longer referenced are removed afterwards.<br><br><i>Only applies to Backup to local or mounted destinations, and cannot be combined with mirror, versioned or compressed mode. Restore rebuilds the latest version automatically.</i>':
+            'Dateien werden in inhaltsabhängige Blöcke (im Mittel etwa 1 MB) zerlegt, und jeder eindeutige Block wird nur einmal komprimiert gespeichert. Jede Sicherung fügt nur ein kleines Manifest hinzu, daher kosten viele Versionen großer, sich langsam ändernder Dateien wie VM-Abbilder oder Postfächer kaum zusätzlichen Platz.<br><br>„Höchstens behalten“ begrenzt die Anzahl der Manifeste; nicht mehr benötigte Blöcke werden danach entfernt.<br><br><i>Gilt nur für Sicherungen auf lokale oder eingehängte Ziele und lässt sich nicht mit Spiegel-, Versions- oder Komprimierungsmodus kombinieren. Die Wiederherstellung baut automatisch die neueste Version auf.</i>',
+        'Keeps a history of large files in far less space than versioned folders.':
+            'Bewahrt einen Verlauf großer Dateien mit viel weniger Platz als versionierte Ordner auf.',
+        'File shrank while reading': 'Datei wurde während des Lesens kleiner',
+        'Record file changes while the tray icon is running (faster quick and scheduled backups)':
+            'Dateiänderungen aufzeichnen, solange das Tray-Symbol läuft (schnellere Schnell- und geplante Sicherungen)',
+        'Creating snapshot': 'Erstelle Snapshot',
+        'Copy from a filesystem snapshot': 'Aus einem Dateisystem-Snapshot kopieren',
+        'Before copying, a read-only snapshot of the source is taken (Btrfs subvolume, ZFS dataset or LVM volume), the files are copied from the snapshot and the snapshot is removed afterwards. Databases, browser profiles and VM images are then captured in a consistent state without closing any application, so their journal and WAL files are backed up too.<br><br><i>Needs root, or a sudo rule that allows the snapshot commands without a password. If no snapshot can be taken, the live files are copied as before.</i>':
+            'Vor dem Kopieren wird ein schreibgeschützter Snapshot der Quelle erstellt (Btrfs-Subvolume, ZFS-Dataset oder LVM-Volume), die Dateien werden aus dem Snapshot kopiert und der Snapshot danach entfernt. Datenbanken, Browserprofile und VM-Abbilder werden so in einem konsistenten Zustand gesichert, ohne eine Anwendung zu schließen – daher werden auch ihre Journal- und WAL-Dateien gesichert.<br><br><i>Erfordert root oder eine sudo-Regel, die die Snapshot-Befehle ohne Passwort erlaubt. Kann kein Snapshot erstellt werden, werden wie bisher die laufenden Dateien kopiert.</i>',
+        'Consistent backups of data that is in use while the backup runs.':
+            'Konsistente Sicherungen von Daten, die während der Sicherung in Benutzung sind.',
+        'Scanning… {n} folders read': 'Scannen… {n} Ordner gelesen',
+        '  (apparent {size})': '  (scheinbar {size})',
+        'Apparent size (bytes)': 'Scheinbare Größe (Bytes)',
+        'F5 = Refresh  ·  Ctrl+F5 = Full rescan': 'F5 = Aktualisieren  ·  Strg+F5 = Komplett neu scannen',
+        'Remember scans': 'Scans merken',
+        'Keep the folder index on disk so the next scan of this directory only re-reads folders that changed':
+            'Ordnerindex auf der Festplatte behalten, damit der nächste Scan dieses Verzeichnisses nur geänderte Ordner neu liest',
+        'Empty directory.': 'Leeres Verzeichnis.',
+        '  (from the scan of {when})': '  (aus dem Scan von {when})',
+        'Shared extents': 'Geteilte Blöcke',
+        'Ask the filesystem which blocks are shared with other files or snapshots (reflinks, btrfs/XFS snapshots). Slower: every file is opened.':
+            'Das Dateisystem fragen, welche Blöcke mit anderen Dateien oder Snapshots geteilt werden (Reflinks, btrfs/XFS-Snapshots). Langsamer: jede Datei wird geöffnet.',
+        '  ({size} shared)': '  ({size} geteilt)',
+        'Hard-linked files are counted once': 'Hardlinks werden nur einmal gezählt',
+        'shared = blocks also used by other files or snapshots':
+            'geteilt = Blöcke, die auch von anderen Dateien oder Snapshots genutzt werden',
+        'Shared (bytes)': 'Geteilt (Bytes)',
+        'Size': 'Größe',
+        'Modified': 'Geändert',
+        'Search again': 'Erneut suchen',
+        'Duplicate Files': 'Doppelte Dateien',
+        '🔗 Replace checked with hard links': '🔗 Markierte durch Hardlinks ersetzen',
+        '🗑 Delete checked': '🗑 Markierte löschen',
+        'Files under {root} with identical content. Checked copies are deleted or replaced by a hard link to the unchecked copy of their group.':
+            'Dateien unter {root} mit identischem Inhalt. Markierte Kopien werden gelöscht oder durch einen Hardlink auf die nicht markierte Kopie ihrer Gruppe ersetzt.',
+        'Reading folders… {n} files': 'Ordner werden gelesen… {n} Dateien',
+        'Comparing files of the same size… {i}/{n}': 'Dateien gleicher Größe werden verglichen… {i}/{n}',
+        '{n} copies · {wasted} reclaimable': '{n} Kopien · {wasted} freigebbar',
+        '{n} duplicate groups · {wasted} reclaimable  (search: {s:.1f}s)':
+            '{n} Duplikatgruppen · {wasted} freigebbar  (Suche: {s:.1f}s)',
+        'Check the copies to remove; every group must keep one unchecked copy.':
+            'Zu entfernende Kopien markieren; jede Gruppe muss eine nicht markierte Kopie behalten.',
+        'Replace {n} file(s) with hard links to the kept copy?':
+            '{n} Datei(en) durch Hardlinks auf die behaltene Kopie ersetzen?',
+        'Permanently delete {n} file(s)?': '{n} Datei(en) endgültig löschen?',
+        '✓ {done} file(s) processed, {errors} error(s) — see log':
+            '✓ {done} Datei(en) verarbeitet, {errors} Fehler — siehe Protokoll',
+        '✓ {done} file(s) processed': '✓ {done} Datei(en) verarbeitet',
+        'changed since the search': 'seit der Suche geändert',
+        'on a different filesystem than the kept copy': 'auf einem anderen Dateisystem als die behaltene Kopie',
+        '🔁 Duplicates': '🔁 Duplikate',
+        'Find files with identical content below the current directory':
+            'Dateien mit identischem Inhalt unterhalb des aktuellen Verzeichnisses finden',
+        '1 day': '1 Tag',
+        '1 week': '1 Woche',
+        '1 month': '1 Monat',
+        '3 months': '3 Monate',
+        '6 months': '6 Monate',
+        '1 year': '1 Jahr',
+        '2 years': '2 Jahre',
+        '5 years': '5 Jahre',
+        'Less than {age}': 'Weniger als {age}',
+        'More than {age}': 'Mehr als {age}',
+        'Disk Reports': 'Speicherberichte',
+        'Top ': 'Top ',
+        'Run': 'Ausführen',
+        '💾 Export CSV': '💾 CSV exportieren',
+        'Largest files': 'Größte Dateien',
+        'By extension': 'Nach Endung',
+        'Age': 'Alter',
+        'Allocated': 'Belegt',
+        'Extension': 'Endung',
+        'Share': 'Anteil',
+        'Size (modified)': 'Größe (geändert)',
+        'Files (modified)': 'Dateien (geändert)',
+        'Size (accessed)': 'Größe (Zugriff)',
+        'Files (accessed)': 'Dateien (Zugriff)',
+        'Reports for {root}. Hard-linked files are counted once. Access times are only as accurate as the mount options allow (relatime, noatime).':
+            'Berichte für {root}. Hardlinks werden einmal gezählt. Zugriffszeiten sind nur so genau, wie es die Mount-Optionen erlauben (relatime, noatime).',
+        'Export report as a CSV file': 'Bericht als CSV-Datei exportieren',
+        '✓ Report exported to {path}': '✓ Bericht exportiert nach {path}',
+        '📊 Reports': '📊 Berichte',
+        'Largest files, space by extension and file age below the current directory':
+            'Größte Dateien, Platz nach Endung und Dateialter unterhalb des aktuellen Verzeichnisses',
+        "Skipping '{task_id}' because '{dep}' failed.": "'{task_id}' wird übersprungen, da '{dep}' fehlgeschlagen ist.",
+        'Some packages were not installed — isolating the failing ones…':
+            'Einige Pakete wurden nicht installiert — die fehlerhaften werden eingegrenzt…',
+        'Not found in the repositories, skipping: {names}': 'Nicht in den Paketquellen gefunden, übersprungen: {names}',
+        'Not found in the AUR: {names}': 'Nicht im AUR gefunden: {names}',
+        'Installing build dependencies: {names}': 'Build-Abhängigkeiten werden installiert: {names}',
+        'Some build dependencies could not be installed':
+            'Einige Build-Abhängigkeiten konnten nicht installiert werden',
+        'Building {n} AUR package base(s), {w} at a time': '{n} AUR-Paketbasis(en) werden gebaut, {w} gleichzeitig',
+        'Skipping {base}: a dependency failed to build':
+            '{base} wird übersprungen: eine Abhängigkeit konnte nicht gebaut werden',
+        '{base} {version}: using cached build': '{base} {version}: zwischengespeicherter Build wird verwendet',
+        'Building {base} {version}…': '{base} {version} wird gebaut…',
+        'Failed to build {base}': '{base} konnte nicht gebaut werden',
+        'content differs from the kept copy': 'Inhalt weicht von der behaltenen Kopie ab',
+        '(other)': '(andere)',
+        'Nothing could be installed, not even a single package — giving up on the remaining retries':
+            'Nicht einmal ein einzelnes Paket konnte installiert werden — weitere Versuche werden abgebrochen',
+        'Checking {i}/{n}: {name}': 'Prüfe {i}/{n}: {name}',
     },
     "Français": {
         'Yes': 'Oui',
@@ -2935,6 +3074,145 @@ LANGUAGES: dict[str, dict[str, str]] = {
         'Select Font:': 'Choisir la police :',
         'Select Font Size:': 'Choisir la taille de police :',
         'Select Language:': 'Choisir la langue :',
+        'Data moved': 'Données transférées',
+        'Throughput': 'Débit',
+        'Scan time': "Durée d'analyse",
+        'Copy time': 'Durée de copie',
+        'Per backend': 'Par backend',
+        'Avg Throughput': 'Débit moyen',
+        'Throughput per Day (MB/s)': 'Débit par jour (Mo/s)',
+        'Data Moved by Backend': 'Données transférées par backend',
+        'Profile backup runs (write a timing trace to the log folder)':
+            'Profiler les sauvegardes (écrire une trace de temps dans le dossier des journaux)',
+        'Packing small files': 'Regroupement des petits fichiers',
+        'Unpacking small files': 'Décompression des petits fichiers',
+        'zstd is required to unpack {name}': 'zstd est requis pour décompresser {name}',
+        'Bundle member unreadable': 'Élément du paquet illisible',
+        'Unsafe path in pack index': "Chemin non sûr dans l'index des paquets",
+        'Missing from bundle {name}': 'Absent du paquet {name}',
+        'Pack small files into bundles (SMB/SSH destinations)':
+            'Regrouper les petits fichiers en paquets (destinations SMB/SSH)',
+        'Files of 64 KB or less are streamed into compressed tar bundles (zstd when available, gzip otherwise) together with an index, and only the bundles are sent to the remote destination — one transfer instead of thousands.<br><br>Unchanged files are not packed again; changed ones go into a new bundle.<br><br><i>Only applies to Backup with a local source and an SMB or SSH destination. Restore unpacks the bundles automatically.</i>':
+            "Les fichiers de 64 Ko ou moins sont écrits dans des paquets tar compressés (zstd si disponible, sinon gzip) accompagnés d'un index, et seuls les paquets sont envoyés vers la destination distante — un transfert au lieu de milliers.<br><br>Les fichiers inchangés ne sont pas regroupés à nouveau ; les fichiers modifiés vont dans un nouveau paquet.<br><br><i>S'applique uniquement aux sauvegardes avec une source locale et une destination SMB ou SSH. La restauration décompresse les paquets automatiquement.</i>",
+        'Speeds up remote backups of mail folders, dotfiles and other trees with many tiny files.':
+            "Accélère les sauvegardes distantes de dossiers de courrier, de dotfiles et d'autres arborescences contenant de nombreux petits fichiers.",
+        'zstd failed: {err}': 'Échec de zstd : {err}',
+        'Store files compressed at the destination': 'Stocker les fichiers compressés à la destination',
+        'Every file is compressed on the fly into its own <code>.bh.gz</code> file, or <code>.bh.zst</code> (multithreaded zstd) for files of 1 MB and more when zstd is installed, so single files can still be restored quickly. An index at the destination keeps up-to-date checks fast without decompressing anything.<br><br>Already-compressed formats (images, videos, archives…) are copied as they are.<br><br><i>Only applies to Backup to local or mounted destinations, and cannot be combined with mirror mode. Restore decompresses the files automatically.</i>':
+            "Chaque fichier est compressé à la volée dans son propre fichier <code>.bh.gz</code>, ou <code>.bh.zst</code> (zstd multithread) pour les fichiers de 1 Mo et plus lorsque zstd est installé, afin que chaque fichier reste rapide à restaurer. Un index à la destination garde les vérifications de mise à jour rapides sans rien décompresser.<br><br>Les formats déjà compressés (images, vidéos, archives…) sont copiés tels quels.<br><br><i>S'applique uniquement aux sauvegardes vers des destinations locales ou montées, et ne peut pas être combiné avec le mode miroir. La restauration décompresse les fichiers automatiquement.</i>",
+        'Saves space and transfer time for text-heavy entries such as configs, source trees and logs.':
+            "Économise de l'espace et du temps de transfert pour les entrées riches en texte comme les configurations, les arborescences de sources et les journaux.",
+        'Chunk {cid} is corrupt': 'Le bloc {cid} est corrompu',
+        'Deduplicating {title}': 'Déduplication de {title}',
+        'Restoring from chunk store': 'Restauration depuis le magasin de blocs',
+        'No backup of this entry in the chunk store': 'Aucune sauvegarde de cette entrée dans le magasin de blocs',
+        'Removing unreferenced chunks': 'Suppression des blocs non référencés',
+        'Store as deduplicated chunk store': 'Stocker comme magasin de blocs dédupliqué',
+        'Files are split into content-defined chunks (about 1 MB on average) and each unique chunk is stored only once, compressed. Every backup adds a small manifest, so many versions of large, slowly-changing files such as VM images or mailboxes cost little extra space.<br><br>"Keep at most" limits the number of manifests; chunks no longer referenced are removed afterwards.<br><br><i>Only applies to Backup to local or mounted destinations, and cannot be combined with mirror, versioned or compressed mode. Restore rebuilds the latest version automatically.</i>':
+            "Les fichiers sont découpés en blocs définis par leur contenu (environ 1 Mo en moyenne) et chaque bloc unique n'est stocké qu'une fois, compressé. Chaque sauvegarde n'ajoute qu'un petit manifeste : de nombreuses versions de gros fichiers qui changent peu, comme des images de VM ou des boîtes mail, coûtent très peu d'espace.<br><br>« Conserver au plus » limite le nombre de manifestes ; les blocs qui ne sont plus référencés sont ensuite supprimés.<br><br><i>S'applique uniquement aux sauvegardes vers des destinations locales ou montées, et ne peut pas être combiné avec les modes miroir, versionné ou compressé. La restauration reconstruit automatiquement la dernière version.</i>",
+        'Keeps a history of large files in far less space than versioned folders.':
+            "Conserve un historique des gros fichiers en bien moins d'espace que des dossiers versionnés.",
+        'File shrank while reading': 'Le fichier a rétréci pendant la lecture',
+        'Record file changes while the tray icon is running (faster quick and scheduled backups)':
+            "Enregistrer les modifications de fichiers tant que l'icône de la barre système est active (sauvegardes rapides et planifiées plus rapides)",
+        'Creating snapshot': "Création de l'instantané",
+        'Copy from a filesystem snapshot': 'Copier depuis un instantané du système de fichiers',
+        'Before copying, a read-only snapshot of the source is taken (Btrfs subvolume, ZFS dataset or LVM volume), the files are copied from the snapshot and the snapshot is removed afterwards. Databases, browser profiles and VM images are then captured in a consistent state without closing any application, so their journal and WAL files are backed up too.<br><br><i>Needs root, or a sudo rule that allows the snapshot commands without a password. If no snapshot can be taken, the live files are copied as before.</i>':
+            "Avant la copie, un instantané en lecture seule de la source est créé (sous-volume Btrfs, jeu de données ZFS ou volume LVM), les fichiers sont copiés depuis l'instantané puis celui-ci est supprimé. Les bases de données, profils de navigateur et images de VM sont ainsi capturés dans un état cohérent sans fermer d'application ; leurs fichiers journal et WAL sont donc aussi sauvegardés.<br><br><i>Nécessite root ou une règle sudo autorisant les commandes d'instantané sans mot de passe. Si aucun instantané ne peut être créé, les fichiers en cours d'utilisation sont copiés comme avant.</i>",
+        'Consistent backups of data that is in use while the backup runs.':
+            'Sauvegardes cohérentes de données utilisées pendant la sauvegarde.',
+        'Scanning… {n} folders read': 'Analyse… {n} dossiers lus',
+        '  (apparent {size})': '  (apparent {size})',
+        'Apparent size (bytes)': 'Taille apparente (octets)',
+        'F5 = Refresh  ·  Ctrl+F5 = Full rescan': 'F5 = Actualiser  ·  Ctrl+F5 = Nouvelle analyse complète',
+        'Remember scans': 'Mémoriser les analyses',
+        'Keep the folder index on disk so the next scan of this directory only re-reads folders that changed':
+            "Conserver l'index des dossiers sur le disque pour que la prochaine analyse de ce répertoire ne relise que les dossiers modifiés",
+        'Empty directory.': 'Répertoire vide.',
+        '  (from the scan of {when})': "  (d'après l'analyse de {when})",
+        'Shared extents': 'Blocs partagés',
+        'Ask the filesystem which blocks are shared with other files or snapshots (reflinks, btrfs/XFS snapshots). Slower: every file is opened.':
+            "Demander au système de fichiers quels blocs sont partagés avec d'autres fichiers ou instantanés (reflinks, instantanés btrfs/XFS). Plus lent : chaque fichier est ouvert.",
+        '  ({size} shared)': '  ({size} partagés)',
+        'Hard-linked files are counted once': 'Les fichiers liés en dur sont comptés une seule fois',
+        'shared = blocks also used by other files or snapshots':
+            "partagés = blocs également utilisés par d'autres fichiers ou instantanés",
+        'Shared (bytes)': 'Partagés (octets)',
+        'Size': 'Taille',
+        'Modified': 'Modifié',
+        'Search again': 'Rechercher à nouveau',
+        'Duplicate Files': 'Fichiers en double',
+        '🔗 Replace checked with hard links': '🔗 Remplacer les cochés par des liens physiques',
+        '🗑 Delete checked': '🗑 Supprimer les cochés',
+        'Files under {root} with identical content. Checked copies are deleted or replaced by a hard link to the unchecked copy of their group.':
+            'Fichiers sous {root} au contenu identique. Les copies cochées sont supprimées ou remplacées par un lien physique vers la copie non cochée de leur groupe.',
+        'Reading folders… {n} files': 'Lecture des dossiers… {n} fichiers',
+        'Comparing files of the same size… {i}/{n}': 'Comparaison des fichiers de même taille… {i}/{n}',
+        '{n} copies · {wasted} reclaimable': '{n} copies · {wasted} récupérables',
+        '{n} duplicate groups · {wasted} reclaimable  (search: {s:.1f}s)':
+            '{n} groupes de doublons · {wasted} récupérables  (recherche : {s:.1f}s)',
+        'Check the copies to remove; every group must keep one unchecked copy.':
+            'Cochez les copies à retirer ; chaque groupe doit garder une copie non cochée.',
+        'Replace {n} file(s) with hard links to the kept copy?':
+            'Remplacer {n} fichier(s) par des liens physiques vers la copie conservée ?',
+        'Permanently delete {n} file(s)?': 'Supprimer définitivement {n} fichier(s) ?',
+        '✓ {done} file(s) processed, {errors} error(s) — see log':
+            '✓ {done} fichier(s) traité(s), {errors} erreur(s) — voir le journal',
+        '✓ {done} file(s) processed': '✓ {done} fichier(s) traité(s)',
+        'changed since the search': 'modifié depuis la recherche',
+        'on a different filesystem than the kept copy': 'sur un autre système de fichiers que la copie conservée',
+        '🔁 Duplicates': '🔁 Doublons',
+        'Find files with identical content below the current directory':
+            'Trouver les fichiers au contenu identique sous le répertoire actuel',
+        '1 day': '1 jour',
+        '1 week': '1 semaine',
+        '1 month': '1 mois',
+        '3 months': '3 mois',
+        '6 months': '6 mois',
+        '1 year': '1 an',
+        '2 years': '2 ans',
+        '5 years': '5 ans',
+        'Less than {age}': 'Moins de {age}',
+        'More than {age}': 'Plus de {age}',
+        'Disk Reports': 'Rapports disque',
+        'Top ': 'Top ',
+        'Run': 'Lancer',
+        '💾 Export CSV': '💾 Exporter en CSV',
+        'Largest files': 'Plus gros fichiers',
+        'By extension': 'Par extension',
+        'Age': 'Âge',
+        'Allocated': 'Alloué',
+        'Extension': 'Extension',
+        'Share': 'Part',
+        'Size (modified)': 'Taille (modification)',
+        'Files (modified)': 'Fichiers (modification)',
+        'Size (accessed)': 'Taille (accès)',
+        'Files (accessed)': 'Fichiers (accès)',
+        'Reports for {root}. Hard-linked files are counted once. Access times are only as accurate as the mount options allow (relatime, noatime).':
+            "Rapports pour {root}. Les liens physiques sont comptés une fois. Les dates d'accès ne sont précises que dans la limite des options de montage (relatime, noatime).",
+        'Export report as a CSV file': 'Exporter le rapport en fichier CSV',
+        '✓ Report exported to {path}': '✓ Rapport exporté vers {path}',
+        '📊 Reports': '📊 Rapports',
+        'Largest files, space by extension and file age below the current directory':
+            'Plus gros fichiers, espace par extension et âge des fichiers sous le dossier actuel',
+        "Skipping '{task_id}' because '{dep}' failed.": "'{task_id}' ignorée car '{dep}' a échoué.",
+        'Some packages were not installed — isolating the failing ones…':
+            "Certains paquets n'ont pas été installés — isolement des paquets en échec…",
+        'Not found in the repositories, skipping: {names}': 'Introuvables dans les dépôts, ignorés : {names}',
+        'Not found in the AUR: {names}': "Introuvable dans l'AUR : {names}",
+        'Installing build dependencies: {names}': 'Installation des dépendances de compilation : {names}',
+        'Some build dependencies could not be installed':
+            "Certaines dépendances de compilation n'ont pas pu être installées",
+        'Building {n} AUR package base(s), {w} at a time': 'Compilation de {n} base(s) de paquets AUR, {w} à la fois',
+        'Skipping {base}: a dependency failed to build': "{base} ignoré : la compilation d'une dépendance a échoué",
+        '{base} {version}: using cached build': '{base} {version} : utilisation de la compilation en cache',
+        'Building {base} {version}…': 'Compilation de {base} {version}…',
+        'Failed to build {base}': 'Échec de la compilation de {base}',
+        'content differs from the kept copy': 'le contenu diffère de la copie conservée',
+        '(other)': '(autres)',
+        'Nothing could be installed, not even a single package — giving up on the remaining retries':
+            "Aucun paquet n'a pu être installé, pas même un seul — abandon des nouvelles tentatives",
+        'Checking {i}/{n}: {name}': 'Vérification {i}/{n} : {name}',
     },
     "Español": {
         'Yes': 'Sí',
@@ -4402,6 +4680,144 @@ LANGUAGES: dict[str, dict[str, str]] = {
         'Select Font:': 'Seleccionar fuente:',
         'Select Font Size:': 'Seleccionar tamaño de fuente:',
         'Select Language:': 'Seleccionar idioma:',
+        'Data moved': 'Datos transferidos',
+        'Throughput': 'Rendimiento',
+        'Scan time': 'Tiempo de escaneo',
+        'Copy time': 'Tiempo de copia',
+        'Per backend': 'Por backend',
+        'Avg Throughput': 'Rendimiento medio',
+        'Throughput per Day (MB/s)': 'Rendimiento por día (MB/s)',
+        'Data Moved by Backend': 'Datos transferidos por backend',
+        'Profile backup runs (write a timing trace to the log folder)':
+            'Perfilar las copias de seguridad (guardar una traza de tiempos en la carpeta de registros)',
+        'Packing small files': 'Empaquetando archivos pequeños',
+        'Unpacking small files': 'Desempaquetando archivos pequeños',
+        'zstd is required to unpack {name}': 'Se necesita zstd para desempaquetar {name}',
+        'Bundle member unreadable': 'Elemento del paquete ilegible',
+        'Unsafe path in pack index': 'Ruta insegura en el índice de paquetes',
+        'Missing from bundle {name}': 'Falta en el paquete {name}',
+        'Pack small files into bundles (SMB/SSH destinations)':
+            'Empaquetar archivos pequeños en paquetes (destinos SMB/SSH)',
+        'Files of 64 KB or less are streamed into compressed tar bundles (zstd when available, gzip otherwise) together with an index, and only the bundles are sent to the remote destination — one transfer instead of thousands.<br><br>Unchanged files are not packed again; changed ones go into a new bundle.<br><br><i>Only applies to Backup with a local source and an SMB or SSH destination. Restore unpacks the bundles automatically.</i>':
+            'Los archivos de 64 KB o menos se escriben en paquetes tar comprimidos (zstd si está disponible, si no gzip) junto con un índice, y solo los paquetes se envían al destino remoto — una transferencia en lugar de miles.<br><br>Los archivos sin cambios no se vuelven a empaquetar; los modificados van a un paquete nuevo.<br><br><i>Solo se aplica a copias de seguridad con origen local y destino SMB o SSH. La restauración desempaqueta los paquetes automáticamente.</i>',
+        'Speeds up remote backups of mail folders, dotfiles and other trees with many tiny files.':
+            'Acelera las copias remotas de carpetas de correo, dotfiles y otros árboles con muchos archivos diminutos.',
+        'zstd failed: {err}': 'zstd falló: {err}',
+        'Store files compressed at the destination': 'Guardar los archivos comprimidos en el destino',
+        'Every file is compressed on the fly into its own <code>.bh.gz</code> file, or <code>.bh.zst</code> (multithreaded zstd) for files of 1 MB and more when zstd is installed, so single files can still be restored quickly. An index at the destination keeps up-to-date checks fast without decompressing anything.<br><br>Already-compressed formats (images, videos, archives…) are copied as they are.<br><br><i>Only applies to Backup to local or mounted destinations, and cannot be combined with mirror mode. Restore decompresses the files automatically.</i>':
+            'Cada archivo se comprime al vuelo en su propio archivo <code>.bh.gz</code>, o <code>.bh.zst</code> (zstd multihilo) para archivos de 1 MB o más cuando zstd está instalado, de modo que cada archivo se puede restaurar rápidamente. Un índice en el destino mantiene rápidas las comprobaciones de actualización sin descomprimir nada.<br><br>Los formatos ya comprimidos (imágenes, vídeos, archivos…) se copian tal cual.<br><br><i>Solo se aplica a copias de seguridad en destinos locales o montados y no se puede combinar con el modo espejo. La restauración descomprime los archivos automáticamente.</i>',
+        'Saves space and transfer time for text-heavy entries such as configs, source trees and logs.':
+            'Ahorra espacio y tiempo de transferencia en entradas con mucho texto, como configuraciones, árboles de código y registros.',
+        'Chunk {cid} is corrupt': 'El bloque {cid} está dañado',
+        'Deduplicating {title}': 'Deduplicando {title}',
+        'Restoring from chunk store': 'Restaurando desde el almacén de bloques',
+        'No backup of this entry in the chunk store': 'No hay copia de esta entrada en el almacén de bloques',
+        'Removing unreferenced chunks': 'Eliminando bloques sin referencia',
+        'Store as deduplicated chunk store': 'Guardar como almacén de bloques deduplicado',
+        'Files are split into content-defined chunks (about 1 MB on average) and each unique chunk is stored only once, compressed. Every backup adds a small manifest, so many versions of large, slowly-changing files such as VM images or mailboxes cost little extra space.<br><br>"Keep at most" limits the number of manifests; chunks no longer referenced are removed afterwards.<br><br><i>Only applies to Backup to local or mounted destinations, and cannot be combined with mirror, versioned or compressed mode. Restore rebuilds the latest version automatically.</i>':
+            'Los archivos se dividen en bloques definidos por su contenido (alrededor de 1 MB de media) y cada bloque único se guarda una sola vez, comprimido. Cada copia solo añade un pequeño manifiesto, así que muchas versiones de archivos grandes que cambian poco, como imágenes de VM o buzones, apenas ocupan espacio extra.<br><br>«Conservar como máximo» limita el número de manifiestos; los bloques que ya no se usan se eliminan después.<br><br><i>Solo se aplica a copias hacia destinos locales o montados y no puede combinarse con los modos espejo, versionado o comprimido. La restauración reconstruye automáticamente la última versión.</i>',
+        'Keeps a history of large files in far less space than versioned folders.':
+            'Mantiene un historial de archivos grandes en mucho menos espacio que las carpetas versionadas.',
+        'File shrank while reading': 'El archivo se redujo durante la lectura',
+        'Record file changes while the tray icon is running (faster quick and scheduled backups)':
+            'Registrar los cambios de archivos mientras el icono de la bandeja está activo (copias rápidas y programadas más rápidas)',
+        'Creating snapshot': 'Creando instantánea',
+        'Copy from a filesystem snapshot': 'Copiar desde una instantánea del sistema de archivos',
+        'Before copying, a read-only snapshot of the source is taken (Btrfs subvolume, ZFS dataset or LVM volume), the files are copied from the snapshot and the snapshot is removed afterwards. Databases, browser profiles and VM images are then captured in a consistent state without closing any application, so their journal and WAL files are backed up too.<br><br><i>Needs root, or a sudo rule that allows the snapshot commands without a password. If no snapshot can be taken, the live files are copied as before.</i>':
+            'Antes de copiar se crea una instantánea de solo lectura del origen (subvolumen Btrfs, dataset ZFS o volumen LVM), los archivos se copian desde la instantánea y después se elimina. Así, bases de datos, perfiles de navegador e imágenes de VM se guardan en un estado coherente sin cerrar ninguna aplicación, por lo que también se copian sus archivos journal y WAL.<br><br><i>Requiere root o una regla de sudo que permita los comandos de instantánea sin contraseña. Si no se puede crear una instantánea, se copian los archivos en uso como antes.</i>',
+        'Consistent backups of data that is in use while the backup runs.':
+            'Copias coherentes de datos que están en uso durante la copia.',
+        'Scanning… {n} folders read': 'Escaneando… {n} carpetas leídas',
+        '  (apparent {size})': '  (aparente {size})',
+        'Apparent size (bytes)': 'Tamaño aparente (bytes)',
+        'F5 = Refresh  ·  Ctrl+F5 = Full rescan': 'F5 = Actualizar  ·  Ctrl+F5 = Reescaneo completo',
+        'Remember scans': 'Recordar escaneos',
+        'Keep the folder index on disk so the next scan of this directory only re-reads folders that changed':
+            'Guardar el índice de carpetas en disco para que el próximo escaneo de este directorio solo vuelva a leer las carpetas modificadas',
+        'Empty directory.': 'Directorio vacío.',
+        '  (from the scan of {when})': '  (del escaneo de las {when})',
+        'Shared extents': 'Bloques compartidos',
+        'Ask the filesystem which blocks are shared with other files or snapshots (reflinks, btrfs/XFS snapshots). Slower: every file is opened.':
+            'Preguntar al sistema de archivos qué bloques se comparten con otros archivos o instantáneas (reflinks, instantáneas btrfs/XFS). Más lento: se abre cada archivo.',
+        '  ({size} shared)': '  ({size} compartidos)',
+        'Hard-linked files are counted once': 'Los archivos con enlaces duros se cuentan una sola vez',
+        'shared = blocks also used by other files or snapshots':
+            'compartidos = bloques usados también por otros archivos o instantáneas',
+        'Shared (bytes)': 'Compartidos (bytes)',
+        'Size': 'Tamaño',
+        'Modified': 'Modificado',
+        'Search again': 'Buscar de nuevo',
+        'Duplicate Files': 'Archivos duplicados',
+        '🔗 Replace checked with hard links': '🔗 Sustituir los marcados por enlaces duros',
+        '🗑 Delete checked': '🗑 Eliminar los marcados',
+        'Files under {root} with identical content. Checked copies are deleted or replaced by a hard link to the unchecked copy of their group.':
+            'Archivos bajo {root} con contenido idéntico. Las copias marcadas se eliminan o se sustituyen por un enlace duro a la copia no marcada de su grupo.',
+        'Reading folders… {n} files': 'Leyendo carpetas… {n} archivos',
+        'Comparing files of the same size… {i}/{n}': 'Comparando archivos del mismo tamaño… {i}/{n}',
+        '{n} copies · {wasted} reclaimable': '{n} copias · {wasted} recuperables',
+        '{n} duplicate groups · {wasted} reclaimable  (search: {s:.1f}s)':
+            '{n} grupos de duplicados · {wasted} recuperables  (búsqueda: {s:.1f}s)',
+        'Check the copies to remove; every group must keep one unchecked copy.':
+            'Marque las copias a quitar; cada grupo debe conservar una copia sin marcar.',
+        'Replace {n} file(s) with hard links to the kept copy?':
+            '¿Sustituir {n} archivo(s) por enlaces duros a la copia conservada?',
+        'Permanently delete {n} file(s)?': '¿Eliminar definitivamente {n} archivo(s)?',
+        '✓ {done} file(s) processed, {errors} error(s) — see log':
+            '✓ {done} archivo(s) procesado(s), {errors} error(es) — ver el registro',
+        '✓ {done} file(s) processed': '✓ {done} archivo(s) procesado(s)',
+        'changed since the search': 'modificado desde la búsqueda',
+        'on a different filesystem than the kept copy': 'en un sistema de archivos distinto al de la copia conservada',
+        '🔁 Duplicates': '🔁 Duplicados',
+        'Find files with identical content below the current directory':
+            'Buscar archivos con contenido idéntico bajo el directorio actual',
+        '1 day': '1 día',
+        '1 week': '1 semana',
+        '1 month': '1 mes',
+        '3 months': '3 meses',
+        '6 months': '6 meses',
+        '1 year': '1 año',
+        '2 years': '2 años',
+        '5 years': '5 años',
+        'Less than {age}': 'Menos de {age}',
+        'More than {age}': 'Más de {age}',
+        'Disk Reports': 'Informes de disco',
+        'Top ': 'Top ',
+        'Run': 'Ejecutar',
+        '💾 Export CSV': '💾 Exportar CSV',
+        'Largest files': 'Archivos más grandes',
+        'By extension': 'Por extensión',
+        'Age': 'Antigüedad',
+        'Allocated': 'Asignado',
+        'Extension': 'Extensión',
+        'Share': 'Proporción',
+        'Size (modified)': 'Tamaño (modificación)',
+        'Files (modified)': 'Archivos (modificación)',
+        'Size (accessed)': 'Tamaño (acceso)',
+        'Files (accessed)': 'Archivos (acceso)',
+        'Reports for {root}. Hard-linked files are counted once. Access times are only as accurate as the mount options allow (relatime, noatime).':
+            'Informes para {root}. Los enlaces duros se cuentan una vez. Las fechas de acceso solo son tan precisas como permitan las opciones de montaje (relatime, noatime).',
+        'Export report as a CSV file': 'Exportar el informe como archivo CSV',
+        '✓ Report exported to {path}': '✓ Informe exportado a {path}',
+        '📊 Reports': '📊 Informes',
+        'Largest files, space by extension and file age below the current directory':
+            'Archivos más grandes, espacio por extensión y antigüedad bajo el directorio actual',
+        "Skipping '{task_id}' because '{dep}' failed.": "Se omite '{task_id}' porque '{dep}' falló.",
+        'Some packages were not installed — isolating the failing ones…':
+            'Algunos paquetes no se instalaron — aislando los que fallan…',
+        'Not found in the repositories, skipping: {names}': 'No encontrados en los repositorios, se omiten: {names}',
+        'Not found in the AUR: {names}': 'No encontrado en el AUR: {names}',
+        'Installing build dependencies: {names}': 'Instalando dependencias de compilación: {names}',
+        'Some build dependencies could not be installed': 'No se pudieron instalar algunas dependencias de compilación',
+        'Building {n} AUR package base(s), {w} at a time': 'Compilando {n} base(s) de paquetes AUR, {w} a la vez',
+        'Skipping {base}: a dependency failed to build': 'Omitiendo {base}: falló la compilación de una dependencia',
+        '{base} {version}: using cached build': '{base} {version}: usando la compilación en caché',
+        'Building {base} {version}…': 'Compilando {base} {version}…',
+        'Failed to build {base}': 'No se pudo compilar {base}',
+        'content differs from the kept copy': 'el contenido difiere de la copia conservada',
+        '(other)': '(otras)',
+        'Nothing could be installed, not even a single package — giving up on the remaining retries':
+            'No se pudo instalar nada, ni siquiera un solo paquete — se abandonan los reintentos restantes',
+        'Checking {i}/{n}: {name}': 'Comprobando {i}/{n}: {name}',
     },
 }
 